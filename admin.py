@@ -1,27 +1,39 @@
 # admin.py
 import tkinter as tk
 from tkinter import messagebox, filedialog
-import threading
 import os
 import shutil
 import sys
+import time
 
 from utils.io_paths import Paths
-from utils.capture_modal import run_modal_capture_session
-from utils.labeling import append_session_to_datasets
-from utils.training import train_and_save_model
+from utils.jobs import JobRunner
+# utils.capture_modal, catalog, training and logging_xlsx pull in OpenCV,
+# pandas and scikit-learn (~1.5 s); they are imported by the handlers that
+# use them so the panel opens immediately.
 
 # Default admin credentials (only used when not launched from login.py)
 USERNAME = "admin"
 PASSWORD = "12345"
 
+# Model input schema (utils.feature_sets): raw landmarks plus a 15-frame window
+FEATURE_SET = "raw132+temporal15"
+
+# Capture, catalog append and training all write the catalog, store or model: one job at a time
+JOB_SLOT = "dataset"
+# On quit, how long a cancelled job may take to flush its rows / catalog entry
+CLOSE_WAIT_S = 10.0
+
 class AdminApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Ergonomics Admin")
-        self.root.geometry("380x300")
+        self.root.geometry("380x430")
         self.paths = Paths()
         self.status_var = tk.StringVar(value="")
+        self.jobs = JobRunner(root)
+        self._closing = False
+        self.root.protocol("WM_DELETE_WINDOW", self._close)
 
     # ----------------- LOGIN UI -----------------
     def _login_ui(self):
@@ -43,17 +55,23 @@ class AdminApp:
         tk.Label(self.root, text="Admin Panel", font=("Arial", 16)).pack(pady=10)
 
         tk.Button(self.root, text="Good Pose Training", width=26,
-                  command=lambda: self._capture_session_modal("good")).pack(pady=6)
+                  command=lambda: self._capture_session("good")).pack(pady=6)
         tk.Button(self.root, text="Bad Pose Training", width=26,
-                  command=lambda: self._capture_session_modal("bad")).pack(pady=6)
+                  command=lambda: self._capture_session("bad")).pack(pady=6)
         tk.Button(self.root, text="Train Model", width=26,
                   command=self._train_model).pack(pady=6)
+        tk.Button(self.root, text="Update Model (new sessions)", width=26,
+                  command=self._update_model).pack(pady=6)
+        tk.Button(self.root, text="Select Best Model", width=26,
+                  command=self._select_model).pack(pady=6)
 
         # Download log button
         tk.Button(self.root, text="Download Log (XLSX)", width=26,
                   command=self._download_log).pack(pady=6)
+        tk.Button(self.root, text="Stop Capture / Cancel Job", width=26,
+                  command=self._cancel_job).pack(pady=6)
 
-        tk.Label(self.root, textvariable=self.status_var, fg="gray").pack(pady=8)
+        tk.Label(self.root, textvariable=self.status_var, fg="gray", wraplength=360).pack(pady=8)
 
     # ----------------- LOGIN HANDLER -----------------
     def _handle_login(self):
@@ -64,45 +82,140 @@ class AdminApp:
         else:
             messagebox.showerror("Login failed", "Invalid credentials")
 
+    # ----------------- JOBS -----------------
+    def _start_job(self, name: str, fn, *args, on_done=None):
+        # Runs fn(job, *args) in the background; progress and results come back on the Tk thread
+        running = self.jobs.busy()
+        if running is not None:
+            messagebox.showinfo("Job running", f"'{running.name}' is still running. Wait for it or press Stop.")
+            return
+        self.jobs.start(name, fn, *args, slot=JOB_SLOT, on_progress=self._job_progress,
+                        on_done=on_done, on_error=self._job_error, on_cancelled=self._job_cancelled)
+        self.status_var.set(f"Status: {name}: starting...")
+
+    def _job_progress(self, job, text, fields):
+        self.status_var.set(f"Status: {job.name}: {text}")
+
+    def _job_error(self, job, exc):
+        self.status_var.set(f"Status: {job.name} failed.")
+        if self._closing:
+            return
+        messagebox.showerror(f"{job.name.capitalize()} error", str(exc))
+
+    def _job_cancelled(self, job):
+        self.status_var.set(f"Status: {job.name} canceled.")
+
+    def _cancel_job(self):
+        job = self.jobs.busy()
+        if job is None:
+            self.status_var.set("Status: no job running.")
+            return
+        job.cancel()
+        self.status_var.set(f"Status: {job.name}: stopping...")
+
+    def _close(self):
+        if self._closing:
+            return
+        job = self.jobs.busy()
+        if job is not None:
+            if not messagebox.askokcancel("Job running", f"'{job.name}' is still running. Cancel it and quit?"):
+                return
+            job.cancel()
+            self._closing = True
+            self.status_var.set(f"Status: {job.name}: stopping before quit...")
+            # The worker may still be writing rows or the catalog; its callbacks need a live root
+            self._destroy_when_idle(time.monotonic() + CLOSE_WAIT_S)
+            return
+        self.root.destroy()
+
+    def _destroy_when_idle(self, deadline: float):
+        if self.jobs.busy() is None or time.monotonic() >= deadline:
+            self.root.destroy()
+            return
+        self.root.after(100, self._destroy_when_idle, deadline)
+
     # ----------------- CAPTURE -----------------
-    def _capture_session_modal(self, label: str):
-        try:
-            self.status_var.set(f"Status: capturing {label} pose (press 'q' to stop)...")
-            self.root.update_idletasks()
-            os.makedirs(self.paths.sessions_dir, exist_ok=True)
-            os.makedirs(self.paths.data_dir, exist_ok=True)
-
-            csv_path = run_modal_capture_session(self.paths.sessions_dir, label=label)
-            if csv_path and os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
-                rows = append_session_to_datasets(csv_path, label,
-                                                  self.paths.pose_data_csv,
-                                                  self.paths.pose_data_labeled_csv)
-                self.status_var.set(f"Status: captured {rows} rows for '{label}' and appended to datasets.")
-            else:
-                self.status_var.set("Status: capture canceled or no frames recorded.")
-        except Exception as e:
-            self.status_var.set("Status: error during capture")
-            messagebox.showerror("Capture error", str(e))
+    def _capture_session(self, label: str):
+        os.makedirs(self.paths.sessions_dir, exist_ok=True)
+        os.makedirs(self.paths.data_dir, exist_ok=True)
+        self._start_job(f"capture {label}", self._capture_job, label,
+                        on_done=lambda job, status: self.status_var.set(status))
+
+    def _capture_job(self, job, label: str) -> str:
+        # Worker thread: headless capture (no OpenCV window off the main thread); Stop ends the recording
+        from utils.capture_modal import run_modal_capture_session
+        from utils.catalog import SessionCatalog
+        job.progress("opening camera...")
+        csv_path = run_modal_capture_session(
+            self.paths.sessions_dir, label=label, headless=True, stop=job.cancel_event,
+            progress=lambda frames, rows: job.progress(f"{frames} frames, {rows} rows written (Stop to finish)",
+                                                       frames=frames, rows=rows))
+        if not (csv_path and os.path.exists(csv_path) and os.path.getsize(csv_path) > 0):
+            return "Status: capture canceled or no frames recorded."
+        job.progress("adding the session to the catalog...")
+        catalog = SessionCatalog(self.paths.sessions_dir, self.paths.sessions_manifest)
+        entry, added = catalog.register(csv_path, label)
+        if added:
+            return f"Status: captured {entry['rows']} rows for '{label}' and added to the catalog."
+        return f"Status: session already cataloged as {entry['file']}; not added again."
 
     # ----------------- TRAINING -----------------
+    # Training functions report each stage through job.checkpoint, which raises
+    # JobCancelled at the next stage after Cancel; the model file is only
+    # replaced by the final stage.
     def _train_model(self):
-        def _train():
-            try:
-                self.status_var.set("Status: training model...")
-                os.makedirs(self.paths.models_dir, exist_ok=True)
-                report = train_and_save_model(self.paths.pose_data_labeled_csv, self.paths.model_path)
-                self.status_var.set("Status: training complete.")
-                messagebox.showinfo("Training complete", report)
-            except Exception as e:
-                self.status_var.set("Status: training failed.")
-                messagebox.showerror("Training error", str(e))
-        threading.Thread(target=_train, daemon=True).start()
+        self._start_job("training", self._train_job,
+                        on_done=lambda job, report: self._job_report("Training complete", "training complete", report))
+
+    def _train_job(self, job) -> str:
+        from utils.training import train_and_save_model
+        os.makedirs(self.paths.models_dir, exist_ok=True)
+        return train_and_save_model(self.paths.sessions_dir, self.paths.model_path, self.paths.sessions_store,
+                                    feature_set=FEATURE_SET, progress=job.checkpoint)
+
+    def _update_model(self):
+        self._start_job("model update", self._update_job,
+                        on_done=lambda job, report: self._job_report("Model update", "model update complete", report))
+
+    def _update_job(self, job) -> str:
+        from utils.training import update_model_incremental
+        return update_model_incremental(self.paths.sessions_dir, self.paths.model_path, self.paths.sessions_store,
+                                        feature_set=FEATURE_SET, progress=job.checkpoint)
+
+    def _select_model(self):
+        self._start_job("model selection", self._select_job, on_done=self._select_done)
+
+    def _select_job(self, job) -> str:
+        from utils.training import select_and_save_model
+        return select_and_save_model(self.paths.sessions_dir, self.paths.model_path, self.paths.sessions_store,
+                                     progress=job.checkpoint)
+
+    def _select_done(self, job, report: str):
+        self.status_var.set("Status: model selection complete.")
+        self._show_report("Model selection", report)
+
+    def _job_report(self, title: str, status: str, report: str):
+        self.status_var.set(f"Status: {status}.")
+        messagebox.showinfo(title, report)
+
+    def _show_report(self, title: str, text: str):
+        # Fixed-width window so the comparison table lines up
+        win = tk.Toplevel(self.root)
+        win.title(title)
+        box = tk.Text(win, width=72, height=min(30, text.count("\n") + 2), font=("Courier", 10))
+        box.insert("1.0", text)
+        box.configure(state="disabled")
+        box.pack(padx=8, pady=8)
+        tk.Button(win, text="Close", command=win.destroy).pack(pady=(0, 8))
 
     # ----------------- DOWNLOAD LOG -----------------
     def _download_log(self):
         try:
+            db_path = self.paths.events_db
             log_path = self.paths.bad_posture_xlsx
-            if not os.path.exists(log_path) or os.path.getsize(log_path) == 0:
+            have_journal = os.path.exists(db_path) and os.path.getsize(db_path) > 0
+            have_legacy = os.path.exists(log_path) and os.path.getsize(log_path) > 0
+            if not have_journal and not have_legacy:
                 messagebox.showwarning("No log found", "Log file not found. Run live detection to generate it.")
                 return
 
@@ -116,7 +229,12 @@ class AdminApp:
             if not save_to:
                 return
             os.makedirs(os.path.dirname(save_to), exist_ok=True)
-            shutil.copyfile(log_path, save_to)
+            if have_journal:
+                from utils.logging_xlsx import export_journal_xlsx
+                # XLSX is built on demand from the append-only journal
+                export_journal_xlsx(db_path, save_to)
+            else:
+                shutil.copyfile(log_path, save_to)
             messagebox.showinfo("Download complete", f"Saved log to:\n{save_to}")
         except Exception as e:
             messagebox.showerror("Download failed", str(e))
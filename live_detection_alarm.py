@@ -1,106 +1,216 @@
 # live_detection_alarm.py
+import argparse
 import os
+import sys
 import time
 from collections import deque
 import numpy as np
 import cv2
-import joblib
 
 from utils.io_paths import Paths
-from utils.camera import open_capture
-from utils.feature_vector import vectorize_landmarks_with_fallback
-from utils.logging_xlsx import append_bad_event
-from utils.sound import beep
-from utils.visualization import draw_panel
-
-GOOD_LABEL = "good"
-BAD_LABEL = "bad"
-PRED_WINDOW = 8
-SMOOTH_ALPHA = 0.6  # smoothed good probability
-
-def main():
+from utils.frame_sources import open_source, add_source_args
+from utils.feature_vector import LandmarkVectorizer
+from utils.model_artifact import load_predictor
+from utils.event_log import EventJournal
+from utils.episodes import EPISODE_COLUMNS
+from utils.posture_stack import PostureStack, GOOD_LABEL, BAD_LABEL, PRED_WINDOW, SMOOTH_ALPHA, default_episodes
+from utils.feature_sets import feature_stage_for
+from utils.sound import AlarmPlayer
+from utils.visualization import OverlayRenderer, add_display_args
+from utils.frame_pipeline import FramePipeline
+from utils.metrics import add_metrics_args, metrics_from_args
+from utils.quality import QualityController, PosePool, add_quality_args
+from utils.motion import add_motion_args, gate_from_args
+
+ALARM_COOLDOWN_S = 1.5  # minimum gap between alarm beeps
+
+def _wait_for_go() -> bool:
+    # Standby: block until the launcher writes "go" (True) or closes stdin / writes anything else (False)
+    line = sys.stdin.readline()
+    return line.strip().lower() == "go"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Live posture detection with alarm")
+    add_source_args(parser)
+    add_metrics_args(parser)
+    add_quality_args(parser)
+    add_motion_args(parser)
+    add_display_args(parser)
+    parser.add_argument("--service", default=None, metavar="ADDR",
+                        help="classify through a running inference service (tcp:HOST:PORT or unix:/path)")
+    parser.add_argument("--standby", action="store_true",
+                        help="load the model and pose graph, print READY, then wait for 'go' on stdin (used by login.py)")
+    parser.add_argument("--standby-open-source", action="store_true",
+                        help="with --standby, also open the camera/source before READY")
+    args = parser.parse_args(argv)
+
+    t_start = time.perf_counter()
     paths = Paths()
-    if not os.path.exists(paths.model_path):
+    metrics, exporter = metrics_from_args(args, "live_detection_alarm", paths.logs_dir)
+    if not args.service and not (os.path.exists(paths.model_path) or os.path.exists(paths.model_npz)):
         raise FileNotFoundError("Trained model not found. Run training from admin panel first.")
 
-    pipe = joblib.load(paths.model_path)
-    has_proba = hasattr(pipe, "predict_proba")
+    if args.service:
+        # Shared model in scripts/inference_service.py instead of a local copy
+        from utils.inference_service import RemotePredictor
+        predictor = RemotePredictor(args.service)
+    else:
+        # .npz artifact when available (no sklearn import), else the joblib pipeline
+        predictor = load_predictor(paths.model_path, good_label=GOOD_LABEL)
+    t_model = time.perf_counter()
 
     os.makedirs(paths.logs_dir, exist_ok=True)
-    cap = open_capture(index=0, use_avfoundation=True)
+    journal = EventJournal(paths.events_db, "episodes", EPISODE_COLUMNS)
+    episodes = default_episodes()
+    alarm = AlarmPlayer(paths.beep_wav, cooldown_s=ALARM_COOLDOWN_S)
 
     mp = __import__("mediapipe").solutions
     mp_pose = mp.pose
-    mp_draw = __import__("mediapipe").solutions.drawing_utils
-
-    label_hist = deque(maxlen=PRED_WINDOW)
-    smoothed_good = 0.5
+    # Starts at full resolution / complexity 1 and steps down under load
+    quality = QualityController(args.frame_budget_ms, enabled=not args.fixed_quality)
+    poses = PosePool(mp_pose, static_image_mode=False, smooth_landmarks=True, enable_segmentation=False)
+    if args.standby:
+        # Build the starting graph and run it once so the first real frame does not pay for it
+        poses.get(quality.current.model_complexity).process(np.zeros((480, 640, 3), dtype=np.uint8))
+    t_pose = time.perf_counter()
+
+    cap = None
+    if not args.standby or args.standby_open_source:
+        cap = open_source(args.source, realtime=args.realtime, loop=args.loop)
+    if args.standby:
+        print("READY", flush=True)
+        if not _wait_for_go():
+            poses.close()
+            alarm.close()
+            journal.close()
+            if cap is not None:
+                cap.release()
+            return
+        # Startup is measured from the go signal
+        t_start = t_model = t_pose = time.perf_counter()
+    if cap is None:
+        cap = open_source(args.source, realtime=args.realtime, loop=args.loop)
+    t_source = time.perf_counter()
+
+    vectorizer = LandmarkVectorizer()
+    stack = PostureStack(predictor, pred_window=PRED_WINDOW, smooth_alpha=SMOOTH_ALPHA,
+                         episodes=episodes, alarm=alarm,
+                         on_episode=lambda ep: journal.log(ep.as_row()), metrics=metrics,
+                         features=feature_stage_for(predictor))
+    gate = gate_from_args(args)
+    last_landmarks = [None]
     fps_clock = deque(maxlen=30)
     last_ts = time.time()
 
-    with mp_pose.Pose(static_image_mode=False, model_complexity=1, smooth_landmarks=True, enable_segmentation=False) as pose:
+    def infer(frame, pkt):
+        # Runs on the inference thread: pose, then the shared post-pose stack
+        level = quality.current
+        with metrics.time("gate"):
+            moved = gate.should_process(frame, now=pkt.grab_ts)
+        if not moved:
+            # Scene unchanged: keep the last landmarks and decision
+            landmarks = last_landmarks[0]
+            d = stack.repeat_last(pkt.grab_wall_ms)
+        else:
+            t0 = time.perf_counter()
+            with metrics.time("convert"):
+                rgb = quality.prepare(frame)
+            t1 = time.perf_counter()
+            res = poses.get(level.model_complexity).process(rgb)
+            pose_ms = (time.perf_counter() - t1) * 1000.0
+            metrics.record("pose", pose_ms)
+            quality.observe(pose_ms)
+
+            landmarks = last_landmarks[0] = res.pose_landmarks
+            with metrics.time("vectorize"):
+                X = vectorizer.fill(landmarks.landmark) if landmarks else None
+            d = stack.step(X, pkt.grab_wall_ms)
+            gate.note_cost((time.perf_counter() - t0) * 1000.0)
+
+        display_label = "No pose"
+        color = (180, 180, 0)
+        if d.voted == GOOD_LABEL:
+            display_label = "Good posture"
+            color = (0, 200, 0)
+        elif d.voted == BAD_LABEL:
+            display_label = "Bad posture"
+            color = (0, 0, 255)
+        elif d.voted is not None:
+            display_label = d.voted
+
+        return {
+            "landmarks": landmarks,
+            "display_label": display_label,
+            "color": color,
+            "prob_good": d.prob_good,
+            "smoothed_good": d.smoothed_good,
+            "quality": level.describe(),
+            "skip_rate": gate.skip_rate,
+        }
+
+    pipeline = FramePipeline.for_source(cap, infer, metrics=metrics)
+    renderer = OverlayRenderer()
+    first = True
+    try:
+        exporter.start()
+        pipeline.start()
         while True:
-            ok, frame = cap.read()
-            if not ok or frame is None:
-                print("Frame read failed.")
-                break
-
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            res = pose.process(rgb)
-
-            display_label = "No pose"
-            color = (180, 180, 0)
-            prob_good = None
-
-            if res.pose_landmarks:
-                mp_draw.draw_landmarks(frame, res.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-                X = vectorize_landmarks_with_fallback(res.pose_landmarks.landmark)
-                pred = pipe.predict(X)[0]
-                if has_proba:
-                    classes = list(pipe.classes_)
-                    proba = pipe.predict_proba(X)[0]
-                    if GOOD_LABEL in classes:
-                        prob_good = float(proba[classes.index(GOOD_LABEL)])
-                        smoothed_good = SMOOTH_ALPHA * smoothed_good + (1 - SMOOTH_ALPHA) * prob_good
-
-                label_hist.append(str(pred).lower())
-                vals, counts = np.unique(label_hist, return_counts=True)
-                voted = vals[np.argmax(counts)]
-
-                if voted == GOOD_LABEL:
-                    display_label = "Good posture"
-                    color = (0, 200, 0)
-                elif voted == BAD_LABEL:
-                    display_label = "Bad posture"
-                    color = (0, 0, 255)
-                    # Trigger alarm and log event
-                    beep()  # or beep("assets/beep.wav") if you add a wav file
-                    append_bad_event(paths.bad_posture_xlsx, {
-                        "timestamp": int(time.time() * 1000),
-                        "label": voted,
-                        "prob_good": smoothed_good if prob_good is not None else None
-                    })
-                else:
-                    display_label = voted
-
+            pkt = pipeline.get(timeout=0.5)
+            if pkt is None:
+                if pipeline.finished:
+                    break
+                if not args.headless and cv2.waitKey(1) & 0xFF == ord("q"):
+                    break
+                continue
+            if first:
+                first = False
+                ms = lambda a, b: (b - a) * 1000.0
+                print(f"Startup: model {ms(t_start, t_model):.0f} ms, pose {ms(t_model, t_pose):.0f} ms, "
+                      f"source {ms(t_pose, t_source):.0f} ms, first decision "
+                      f"{ms(t_start, time.perf_counter()):.0f} ms after {'go' if args.standby else 'start'}",
+                      flush=True)
+            if args.headless:
+                # Decisions, alarm and journal all run on the inference thread
+                continue
+
+            frame, r = pkt.frame, pkt.result
             # FPS
             now = time.time()
             fps_clock.append(now - last_ts)
             last_ts = now
             fps = 1.0 / (np.mean(fps_clock) if fps_clock else 1e-6)
 
-            lines = [display_label, f"FPS: {fps:.1f}", "Press q to quit"]
-            if prob_good is not None:
-                lines.insert(1, f"Good prob (smoothed): {smoothed_good:.2f}")
-            draw_panel(frame, lines, x=10, y=10)
-
-            cv2.putText(frame, display_label, (10, frame.shape[0] - 14), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2, cv2.LINE_AA)
-            cv2.imshow("Live Detection with Alarm", frame)
-            if cv2.waitKey(1) & 0xFF == ord("q"):
+            with metrics.time("draw"):
+                renderer.skeleton(frame, r["landmarks"].landmark if r["landmarks"] else None)
+                lines = [r["display_label"], f"FPS: {fps:.1f}", f"Frame age: {pkt.age_ms():.0f} ms",
+                         f"Quality: {r['quality']}  skip {r['skip_rate']:.0%}", "Press q to quit"]
+                if r["prob_good"] is not None:
+                    lines.insert(1, f"Good prob (smoothed): {r['smoothed_good']:.2f}")
+                renderer.panel(frame, lines, x=10, y=10)
+                cv2.putText(frame, r["display_label"], (10, frame.shape[0] - 14), cv2.FONT_HERSHEY_SIMPLEX, 0.8, r["color"], 2, cv2.LINE_AA)
+
+            with metrics.time("imshow"):
+                cv2.imshow("Live Detection with Alarm", frame)
+                key = cv2.waitKey(1) & 0xFF
+            if key == ord("q"):
                 break
-
-    cap.release()
-    cv2.destroyAllWindows()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pipeline.stop()
+        exporter.stop()
+        poses.close()
+        stack.close()
+        alarm.close()
+        journal.close()
+        cap.release()
+        if not args.headless:
+            cv2.destroyAllWindows()
+        print(f"Frames grabbed {pipeline.grabbed}, inferred {pipeline.inferred}, "
+              f"dropped stale {pipeline.dropped_grab}, mean frame age {pipeline.mean_age_ms():.0f} ms")
+        print(gate.summary())
+        for line in metrics.format_lines():
+            print(line)
 
 if __name__ == "__main__":
     main()
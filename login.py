@@ -7,6 +7,7 @@ import subprocess
 import sys
 
 CREDENTIAL_FILE = "data/credential.csv"
+DETECTOR = "live_detection_alarm.py"
 
 def load_credentials():
     creds = {}
@@ -21,12 +22,28 @@ def load_credentials():
                 creds[u] = p
     return creds
 
+def start_resident_detector(open_camera: bool = False):
+    """
+    Launches the detector in --standby while the login window is up: it
+    imports MediaPipe, loads the model and warms the pose graph, then waits
+    for "go" on stdin. open_camera also opens the webcam before login.
+    """
+    cmd = [sys.executable, DETECTOR, "--standby"]
+    if open_camera:
+        cmd.append("--standby-open-source")
+    try:
+        return subprocess.Popen(cmd, stdin=subprocess.PIPE, text=True)
+    except OSError:
+        return None
+
 class LoginApp:
-    def __init__(self, root):
+    def __init__(self, root, prewarm: bool = True, prewarm_camera: bool = False):
         self.root = root
         self.root.title("Login")
         self.root.geometry("320x180")
         self.creds = load_credentials()
+        self.resident = start_resident_detector(prewarm_camera) if prewarm else None
+        self.root.protocol("WM_DELETE_WINDOW", self._close)
         self._build_ui()
 
     def _build_ui(self):
@@ -47,16 +64,42 @@ class LoginApp:
         if u in self.creds and self.creds[u] == p:
             self.root.destroy()
             if u.lower() == "admin":
+                self._release_resident()
                 # Launch admin.py with a --skip-login flag
                 subprocess.Popen([sys.executable, "admin.py", "--skip-login"])
-            else:
-                subprocess.Popen([sys.executable, "live_detection_alarm.py"])
+            elif not self._wake_resident():
+                subprocess.Popen([sys.executable, DETECTOR])
         else:
             messagebox.showerror("Login failed", "Invalid username or password")
 
+    def _wake_resident(self) -> bool:
+        # False when there is no standby detector or it already exited (e.g. no model yet)
+        r = self.resident
+        if r is None or r.poll() is not None:
+            return False
+        try:
+            r.stdin.write("go\n")
+            r.stdin.close()
+        except OSError:
+            return False
+        return True
+
+    def _release_resident(self):
+        # EOF on stdin makes a standby detector exit
+        if self.resident is not None and self.resident.poll() is None:
+            try:
+                self.resident.stdin.close()
+            except OSError:
+                pass
+
+    def _close(self):
+        self._release_resident()
+        self.root.destroy()
+
 def main():
     root = tk.Tk()
-    app = LoginApp(root)
+    # --no-prewarm: start the detector cold after login; --prewarm-camera: open the webcam during login too
+    app = LoginApp(root, prewarm="--no-prewarm" not in sys.argv, prewarm_camera="--prewarm-camera" in sys.argv)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 # scripts/1_live_data_collection.py
 import os
+import sys
 import time
 import cv2
 import pandas as pd
@@ -9,6 +10,10 @@ from collections import deque
 # Resolve project root (script directory -> project root)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.feature_vector import LandmarkVectorizer
 
 # Always write inside the project-local data folder
 OUT_DIR = os.path.join(PROJECT_ROOT, "data")
@@ -43,12 +48,10 @@ def ensure_csv_header(path, columns):
     if not os.path.exists(path) or os.path.getsize(path) == 0:
         pd.DataFrame(columns=columns).to_csv(path, index=False)
 
+_vectorizer = LandmarkVectorizer()
+
 def extract_row(session_id, ts_ms, landmarks):
-    row = [session_id, ts_ms]
-    for i in range(NUM_LANDMARKS):
-        lm = landmarks[i]
-        row.extend([float(lm.x), float(lm.y), float(lm.z), float(getattr(lm, "visibility", 1.0))])
-    return row
+    return [session_id, ts_ms] + _vectorizer.fill(landmarks)[0].tolist()
 
 def open_camera(index: int, use_avfoundation: bool = True):
     # Prefer AVFoundation on macOS for reliability
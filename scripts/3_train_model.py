@@ -1,29 +1,40 @@
 # scripts/3_train_model.py
+import argparse
 import os
+import sys
 import joblib
-import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.linear_predictor import compile_pipeline
+from utils.model_artifact import save_artifact
+from utils.training import load_training_arrays
+from utils.feature_sets import BASE_SETS, feature_set_name
+
 DATA_PATH = "data/pose_data_labeled.csv"
 MODEL_DIR = "models"
 MODEL_PATH = os.path.join(MODEL_DIR, "posture_model.pkl")
 
-def main():
-    os.makedirs(MODEL_DIR, exist_ok=True)
-    if not os.path.exists(DATA_PATH) or os.path.getsize(DATA_PATH) == 0:
-        raise FileNotFoundError("data/pose_data_labeled.csv is missing or empty. Label your data first.")
-
-    df = pd.read_csv(DATA_PATH)
-    feature_cols = [c for c in df.columns if c.startswith(("x_","y_","z_","v_"))]
-    if "label" not in df.columns:
-        raise ValueError("Missing 'label' column in data/pose_data_labeled.csv")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the posture classifier")
+    parser.add_argument("--features", choices=BASE_SETS, default="raw132",
+                        help="raw landmarks or the compact ergonomic measures")
+    parser.add_argument("--temporal", type=int, default=None, metavar="N",
+                        help="add sliding-window features over the last N frames (utils.temporal)")
+    args = parser.parse_args(argv)
 
-    X = df[feature_cols].fillna(0.0).values
-    y = df["label"].astype(str).values
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    # Reads the float32 store under data/store/ (converted from the CSV when it changes)
+    feature_set = feature_set_name(args.features, args.temporal)
+    X, y, _, feature_cols = load_training_arrays(DATA_PATH, feature_set=feature_set)
 
     if len(set(y)) < 2:
         raise ValueError("Need at least two classes ('good' and 'bad') to train.")
@@ -40,8 +51,14 @@ def main():
     print(f"Validation accuracy: {accuracy_score(yte, ypred):.4f}")
     print(classification_report(yte, ypred))
 
+    pipe.feature_set_ = feature_set
     joblib.dump(pipe, MODEL_PATH)
     print(f"Saved {MODEL_PATH}")
 
+    fused = compile_pipeline(pipe)
+    if fused is not None:
+        npz_path, header_path = save_artifact(fused, MODEL_PATH, feature_cols, feature_set=feature_set)
+        print(f"Saved {npz_path} and {header_path}")
+
 if __name__ == "__main__":
     main()
@@ -1,12 +1,28 @@
 # scripts/4_live_detection.py
+import argparse
 import os
+import sys
 import time
 import cv2
 import numpy as np
-import joblib
-import mediapipe as mp
 from collections import deque
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.feature_vector import LandmarkVectorizer
+from utils.model_artifact import load_predictor
+from utils.feature_sets import feature_stage_for
+from utils.decision import StreamingDecision, GOOD_LABEL, BAD_LABEL
+from utils.posture_stack import PRED_WINDOW, SMOOTH_ALPHA, default_episodes
+from utils.frame_sources import open_source, add_source_args
+from utils.metrics import add_metrics_args, metrics_from_args
+from utils.quality import DEFAULT_LADDER, QualityController, PosePool, find_level, add_quality_args
+from utils.motion import add_motion_args, gate_from_args
+from utils.visualization import OverlayRenderer, add_display_args
+
 MODEL_PATH = os.path.join("models", "posture_model.pkl")
 
 CAM_INDEX = 0
@@ -25,118 +41,148 @@ NEUTRAL_COLOR = (180, 180, 0)
 TEXT_COLOR = (235, 235, 235)
 BG_COLOR = (25, 25, 25)
 
-PRED_WINDOW = 8
-PROB_SMOOTH = 0.6
-NUM_LANDMARKS = 33
-
-def features_from_landmarks(landmarks):
-    feat = []
-    for i in range(NUM_LANDMARKS):
-        lm = landmarks[i]
-        feat.extend([float(lm.x), float(lm.y), float(lm.z), float(getattr(lm, "visibility", 1.0))])
-    return np.asarray(feat, dtype=np.float32).reshape(1, -1)
-
-def draw_panel(frame, lines, x=10, y=10, pad=8, line_h=24):
-    w = max(cv2.getTextSize(l, FONT, 0.6, 2)[0][0] for l in lines) + 2 * pad
-    h = line_h * len(lines) + 2 * pad
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (x, y), (x + w, y + h), BG_COLOR, thickness=-1)
-    cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
-    for i, l in enumerate(lines):
-        cy = y + pad + (i + 1) * line_h - 6
-        cv2.putText(frame, l, (x + pad, cy), FONT, 0.6, TEXT_COLOR, 2, cv2.LINE_AA)
-
-def majority_vote(labels):
-    if not labels:
-        return None
-    vals, counts = np.unique(labels, return_counts=True)
-    return vals[np.argmax(counts)]
-
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Live ergonomics detection")
+    add_source_args(parser)
+    add_metrics_args(parser)
+    add_quality_args(parser)
+    add_motion_args(parser)
+    add_display_args(parser)
+    args = parser.parse_args(argv)
+    metrics, exporter = metrics_from_args(args, "4_live_detection", os.path.join(PROJECT_ROOT, "data", "logs"))
+
     if not os.path.exists(MODEL_PATH) or os.path.getsize(MODEL_PATH) == 0:
         raise FileNotFoundError("Missing model at models/posture_model.pkl. Train it with scripts/3_train_model.py")
 
-    pipe = joblib.load(MODEL_PATH)
-    has_proba = hasattr(pipe, "predict_proba")
+    predictor = load_predictor(MODEL_PATH)
 
-    cap = cv2.VideoCapture(CAM_INDEX)
-    if FRAME_WIDTH: cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
-    if FRAME_HEIGHT: cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
-    if FPS_TARGET: cap.set(cv2.CAP_PROP_FPS, FPS_TARGET)
+    source = CAM_INDEX if args.source is None else args.source
+    cap = open_source(source, realtime=args.realtime, loop=args.loop, use_avfoundation=False,
+                      width=FRAME_WIDTH, height=FRAME_HEIGHT, fps=FPS_TARGET)
     if not cap.isOpened():
         raise RuntimeError("Unable to open webcam. Adjust CAM_INDEX or permissions.")
 
+    # Imported after argument parsing so --help does not pay for it
+    import mediapipe as mp
     mp_pose = mp.solutions.pose
-    mp_draw = mp.solutions.drawing_utils
 
-    label_hist = deque(maxlen=PRED_WINDOW)
-    smoothed_good_prob = 0.5
+    vectorizer = LandmarkVectorizer()
+    features = feature_stage_for(predictor)   # None for raw per-frame models
+    # Windowed models already integrate recent frames; no vote needed
+    decision = StreamingDecision(getattr(predictor, "classes", ()) or (BAD_LABEL, GOOD_LABEL),
+                                 window=PRED_WINDOW, alpha=SMOOTH_ALPHA,
+                                 vote=not (features is not None and features.windowed))
+    # Same enter/exit delays as the episode tracking in live_detection_alarm
+    alert = default_episodes()
     fps_clock = deque(maxlen=30)
     last_time = time.time()
 
-    with mp_pose.Pose(
-        static_image_mode=False,
-        model_complexity=MODEL_COMPLEXITY,
-        smooth_landmarks=SMOOTH_LANDMARKS,
-        enable_segmentation=ENABLE_SEGMENTATION
-    ) as pose:
+    quality = QualityController(args.frame_budget_ms,
+                                start_level=find_level(DEFAULT_LADDER, None, MODEL_COMPLEXITY),
+                                enabled=not args.fixed_quality)
+    poses = PosePool(mp_pose, static_image_mode=False, smooth_landmarks=SMOOTH_LANDMARKS,
+                     enable_segmentation=ENABLE_SEGMENTATION)
+    gate = gate_from_args(args)
+    renderer = OverlayRenderer(bg=BG_COLOR, fg=TEXT_COLOR)
+    was_bad = False
+
+    exporter.start()
+    try:
         while True:
-            ok, frame = cap.read()
+            with metrics.time("grab"):
+                ok, frame = cap.read()
             if not ok:
-                print("Frame read failed.")
+                print("Frame read failed." if cap.is_live else "End of stream.")
                 break
 
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            res = pose.process(rgb)
-
-            display_label = "No pose"
-            display_color = NEUTRAL_COLOR
-            prob_good = None
-
-            if res.pose_landmarks:
-                mp_draw.draw_landmarks(frame, res.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-                X = features_from_landmarks(res.pose_landmarks.landmark)
-
-                pred_label = pipe.predict(X)[0]
-                if has_proba:
-                    classes = list(pipe.classes_)
-                    proba = pipe.predict_proba(X)[0]
-                    if "good" in classes:
-                        prob_good = float(proba[classes.index("good")])
-
-                label_hist.append(str(pred_label).lower())
-                voted = majority_vote(label_hist) or str(pred_label).lower()
-
-                if voted == "good":
-                    display_label = "Good posture"
-                    display_color = GOOD_COLOR
-                elif voted == "bad":
-                    display_label = "Bad posture"
-                    display_color = BAD_COLOR
+            # Skip pose + classifier while the scene is unchanged; keep the last result
+            with metrics.time("gate"):
+                moved = gate.should_process(frame)
+            now_ms = int(time.time() * 1000)
+            if moved:
+                t0 = time.perf_counter()
+                with metrics.time("convert"):
+                    rgb = quality.prepare(frame)
+                t1 = time.perf_counter()
+                res = poses.get(quality.current.model_complexity).process(rgb)
+                pose_ms = (time.perf_counter() - t1) * 1000.0
+                metrics.record("pose", pose_ms)
+                quality.observe(pose_ms)
+
+                display_label = "No pose"
+                display_color = NEUTRAL_COLOR
+                prob_good = None
+
+                if res.pose_landmarks:
+                    with metrics.time("vectorize"):
+                        X = vectorizer.fill(res.pose_landmarks.landmark)
+                    if features is not None:
+                        with metrics.time("features"):
+                            X = features.push(X, now_ms)
+
+                    with metrics.time("predict"):
+                        pred_label, prob_good = predictor.predict(X)
+
+                    with metrics.time("vote"):
+                        voted = decision.update(pred_label, prob_good)
+
+                    if voted == "good":
+                        display_label = "Good posture"
+                        display_color = GOOD_COLOR
+                    elif voted == "bad":
+                        display_label = "Bad posture"
+                        display_color = BAD_COLOR
+                    else:
+                        display_label = voted
                 else:
-                    display_label = voted
+                    decision.update(None)
+                gate.note_cost((time.perf_counter() - t0) * 1000.0)
+            # Skipped frames keep the last evidence, so the alert delays still count them
+            alert.update(decision.voted, decision.smoothed_good, now_ms, is_bad=decision.evidence)
+
+            if args.headless:
+                # No window: report alert changes on stdout instead
+                if alert.active != was_bad:
+                    was_bad = alert.active
+                    print(f"{time.strftime('%H:%M:%S')} {'ALERT: sustained bad posture' if was_bad else 'posture OK'}")
+                continue
 
-                if prob_good is not None:
-                    smoothed_good_prob = PROB_SMOOTH * smoothed_good_prob + (1 - PROB_SMOOTH) * prob_good
+            with metrics.time("draw_landmarks"):
+                renderer.skeleton(frame, res.pose_landmarks.landmark if res.pose_landmarks else None)
 
             now = time.time()
             fps_clock.append(now - last_time)
             last_time = now
             fps = 1.0 / (np.mean(fps_clock) if fps_clock else 1e-6)
 
-            lines = [f"{display_label}", f"FPS: {fps:.1f}", "Press q to quit"]
-            if res.pose_landmarks and prob_good is not None:
-                lines.insert(1, f"Good prob (smoothed): {smoothed_good_prob:.2f}")
-            draw_panel(frame, lines, x=10, y=10)
-
-            cv2.putText(frame, display_label, (10, FRAME_HEIGHT - 20), FONT, 0.9, display_color, 2, cv2.LINE_AA)
-
-            cv2.imshow("Live Ergonomics Detection", frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            with metrics.time("draw"):
+                lines = [f"{display_label}", f"FPS: {fps:.1f}", f"Quality: {quality.current.describe()}  skip {gate.skip_rate:.0%}",
+                         "Press q to quit"]
+                if res.pose_landmarks and prob_good is not None:
+                    lines.insert(1, f"Good prob (smoothed): {decision.smoothed_good:.2f}")
+                if alert.active:
+                    lines.insert(1, "ALERT: sustained bad posture")
+                renderer.panel(frame, lines, x=10, y=10)
+
+                cv2.putText(frame, display_label, (10, frame.shape[0] - 20), FONT, 0.9, display_color, 2, cv2.LINE_AA)
+
+            with metrics.time("imshow"):
+                cv2.imshow("Live Ergonomics Detection", frame)
+                key = cv2.waitKey(1) & 0xFF
+            if key == ord('q'):
                 break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poses.close()
 
+    exporter.stop()
     cap.release()
-    cv2.destroyAllWindows()
+    if not args.headless:
+        cv2.destroyAllWindows()
+    print(gate.summary())
+    for line in metrics.format_lines():
+        print(line)
 
 if __name__ == "__main__":
     main()
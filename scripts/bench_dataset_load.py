@@ -0,0 +1,73 @@
+# scripts/bench_dataset_load.py
+# Load time of the training matrix: pandas CSV parse vs the memory-mapped store.
+# The labeled CSV is tiled up to --rows so the gap is visible at realistic sizes.
+#   python scripts/bench_dataset_load.py --rows 200000
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.dataset_store import DatasetStore, import_csv
+
+def load_csv(path):
+    # What training did before: full parse, prefix column pick, float64
+    df = pd.read_csv(path)
+    feature_cols = [c for c in df.columns if c.startswith(("x_", "y_", "z_", "v_"))]
+    return df[feature_cols].fillna(0.0).values, df["label"].astype(str).values
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=paths.pose_data_labeled_csv)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--session-rows", type=int, default=1800, help="rows per synthetic session (~1 min at 30 fps)")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    base = pd.read_csv(args.csv)
+    reps = max(1, -(-args.rows // len(base)))
+    big = pd.concat([base] * reps, ignore_index=True).iloc[:args.rows]
+    # Re-split into sessions of --session-rows so the store gets realistic partitions
+    big["session_id"] = 1_700_000_000 + np.arange(len(big)) // args.session_rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "labeled.csv")
+        big.to_csv(csv_path, index=False)
+        t0 = time.perf_counter()
+        import_csv(csv_path, os.path.join(tmp, "store"))
+        convert_s = time.perf_counter() - t0
+
+        csv_s, (Xc, yc) = best_of(lambda: load_csv(csv_path), args.repeats)
+        store = DatasetStore(os.path.join(tmp, "store"))
+        npy_s, (Xs, ys, _) = best_of(lambda: store.load(), args.repeats)
+        few = store.feature_names[:12]
+        sub_s, _ = best_of(lambda: store.load(columns=few), args.repeats)
+
+        assert np.allclose(Xc, Xs, atol=1e-6) and (yc == ys).all(), "store and CSV disagree"
+        csv_mb = os.path.getsize(csv_path) / 1e6
+
+    print(f"{len(big)} rows x {Xs.shape[1]} features, CSV {csv_mb:.1f} MB ({len(store.sessions())} sessions)")
+    print(f"  one-off conversion     : {convert_s * 1000:8.1f} ms")
+    print(f"  pandas read_csv        : {csv_s * 1000:8.1f} ms")
+    print(f"  store.load()           : {npy_s * 1000:8.1f} ms  ({csv_s / npy_s:.0f}x faster)")
+    print(f"  store.load(12 columns) : {sub_s * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# scripts/bench_decision.py
+# Checks utils.decision.StreamingDecision against the previous per-frame
+# code (deque + np.unique vote, inline EMA) on recorded prediction streams,
+# with EpisodeTracker fed by its evidence, then times both.
+#   python scripts/bench_decision.py                         # model over data/sessions/*.csv
+#   python scripts/replay_sessions.py --out decisions.csv && python scripts/bench_decision.py decisions.csv
+import argparse
+import glob
+import os
+import sys
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.decision import StreamingDecision, BAD_LABEL
+from utils.episodes import EpisodeTracker
+from utils.posture_stack import SMOOTH_ALPHA, EPISODE_ENTER_FRAMES, EPISODE_EXIT_FRAMES
+from utils.replay import iter_landmark_chunks
+
+def streams_from_decisions(path):
+    # replay_sessions.py --out CSV -> [(name, preds, probs)] per session
+    df = pd.read_csv(path, keep_default_na=False)
+    out = []
+    for (src, sid), g in df.groupby(["source", "session_id"], sort=False):
+        probs = [float(p) if p != "" else None for p in g["prob_good"]]
+        out.append((f"{src}:{sid}", [str(p) for p in g["pred"]], probs))
+    return out
+
+def streams_from_model(csv_paths, model_path):
+    # Recorded landmarks -> per-frame classifier outputs, one stream per session
+    from utils.model_artifact import load_predictor
+    from utils.feature_sets import transform_session
+    predictor = load_predictor(model_path)
+    out = []
+    for path in csv_paths:
+        parts = list(iter_landmark_chunks(path))
+        if not parts:
+            continue
+        sids = np.concatenate([p[0] for p in parts])
+        ts = np.concatenate([p[1] for p in parts])
+        X = np.concatenate([p[2] for p in parts])
+        for sid in pd.unique(sids):
+            m = sids == sid
+            Xs = transform_session(getattr(predictor, "feature_set", "raw132"), X[m], ts[m])
+            labels, probs = predictor.predict_batch(Xs)
+            probs = [None] * len(labels) if probs is None else [float(p) for p in probs]
+            out.append((f"{os.path.basename(path)}:{sid}", [str(l).lower() for l in labels], probs))
+    return out
+
+def flicker_stream(n, p_bad, seed):
+    # Synthetic stream that flips often, to exercise ties and the hysteresis band
+    rng = np.random.default_rng(seed)
+    bad = rng.random(n) < p_bad
+    probs = np.clip(np.where(bad, 0.3, 0.7) + rng.normal(0, 0.2, n), 0, 1)
+    return (f"flicker_{p_bad}", ["bad" if b else "good" for b in bad], [float(p) for p in probs])
+
+def reference(preds, probs, window, alpha, enter, exit_):
+    # The pre-StreamingDecision code path, verbatim in spirit
+    hist = deque(maxlen=window)
+    smoothed = 0.5
+    episodes = EpisodeTracker(BAD_LABEL, enter_frames=enter, exit_frames=exit_, min_duration_s=0.0)
+    out = []
+    for i, (pred, prob) in enumerate(zip(preds, probs)):
+        if prob is not None:
+            smoothed = alpha * smoothed + (1 - alpha) * prob
+        hist.append(pred)
+        vals, counts = np.unique(hist, return_counts=True)
+        voted = str(vals[np.argmax(counts)])
+        episodes.update(voted, smoothed, i)
+        out.append((voted, smoothed, episodes.active))
+    return out
+
+def streaming(preds, probs, window, alpha, enter, exit_):
+    d = StreamingDecision(window=window, alpha=alpha)
+    episodes = EpisodeTracker(BAD_LABEL, enter_frames=enter, exit_frames=exit_, min_duration_s=0.0)
+    out = []
+    for i, (pred, prob) in enumerate(zip(preds, probs)):
+        voted = d.update(pred, prob)
+        episodes.update(voted, d.smoothed_good, i, is_bad=d.evidence)
+        out.append((voted, d.smoothed_good, episodes.active))
+    return out
+
+def check_hysteresis(preds, probs, bad_below, good_above):
+    # The latch may only change state outside the band
+    d = StreamingDecision(bad_below=bad_below, good_above=good_above)
+    prev = d.evidence
+    flips = 0
+    for pred, prob in zip(preds, probs):
+        d.update(pred, prob)
+        if d.evidence != prev:
+            flips += 1
+            s = d.smoothed_good
+            assert (d.evidence and s < bad_below) or (not d.evidence and s > good_above), \
+                f"latch flipped inside the band at smoothed={s:.3f}"
+        prev = d.evidence
+    return flips
+
+def per_frame_us(fn, preds, probs, *args):
+    t0 = time.perf_counter()
+    fn(preds, probs, *args)
+    return (time.perf_counter() - t0) / max(1, len(preds)) * 1e6
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Validate and time the streaming decision module")
+    parser.add_argument("inputs", nargs="*",
+                        help="decision CSVs from replay_sessions.py --out (default: run the model over data/sessions)")
+    parser.add_argument("--model", default=paths.model_path)
+    parser.add_argument("--alpha", type=float, default=SMOOTH_ALPHA)
+    parser.add_argument("--enter", type=int, default=EPISODE_ENTER_FRAMES)
+    parser.add_argument("--exit", type=int, default=EPISODE_EXIT_FRAMES)
+    args = parser.parse_args(argv)
+
+    if args.inputs:
+        streams = [s for p in args.inputs for s in streams_from_decisions(p)]
+    else:
+        csvs = sorted(glob.glob(os.path.join(paths.sessions_dir, "*.csv")))
+        streams = streams_from_model(csvs, args.model) if csvs and os.path.exists(args.model) else []
+        if not streams:
+            print("No recorded sessions or model found; using synthetic streams only.")
+    streams += [flicker_stream(20000, p, seed) for seed, p in enumerate((0.3, 0.5))]
+
+    frames = sum(len(s[1]) for s in streams)
+    print(f"{len(streams)} streams, {frames} frames")
+    for window in (4, 8, 15):
+        for name, preds, probs in streams:
+            ref = reference(preds, probs, window, args.alpha, args.enter, args.exit)
+            new = streaming(preds, probs, window, args.alpha, args.enter, args.exit)
+            for i, (a, b) in enumerate(zip(ref, new)):
+                if a[0] != b[0] or a[1] != b[1] or a[2] != b[2]:
+                    raise AssertionError(f"{name} window {window} frame {i}: reference {a} vs streaming {b}")
+        print(f"window {window:2d}: voted label, EMA and bad state identical on every frame")
+
+    preds, probs = streams[-1][1], streams[-1][2]
+    flips = check_hysteresis(preds, probs, 0.4, 0.6)
+    plain = sum(1 for a, b in zip(reference(preds, probs, 8, args.alpha, 1, 1)[1:],
+                                  reference(preds, probs, 8, args.alpha, 1, 1)) if a[0] != b[0])
+    print(f"hysteresis 0.40/0.60: {flips} state changes vs {plain} voted-label changes on {len(preds)} frames")
+
+    print(f"{'window':>6} {'np.unique us/frame':>19} {'streaming us/frame':>19}")
+    for window in (8, 30, 120):
+        ref_us = per_frame_us(reference, preds, probs, window, args.alpha, args.enter, args.exit)
+        new_us = per_frame_us(streaming, preds, probs, window, args.alpha, args.enter, args.exit)
+        print(f"{window:6d} {ref_us:19.2f} {new_us:19.2f}")
+    print("(both timings include EpisodeTracker)")
+
+if __name__ == "__main__":
+    main()
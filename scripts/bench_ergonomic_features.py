@@ -0,0 +1,97 @@
+# scripts/bench_ergonomic_features.py
+# Compares the raw 132-value landmark vector with the compact ergonomic
+# feature set: bytes per frame, extraction time, model latency and accuracy.
+#   python scripts/bench_ergonomic_features.py
+#   python scripts/bench_ergonomic_features.py --source data/sessions --temporal 15
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.ergonomic_features import ergonomic_features, ErgonomicFeatures
+from utils.feature_sets import BASE_SETS, feature_set_name, FeatureChain
+from utils.linear_predictor import as_predictor
+from utils.training import load_training_arrays, build_pipeline
+
+def per_call_us(fn, args, repeats):
+    for a in args[:50]:
+        fn(a)
+    t0 = time.perf_counter()
+    for i in range(repeats):
+        fn(args[i % len(args)])
+    return (time.perf_counter() - t0) / repeats * 1e6
+
+def accuracy(X, y, groups):
+    # Session-grouped CV when every class spans two sessions, else a stratified split
+    from sklearn.metrics import balanced_accuracy_score
+    from sklearn.model_selection import StratifiedGroupKFold, train_test_split
+
+    per_class = {lab: len(set(groups[y == lab])) for lab in np.unique(y)}
+    if min(per_class.values()) >= 2:
+        n = min(5, min(per_class.values()))
+        scores = []
+        for tr, te in StratifiedGroupKFold(n_splits=n, shuffle=True, random_state=42).split(X, y, groups):
+            pipe = build_pipeline().fit(X[tr], y[tr])
+            scores.append(balanced_accuracy_score(y[te], pipe.predict(X[te])))
+        return float(np.mean(scores)), f"{n}-fold session-grouped CV"
+    Xtr, Xte, ytr, yte = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    pipe = build_pipeline().fit(Xtr, ytr)
+    return float(balanced_accuracy_score(yte, pipe.predict(Xte))), "stratified 80/20 frame split"
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Raw landmarks vs ergonomic features")
+    parser.add_argument("--source", default=paths.pose_data_labeled_csv,
+                        help="labeled CSV or sessions directory")
+    parser.add_argument("--temporal", type=int, default=None, metavar="N",
+                        help="also compare with an N-frame temporal window on top")
+    parser.add_argument("--repeats", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    X_raw, y, groups, _ = load_training_arrays(args.source)
+    if len(X_raw) == 0:
+        raise RuntimeError("No labeled rows to benchmark.")
+    print(f"{len(X_raw)} labeled frames, {len(set(groups))} sessions")
+
+    # Reduction itself: single frame (live path) and batch (training path)
+    stage = ErgonomicFeatures()
+    rows = [X_raw[i:i + 1] for i in np.linspace(0, len(X_raw) - 1, num=min(1000, len(X_raw)), dtype=int)]
+    single_us = per_call_us(stage.push, rows, args.repeats)
+    t0 = time.perf_counter()
+    ergonomic_features(X_raw)
+    batch_us = (time.perf_counter() - t0) / len(X_raw) * 1e6
+    print(f"ergonomic extraction: {single_us:.1f} us/frame single, {batch_us:.2f} us/frame batched")
+
+    names = [feature_set_name(b, args.temporal) for b in BASE_SETS]
+    if args.temporal:
+        names = list(BASE_SETS) + names
+    if len(set(y)) < 2:
+        raise RuntimeError("Need labeled frames of both classes to compare accuracy.")
+
+    print(f"{'feature set':<20} {'values':>6} {'bytes/frame':>11} {'store MB':>9} "
+          f"{'stage us':>9} {'model us':>9} {'bal.acc':>8}")
+    how = None
+    for name in names:
+        chain = FeatureChain(name)
+        # Built exactly as training builds them (per session, before unlabeled rows are dropped)
+        X, _, _, _ = load_training_arrays(args.source, feature_set=name)
+        nbytes = X.shape[1] * X.dtype.itemsize
+        stage_us = 0.0 if name == "raw132" else per_call_us(chain.push, rows, args.repeats)
+        pipe = build_pipeline().fit(X, y)
+        predictor = as_predictor(pipe)
+        sample = [X[i:i + 1] for i in np.linspace(0, len(X) - 1, num=min(1000, len(X)), dtype=int)]
+        model_us = per_call_us(predictor.predict, sample, args.repeats)
+        bal, how = accuracy(X, y, groups)
+        print(f"{name:<20} {X.shape[1]:6d} {nbytes:11d} {X.nbytes / 1e6:9.2f} "
+              f"{stage_us:9.1f} {model_us:9.1f} {bal:8.4f}")
+    print(f"accuracy: {how}; store MB = labeled frames x bytes/frame (float32)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# scripts/bench_incremental.py
+# Full retrain vs incremental update as the dataset grows. Sessions are
+# synthesized by resampling the labeled data with small landmark noise.
+#   python scripts/bench_incremental.py --sessions 30 --session-rows 1800
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.training import load_training_arrays, build_pipeline
+from utils.incremental import IncrementalState
+
+def make_session(X, y, label, rows, rng, noise):
+    idx = rng.choice(np.flatnonzero(y == label), size=rows)
+    return (X[idx] + rng.normal(0, noise, (rows, X.shape[1]))).astype(np.float32), y[idx]
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default=paths.pose_data_labeled_csv)
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--session-rows", type=int, default=1800)
+    parser.add_argument("--noise", type=float, default=0.01)
+    parser.add_argument("--print-every", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    X0, y0, _, _ = load_training_arrays(args.csv, paths.labeled_store)
+    rng = np.random.default_rng(0)
+    hold_X, hold_y = zip(*(make_session(X0, y0, lab, 500, rng, args.noise) for lab in ("good", "bad")))
+    hold_X, hold_y = np.concatenate(hold_X), np.concatenate(hold_y)
+
+    # Seed with one session of each class
+    parts = [make_session(X0, y0, lab, args.session_rows, rng, args.noise) for lab in ("good", "bad")]
+    X = np.concatenate([p[0] for p in parts])
+    y = np.concatenate([p[1] for p in parts])
+    pipe = build_pipeline().fit(X, y)
+    state = IncrementalState.seed(pipe, X, y, np.zeros(len(y), dtype=np.int64), 0.0)
+
+    print(f"{'rows':>8} {'full fit':>10} {'incremental':>12} {'speedup':>8} {'full acc':>9} {'inc acc':>8}")
+    total_full = total_inc = 0.0
+    for k in range(args.sessions):
+        Xn, yn = make_session(X0, y0, ("good", "bad")[k % 2], args.session_rows, rng, args.noise)
+        X = np.concatenate([X, Xn])
+        y = np.concatenate([y, yn])
+
+        t0 = time.perf_counter()
+        full = build_pipeline().fit(X, y)
+        full_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        state.partial_update(Xn, yn)
+        inc_s = time.perf_counter() - t0
+        total_full += full_s
+        total_inc += inc_s
+
+        if (k + 1) % args.print_every == 0 or k == args.sessions - 1:
+            full_acc = (full.predict(hold_X) == hold_y).mean()
+            inc_acc = (state.pipeline().predict(hold_X) == hold_y).mean()
+            print(f"{len(y):>8} {full_s * 1000:>8.0f}ms {inc_s * 1000:>10.0f}ms {full_s / inc_s:>7.1f}x "
+                  f"{full_acc:>9.4f} {inc_acc:>8.4f}")
+
+    print(f"Total over {args.sessions} sessions: full {total_full:.2f}s vs incremental {total_inc:.2f}s "
+          f"({total_full - total_inc:.2f}s saved)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# scripts/bench_model_startup.py
+# Cold-start comparison: process launch -> first prediction, for the joblib
+# pickle vs the .npz artifact. Each run is a fresh interpreter.
+import os
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+
+RUNS = 5
+
+PICKLE_CODE = """
+import sys, numpy as np, joblib
+sys.path.insert(0, {root!r})
+from utils.linear_predictor import as_predictor
+p = as_predictor(joblib.load({model!r}))
+p.predict(np.zeros((1, 132), dtype=np.float32))
+print('sklearn' in sys.modules)
+"""
+
+ARTIFACT_CODE = """
+import sys, numpy as np
+sys.path.insert(0, {root!r})
+from utils.model_artifact import load_artifact
+p = load_artifact({model!r})
+p.predict(np.zeros((1, 132), dtype=np.float32))
+print('sklearn' in sys.modules)
+"""
+
+def _time_runs(code: str):
+    times = []
+    sklearn_loaded = None
+    for _ in range(RUNS):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - t0)
+        sklearn_loaded = out.stdout.strip().endswith("True")
+    times.sort()
+    return times[len(times) // 2], sklearn_loaded
+
+def main():
+    paths = Paths()
+    fmt = dict(root=PROJECT_ROOT, model=paths.model_path)
+    if not os.path.exists(paths.model_npz):
+        raise SystemExit("No models/posture_model.npz; run scripts/export_model_artifact.py first.")
+
+    base, _ = _time_runs("pass")
+    pkl, pkl_sk = _time_runs(PICKLE_CODE.format(**fmt))
+    npz, npz_sk = _time_runs(ARTIFACT_CODE.format(**fmt))
+
+    print(f"median of {RUNS} cold starts (launch -> first prediction)")
+    print(f"bare interpreter : {base * 1000:7.1f} ms")
+    print(f"joblib .pkl      : {pkl * 1000:7.1f} ms  (sklearn imported: {pkl_sk})")
+    print(f".npz artifact    : {npz * 1000:7.1f} ms  (sklearn imported: {npz_sk})")
+
+if __name__ == "__main__":
+    main()
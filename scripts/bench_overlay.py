@@ -0,0 +1,116 @@
+# scripts/bench_overlay.py
+# Per-frame cost of the HUD: the previous full-frame panel blend and
+# mp_drawing.draw_landmarks vs utils.visualization.OverlayRenderer.
+#   python scripts/bench_overlay.py
+#   python scripts/bench_overlay.py --size 1280x720 --frames 2000
+import argparse
+import math
+import os
+import sys
+import time
+from types import SimpleNamespace
+import numpy as np
+import cv2
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.visualization import OverlayRenderer, POSE_CONNECTIONS, FONT
+
+def old_panel(frame, lines, x=10, y=10, pad=8, line_h=24):
+    # The previous draw_panel: full-frame copy + addWeighted, getTextSize per line per frame
+    w = max(cv2.getTextSize(l, FONT, 0.6, 2)[0][0] for l in lines) + 2 * pad
+    h = line_h * len(lines) + 2 * pad
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (x, y), (x + w, y + h), (20, 20, 20), thickness=-1)
+    cv2.addWeighted(overlay, 0.5, frame, 0.5, 0, frame)
+    for i, l in enumerate(lines):
+        cy = y + pad + (i + 1) * line_h - 6
+        cv2.putText(frame, l, (x + pad, cy), FONT, 0.6, (235, 235, 235), 2, cv2.LINE_AA)
+
+def mp_drawing_skeleton(frame, landmarks):
+    # mp_drawing.draw_landmarks with its default specs, re-implemented for
+    # machines without mediapipe: per-bone cv2.line, then a white ring and
+    # a red ring per landmark
+    h, w = frame.shape[:2]
+    pts = {}
+    for i, lm in enumerate(landmarks):
+        if lm.visibility < 0.5 or not (0.0 <= lm.x <= 1.0 and 0.0 <= lm.y <= 1.0):
+            continue
+        pts[i] = (min(math.floor(lm.x * w), w - 1), min(math.floor(lm.y * h), h - 1))
+    for a, b in POSE_CONNECTIONS:
+        if a in pts and b in pts:
+            cv2.line(frame, pts[a], pts[b], (224, 224, 224), 2)
+    for p in pts.values():
+        cv2.circle(frame, p, 3, (224, 224, 224), 2)
+        cv2.circle(frame, p, 2, (0, 0, 255), 2)
+
+def fake_landmarks(rng, n):
+    # Upper-body-ish pose with jitter, visibility mostly high
+    base = rng.uniform(0.3, 0.7, (33, 2))
+    out = []
+    for _ in range(n):
+        xy = base + rng.normal(0, 0.003, base.shape)
+        vis = rng.uniform(0.4, 1.0, 33)
+        out.append([SimpleNamespace(x=float(a), y=float(b), z=0.0, visibility=float(v))
+                    for (a, b), v in zip(xy, vis)])
+    return out
+
+def per_frame_us(fn, frames, n):
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(frames[i % len(frames)], i)
+    return (time.perf_counter() - t0) / n * 1e6
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Overlay rendering cost per frame")
+    parser.add_argument("--size", default="640x480")
+    parser.add_argument("--frames", type=int, default=3000)
+    args = parser.parse_args(argv)
+    w, h = (int(v) for v in args.size.lower().split("x"))
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (h, w, 3), dtype=np.uint8) for _ in range(4)]
+    poses = fake_landmarks(rng, 64)
+
+    def lines(i):
+        # Same shape as the live HUD: one label and a few changing numbers
+        return ["Good posture", f"Good prob (smoothed): {0.5 + 0.4 * np.sin(i / 30):.2f}",
+                f"FPS: {29 + (i % 20) / 10:.1f}", f"Frame age: {30 + i % 15:.0f} ms",
+                "Quality: native c1  skip 12%", "Press q to quit"]
+
+    renderer = OverlayRenderer()
+    n = args.frames
+    rows = [
+        ("panel, full-frame blend (old)", per_frame_us(lambda f, i: old_panel(f, lines(i)), frames, n)),
+        ("panel, ROI blend + cached text", per_frame_us(lambda f, i: renderer.panel(f, lines(i)), frames, n)),
+        ("skeleton, mp_drawing logic (re-impl.)",
+         per_frame_us(lambda f, i: mp_drawing_skeleton(f, poses[i % 64]), frames, n)),
+        ("skeleton, OverlayRenderer", per_frame_us(lambda f, i: renderer.skeleton(f, poses[i % 64]), frames, n)),
+    ]
+    try:
+        import mediapipe as mp
+        from mediapipe.framework.formats import landmark_pb2
+        mp_draw, conn = mp.solutions.drawing_utils, mp.solutions.pose.POSE_CONNECTIONS
+        protos = []
+        for p in poses:
+            lst = landmark_pb2.NormalizedLandmarkList()
+            for lm in p:
+                lst.landmark.add(x=lm.x, y=lm.y, z=lm.z, visibility=lm.visibility)
+            protos.append(lst)
+        rows.insert(2, ("skeleton, mp_drawing.draw_landmarks",
+                        per_frame_us(lambda f, i: mp_draw.draw_landmarks(f, protos[i % 64], conn), frames, n)))
+    except ImportError:
+        print("(mediapipe not installed: the re-implemented mp_drawing row stands in for the real one)")
+
+    print(f"{w}x{h}, {n} frames")
+    for name, us in rows:
+        print(f"  {name:<40} {us:8.1f} us/frame")
+    old = rows[0][1] + rows[2][1]
+    new = rows[1][1] + rows[-1][1]
+    print(f"  HUD total: {old:.1f} -> {new:.1f} us/frame ({1 - new / old:.0%} less); --headless skips it and imshow entirely")
+
+if __name__ == "__main__":
+    main()
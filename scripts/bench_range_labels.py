@@ -0,0 +1,71 @@
+# scripts/bench_range_labels.py
+# Row-wise df.apply + linear range scan (the old label_by_ranges) vs RangeLabeler.
+#   python scripts/bench_range_labels.py --rows 2000000 --sessions 200 --ranges-per-session 40
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.range_labels import RangeLabeler, ranges_from_dicts
+
+def old_labels(df, good, bad):
+    def in_ranges(ts, ranges):
+        for a, b in ranges:
+            if a <= ts <= b:
+                return True
+        return False
+
+    def lab(row):
+        sid, ts = int(row["session_id"]), int(row["timestamp_ms"])
+        if sid in good and in_ranges(ts, good[sid]):
+            return "good"
+        if sid in bad and in_ranges(ts, bad[sid]):
+            return "bad"
+        return ""
+    return df.apply(lab, axis=1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--ranges-per-session", type=int, default=40)
+    parser.add_argument("--old-sample", type=int, default=50_000, help="rows timed for the old path (extrapolated)")
+    args = parser.parse_args(argv)
+
+    per = args.rows // args.sessions
+    sids = np.repeat(np.arange(args.sessions, dtype=np.int64) + 1_700_000_000, per)
+    ts = np.tile(np.arange(per, dtype=np.int64) * 33, args.sessions) + 1_700_000_000_000
+    df = pd.DataFrame({"session_id": sids, "timestamp_ms": ts})
+
+    # Alternating good/bad ranges tiling each session with gaps
+    good, bad = {}, {}
+    span = per * 33 // args.ranges_per_session
+    for sid in np.unique(sids):
+        for r in range(args.ranges_per_session):
+            a = 1_700_000_000_000 + r * span
+            (good if r % 2 == 0 else bad).setdefault(int(sid), []).append((a, a + int(span * 0.8)))
+
+    t0 = time.perf_counter()
+    labeler = RangeLabeler(ranges_from_dicts({"good": good, "bad": bad}))
+    new = labeler.label(df["session_id"].to_numpy(), df["timestamp_ms"].to_numpy())
+    new_s = time.perf_counter() - t0
+
+    sample = df.iloc[:args.old_sample]
+    t0 = time.perf_counter()
+    old = old_labels(sample, good, bad).to_numpy()
+    old_s = (time.perf_counter() - t0) * len(df) / len(sample)
+
+    assert (old == new[:len(sample)]).all(), "labels differ from the row-wise implementation"
+    print(f"{len(df):,} rows, {args.sessions} sessions x {args.ranges_per_session} ranges")
+    print(f"  df.apply + linear scan : {old_s:8.2f} s (extrapolated from {len(sample):,} rows)")
+    print(f"  RangeLabeler           : {new_s:8.3f} s ({old_s / new_s:,.0f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# scripts/bench_startup.py
+# Time to first posture decision for live_detection_alarm.py:
+#   cold    - process launch -> first decision (what login.py used to do)
+#   standby - "go" written to a --standby process that reported READY ->
+#             first decision (what login.py does now)
+# Runs headless on a synthetic source unless --source is given.
+#   python scripts/bench_startup.py
+#   python scripts/bench_startup.py --source 0 --runs 3
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DETECTOR = os.path.join(PROJECT_ROOT, "live_detection_alarm.py")
+
+def _read_until(proc, prefix: str) -> str:
+    for line in proc.stdout:
+        if line.startswith(prefix):
+            return line.strip()
+    raise RuntimeError(f"detector exited before printing {prefix!r} (exit code {proc.wait()})")
+
+def _finish(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+def cold_start(cmd):
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        line = _read_until(proc, "Startup:")
+        return time.perf_counter() - t0, line
+    finally:
+        _finish(proc)
+
+def standby_start(cmd):
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd + ["--standby"], cwd=PROJECT_ROOT, stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, text=True)
+    try:
+        _read_until(proc, "READY")
+        ready = time.perf_counter() - t0
+        t1 = time.perf_counter()
+        proc.stdin.write("go\n")
+        proc.stdin.flush()
+        line = _read_until(proc, "Startup:")
+        return time.perf_counter() - t1, ready, line
+    finally:
+        _finish(proc)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detector startup: cold launch vs resident standby")
+    parser.add_argument("--source", default="synthetic:640x480@30:0")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+    cmd = [sys.executable, DETECTOR, "--headless", "--source", args.source]
+
+    cold, warm, ready = [], [], []
+    for _ in range(args.runs):
+        s, cold_line = cold_start(cmd)
+        cold.append(s)
+        s, r, warm_line = standby_start(cmd)
+        warm.append(s)
+        ready.append(r)
+    med = lambda v: sorted(v)[len(v) // 2] * 1000.0
+    print(f"median of {args.runs} runs, source {args.source}")
+    print(f"cold launch -> first decision     : {med(cold):8.1f} ms   ({cold_line})")
+    print(f"standby 'go' -> first decision    : {med(warm):8.1f} ms   ({warm_line})")
+    print(f"  (standby launch -> READY, paid while the login window is open: {med(ready):.1f} ms)")
+
+if __name__ == "__main__":
+    main()
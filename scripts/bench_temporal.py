@@ -0,0 +1,62 @@
+# scripts/bench_temporal.py
+# Checks the ring-buffer temporal features against a brute-force window
+# computation and times push() (the per-frame cost added to the live loop).
+#   python scripts/bench_temporal.py --window 15
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.temporal import TemporalFeatures
+
+def brute_force(X, ts, window):
+    out = np.empty((len(X), 4 * X.shape[1]))
+    for i in range(len(X)):
+        lo = max(0, i - window + 1)
+        w = X[lo:i + 1].astype(np.float64)
+        dt_s = (ts[i] - ts[lo]) / 1000.0
+        vel = (w[-1] - w[0]) / dt_s if len(w) > 1 else np.zeros(X.shape[1])
+        out[i] = np.concatenate([w[-1], w.mean(axis=0), w.var(axis=0), vel])
+    return out
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--window", type=int, default=15)
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    # Landmark-like signal: slow drift plus jitter
+    X = (np.cumsum(rng.normal(0, 0.002, (args.frames, 132)), axis=0) + 0.5).astype(np.float32)
+    # Uneven frame spacing, as with the motion gate (forced refresh every 1 s)
+    ts = np.cumsum(rng.choice([33, 33, 66, 1033], size=args.frames))
+
+    tf = TemporalFeatures(window=args.window)
+    fast = tf.transform(X, ts)
+    ref = brute_force(X, ts, args.window)
+    err = np.abs(fast - ref).max() / max(1.0, np.abs(ref).max())
+    print(f"max relative |ring buffer - brute force| over {args.frames} frames: {err:.2e}")
+    assert err < 1e-5, "temporal features drifted from the reference"
+
+    tf.reset()
+    for i in range(200):
+        tf.push(X[i], int(ts[i]))
+    t0 = time.perf_counter()
+    for i in range(args.frames):
+        tf.push(X[i], int(ts[i]) + 10**7)
+    push_us = (time.perf_counter() - t0) / args.frames * 1e6
+    t0 = time.perf_counter()
+    for i in range(2000):
+        w = X[i:i + args.window].astype(np.float64)
+        np.concatenate([w[-1], w.mean(axis=0), w.var(axis=0), (w[-1] - w[0]) / ((ts[i + len(w) - 1] - ts[i]) / 1000.0)])
+    brute_us = (time.perf_counter() - t0) / 2000 * 1e6
+    print(f"push(): {push_us:.1f} us/frame (window {args.window}); recomputing the window: {brute_us:.1f} us/frame")
+
+if __name__ == "__main__":
+    main()
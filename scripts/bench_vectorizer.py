@@ -0,0 +1,73 @@
+# scripts/bench_vectorizer.py
+# Micro-benchmark: legacy per-landmark loop vs LandmarkVectorizer.
+# Runs without a camera or MediaPipe (uses landmark-like stand-in objects).
+import os
+import sys
+import time
+import random
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.feature_vector import NUM_LANDMARKS, LandmarkVectorizer, vectorize_batch
+
+N_FRAMES = 20000
+BATCH = 256
+
+class _Landmark:
+    __slots__ = ("x", "y", "z", "visibility")
+
+    def __init__(self, x, y, z, visibility):
+        self.x, self.y, self.z, self.visibility = x, y, z, visibility
+
+def _fake_frame(rng):
+    return [_Landmark(rng.random(), rng.random(), rng.random() - 0.5, rng.random())
+            for _ in range(NUM_LANDMARKS)]
+
+def _legacy_vectorize(landmarks):
+    # Copy of the pre-refactor implementation, for comparison
+    feat = []
+    for i in range(NUM_LANDMARKS):
+        lm = landmarks[i]
+        x = float(getattr(lm, "x", 0.0))
+        y = float(getattr(lm, "y", 0.0))
+        z = float(getattr(lm, "z", 0.0))
+        v = float(getattr(lm, "visibility", 0.0))
+        feat.extend([x, y, z, v])
+    return np.asarray(feat, dtype=np.float32).reshape(1, -1)
+
+def _per_frame_us(fn, frames):
+    t0 = time.perf_counter()
+    for lms in frames:
+        fn(lms)
+    return (time.perf_counter() - t0) / len(frames) * 1e6
+
+def main():
+    rng = random.Random(0)
+    pool = [_fake_frame(rng) for _ in range(64)]
+    frames = [pool[i % len(pool)] for i in range(N_FRAMES)]
+
+    vec = LandmarkVectorizer()
+    ref = _legacy_vectorize(frames[0])
+    if not np.array_equal(ref, vec.fill(frames[0])):
+        raise AssertionError("LandmarkVectorizer output differs from the legacy loop")
+
+    legacy_us = _per_frame_us(_legacy_vectorize, frames)
+    fill_us = _per_frame_us(vec.fill, frames)
+
+    out = np.empty((BATCH, vec.buffer.shape[1]), dtype=np.float32)
+    t0 = time.perf_counter()
+    for i in range(0, N_FRAMES, BATCH):
+        vectorize_batch(frames[i:i + BATCH], out=out)
+    batch_us = (time.perf_counter() - t0) / N_FRAMES * 1e6
+
+    print(f"frames: {N_FRAMES}")
+    print(f"legacy loop      : {legacy_us:7.2f} us/frame")
+    print(f"vectorizer.fill  : {fill_us:7.2f} us/frame  ({legacy_us / fill_us:.1f}x)")
+    print(f"vectorize_batch  : {batch_us:7.2f} us/frame  ({legacy_us / batch_us:.1f}x, batch={BATCH})")
+
+if __name__ == "__main__":
+    main()
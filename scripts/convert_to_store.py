@@ -0,0 +1,33 @@
+# scripts/convert_to_store.py
+# Converts landmark CSVs into the memory-mapped float32 store.
+#   python scripts/convert_to_store.py                                   # labeled dataset -> data/store/pose_data_labeled
+#   python scripts/convert_to_store.py data/pose_data.csv --store data/store/pose_data
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.dataset_store import import_csv
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Convert landmark CSVs to the columnar .npy store")
+    parser.add_argument("csv", nargs="?", default=paths.pose_data_labeled_csv)
+    parser.add_argument("--store", default=None, help="store directory (default: data/store/<csv name>)")
+    args = parser.parse_args(argv)
+
+    store_dir = args.store or os.path.join(paths.store_dir, os.path.splitext(os.path.basename(args.csv))[0])
+    t0 = time.perf_counter()
+    store = import_csv(args.csv, store_dir)
+    dt = time.perf_counter() - t0
+    print(f"{args.csv} -> {store_dir}: {store.rows()} rows, {len(store.sessions())} session(s), "
+          f"classes {store.classes or '-'} in {dt:.2f}s")
+
+if __name__ == "__main__":
+    main()
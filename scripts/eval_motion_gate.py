@@ -0,0 +1,90 @@
+# scripts/eval_motion_gate.py
+# Runs a recorded video through pose + the decision stack twice, with and
+# without the motion gate, and reports how often the decisions agree.
+#   python scripts/eval_motion_gate.py data/recordings/desk.mp4
+#   python scripts/eval_motion_gate.py desk.mp4 --motion-threshold 2 --max-skip-ms 500
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.model_artifact import load_predictor
+from utils.feature_vector import LandmarkVectorizer
+from utils.posture_stack import PostureStack
+from utils.feature_sets import feature_stage_for
+from utils.motion import MotionGate, add_motion_args
+
+def run(video, predictor, mp_pose, gate: MotionGate):
+    # -> (list of (voted, alarm) per frame, pose+classify seconds)
+    cap = cv2.VideoCapture(video)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Cannot open video: {video}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    vectorizer = LandmarkVectorizer()
+    stack = PostureStack(predictor, features=feature_stage_for(predictor))
+    out = []
+    busy = 0.0
+    idx = 0
+    with mp_pose.Pose(static_image_mode=False, model_complexity=1) as pose:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            # Video time, not wall time, so max-skip behaves as it would live
+            t_video = idx / fps
+            ts_ms = int(t_video * 1000)
+            if gate.should_process(frame, now=t_video):
+                t0 = time.perf_counter()
+                res = pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                X = vectorizer.fill(res.pose_landmarks.landmark) if res.pose_landmarks else None
+                d = stack.step(X, ts_ms)
+                cost = time.perf_counter() - t0
+                gate.note_cost(cost * 1000.0)
+                busy += cost
+            else:
+                d = stack.repeat_last(ts_ms)
+            out.append((d.voted, d.alarm))
+            idx += 1
+    cap.release()
+    stack.close()
+    return out, busy
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Compare decisions with and without the motion gate")
+    parser.add_argument("video", help="recorded video file")
+    parser.add_argument("--model", default=paths.model_path)
+    add_motion_args(parser)
+    args = parser.parse_args(argv)
+
+    import mediapipe as mp
+    mp_pose = mp.solutions.pose
+    predictor = load_predictor(args.model)
+
+    base, base_s = run(args.video, predictor, mp_pose, MotionGate(enabled=False))
+    gate = MotionGate(threshold=args.motion_threshold, max_skip_s=args.max_skip_ms / 1000.0)
+    gated, gated_s = run(args.video, predictor, mp_pose, gate)
+
+    n = min(len(base), len(gated))
+    if n == 0:
+        raise RuntimeError("Video has no frames.")
+    vote_agree = sum(base[i][0] == gated[i][0] for i in range(n)) / n
+    alarm_agree = sum(base[i][1] == gated[i][1] for i in range(n)) / n
+
+    print(f"Frames: {n}")
+    print(f"Skip rate: {gate.skip_rate:.1%}  (threshold {args.motion_threshold}, max skip {args.max_skip_ms:.0f} ms)")
+    print(f"Voted label agreement: {vote_agree:.2%}")
+    print(f"Alarm state agreement: {alarm_agree:.2%}")
+    print(f"Pose+classify time: {base_s:.2f}s ungated vs {gated_s:.2f}s gated "
+          f"({(1 - gated_s / base_s) if base_s else 0:.0%} saved)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# scripts/export_model_artifact.py
+# Writes models/posture_model.npz + .json from an existing posture_model.pkl
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.model_artifact import export_from_pickle
+
+def main():
+    model_path = sys.argv[1] if len(sys.argv) > 1 else Paths().model_path
+    npz_path, header_path = export_from_pickle(model_path)
+    print(f"Saved {npz_path} and {header_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# scripts/export_sessions.py
+# Materializes the cataloged sessions as the combined CSVs the older tools
+# expect (e.g. label_by_ranges.py reads data/pose_data.csv).
+#   python scripts/export_sessions.py                 # pose_data.csv + pose_data_labeled.csv
+#   python scripts/export_sessions.py --label bad --labeled-out bad_only.csv --raw-out ""
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.catalog import SessionCatalog
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Export cataloged sessions to combined CSVs")
+    parser.add_argument("--raw-out", default=paths.pose_data_csv, help="unlabeled CSV ('' to skip)")
+    parser.add_argument("--labeled-out", default=paths.pose_data_labeled_csv, help="labeled CSV ('' to skip)")
+    parser.add_argument("--label", default=None, help="only sessions with this label")
+    args = parser.parse_args(argv)
+
+    catalog = SessionCatalog(paths.sessions_dir, paths.sessions_manifest)
+    added, removed = catalog.scan()
+    if added or removed:
+        print(f"Manifest updated: +{added} / -{removed} session(s)")
+    if args.raw_out:
+        rows = catalog.view(labeled=False, label=args.label).to_csv(args.raw_out)
+        print(f"Wrote {rows} rows to {args.raw_out}")
+    if args.labeled_out:
+        rows = catalog.view(labeled=True, label=args.label).to_csv(args.labeled_out)
+        print(f"Wrote {rows} rows to {args.labeled_out}")
+
+if __name__ == "__main__":
+    main()
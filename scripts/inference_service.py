@@ -0,0 +1,37 @@
+# scripts/inference_service.py
+# Local classification service: detectors connect with --service and share
+# one loaded model; requests are grouped into micro-batches.
+#   python scripts/inference_service.py                         # tcp:127.0.0.1:8765
+#   python scripts/inference_service.py --listen unix:/tmp/posture.sock --max-wait-ms 1
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.model_artifact import load_predictor
+from utils.inference_service import InferenceServer, DEFAULT_ADDRESS
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Micro-batching posture classification service")
+    parser.add_argument("--model", default=paths.model_path)
+    parser.add_argument("--listen", default=DEFAULT_ADDRESS, help="tcp:HOST:PORT or unix:/path")
+    parser.add_argument("--max-batch", type=int, default=64, help="rows per predict call")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0,
+                        help="how long the first request of a batch may wait for company")
+    args = parser.parse_args(argv)
+
+    predictor = load_predictor(args.model)
+    server = InferenceServer(predictor, args.listen, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    print(f"Serving {args.model} ({getattr(predictor, 'feature_set', 'raw132')}) on {args.listen}; Ctrl+C to stop")
+    server.serve_forever()
+    print(f"{server.clients} client(s), {server.rows} rows in {server.batches} batches "
+          f"(mean {server.mean_batch:.1f}/batch), predict p50 {server.predict_ms.percentile(50):.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,63 @@
 # scripts/label_by_ranges.py
+#   python scripts/label_by_ranges.py                          # ranges from data/label_ranges.csv
+#   python scripts/label_by_ranges.py --ranges my_ranges.json --on-conflict unlabel
+import argparse
 import os
-import pandas as pd
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.range_labels import RangeLabeler, label_csv, read_ranges, ranges_from_dicts, UNLABELED
 
 IN_PATH = os.path.join("data", "pose_data.csv")
 OUT_PATH = os.path.join("data", "pose_data_labeled.csv")
+RANGES_PATH = os.path.join("data", "label_ranges.csv")
 
-# Fill with your actual session_id and (start_ms, end_ms) ranges
+# Optional inline ranges, used when no ranges file exists:
+# {session_id: [(start_ms, end_ms), ...]}, bounds inclusive
 GOOD_RANGES = {}
 BAD_RANGES = {}
 
-def in_ranges(ts: int, ranges):
-    for a, b in ranges:
-        if a <= ts <= b:
-            return True
-    return False
-
-def main():
-    if not os.path.exists(IN_PATH):
-        raise FileNotFoundError(f"Input CSV not found: {IN_PATH}")
-
-    df = pd.read_csv(IN_PATH)
-
-    # Basic schema checks
-    required = {"session_id", "timestamp_ms"}
-    missing = [c for c in required if c not in df.columns]
-    if missing:
-        raise ValueError(f"Missing required columns in {IN_PATH}: {missing}")
-
-    # Coerce to numeric
-    df["session_id"] = pd.to_numeric(df["session_id"], errors="coerce")
-    df["timestamp_ms"] = pd.to_numeric(df["timestamp_ms"], errors="coerce")
-    if df["session_id"].isna().any() or df["timestamp_ms"].isna().any():
-        raise ValueError("Found non-numeric session_id or timestamp_ms; please fix the input CSV.")
-
-    # MUST return a single scalar string per row
-    def lab(row) -> str:
-        sid = int(row["session_id"])
-        ts = int(row["timestamp_ms"])
-        if sid in GOOD_RANGES and in_ranges(ts, GOOD_RANGES[sid]):
-            return "good"
-        if sid in BAD_RANGES and in_ranges(ts, BAD_RANGES[sid]):
-            return "bad"
-        return ""  # unlabeled
-
-    labels = df.apply(lab, axis=1)
-
-    # Guard: ensure labels is a 1D Series
-    if not isinstance(labels, pd.Series):
-        # Convert if it somehow became a DataFrame
-        labels = pd.Series(labels.squeeze() if hasattr(labels, "squeeze") else labels)
-
-    # Extra guard: if labels is a DataFrame, squeeze to 1D
-    if isinstance(labels, pd.DataFrame):
-        if labels.shape[1] != 1:
-            raise ValueError(f"Labels is not 1D (shape={labels.shape}). Check lab() to return a single string.")
-        labels = labels.iloc[:, 0]
-
-    df = df.copy()
-    df["label"] = labels.astype(str)
-
-    out = df[df["label"].isin(["good", "bad"])].copy()
-    if out.empty:
-        raise ValueError(
-            "No rows labeled. Fill GOOD_RANGES/BAD_RANGES with correct session_id keys and (start_ms, end_ms) ranges."
-        )
-
-    os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
-    out.to_csv(OUT_PATH, index=False)
-    print(f"Wrote {OUT_PATH} with {len(out)} labeled rows.")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Label landmark rows from per-session time ranges")
+    parser.add_argument("--in", dest="in_path", default=IN_PATH)
+    parser.add_argument("--out", default=OUT_PATH)
+    parser.add_argument("--ranges", default=RANGES_PATH,
+                        help="CSV (session_id,start_ms,end_ms,label) or JSON {label: {session_id: [[a, b], ...]}}")
+    parser.add_argument("--on-conflict", choices=("error", "unlabel"), default="error",
+                        help="what to do where ranges with different labels overlap")
+    parser.add_argument("--keep-unlabeled", action="store_true", help="also write rows outside every range")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.in_path):
+        raise FileNotFoundError(f"Input CSV not found: {args.in_path}")
+    if os.path.exists(args.ranges):
+        ranges = read_ranges(args.ranges)
+    else:
+        ranges = ranges_from_dicts({"good": GOOD_RANGES, "bad": BAD_RANGES})
+    if ranges.empty:
+        raise ValueError(f"No ranges. Add rows to {args.ranges} (session_id,start_ms,end_ms,label) "
+                         "or fill GOOD_RANGES/BAD_RANGES.")
+
+    labeler = RangeLabeler(ranges, on_conflict=args.on_conflict)
+    for issue in labeler.issues:
+        print("Warning:", issue.describe())
+
+    t0 = time.perf_counter()
+    counts = label_csv(args.in_path, args.out, labeler, chunk_rows=args.chunk_rows,
+                       keep_unlabeled=args.keep_unlabeled)
+    dt = time.perf_counter() - t0
+
+    labeled = sum(n for lab, n in counts.items() if lab != UNLABELED)
+    if labeled == 0:
+        raise ValueError("No rows labeled. Check the session_id keys and (start_ms, end_ms) ranges.")
+    per_label = ", ".join(f"{lab}: {n}" for lab, n in counts.items() if lab != UNLABELED)
+    print(f"Wrote {args.out} with {labeled} labeled rows ({per_label}; {counts[UNLABELED]} unlabeled) in {dt:.2f}s.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,109 @@
+# scripts/load_test_service.py
+# Load-tests the inference service: N client processes send landmark vectors
+# for a fixed time; reports throughput and tail latency per client count.
+#   python scripts/load_test_service.py                      # starts its own server
+#   python scripts/load_test_service.py --address unix:/tmp/posture.sock --clients 1 4 16 --rate 30
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.model_artifact import load_predictor
+from utils.inference_service import InferenceServer, RemotePredictor
+
+def _client(address, duration_s, rate, seed, n_features, out_q):
+    rng = np.random.default_rng(seed)
+    X = rng.random((256, n_features), dtype=np.float32)
+    remote = RemotePredictor(address)
+    period = 1.0 / rate if rate > 0 else 0.0
+    lat = []
+    start = time.perf_counter()
+    next_t = start
+    i = 0
+    while time.perf_counter() - start < duration_s:
+        if period:
+            now = time.perf_counter()
+            if next_t > now:
+                time.sleep(next_t - now)
+            next_t += period
+        t0 = time.perf_counter()
+        remote.predict(X[i % len(X)])
+        lat.append(time.perf_counter() - t0)
+        i += 1
+    remote.close()
+    out_q.put(np.asarray(lat))
+
+def run_level(address, clients, duration_s, rate, n_features):
+    ctx = mp.get_context("spawn")
+    q = ctx.Queue()
+    procs = [ctx.Process(target=_client, args=(address, duration_s, rate, k, n_features, q)) for k in range(clients)]
+    for p in procs:
+        p.start()
+    lats = [q.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return np.concatenate(lats) * 1000.0
+
+def local_latency_us(predictor, n_features, repeats=20000):
+    X = np.random.default_rng(0).random((256, n_features), dtype=np.float32)
+    t0 = time.perf_counter()
+    for i in range(repeats):
+        predictor.predict(X[i % 256:i % 256 + 1])
+    return (time.perf_counter() - t0) / repeats * 1e6
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Throughput and tail latency of the inference service")
+    parser.add_argument("--address", default=None, help="running service (default: start one on a free port)")
+    parser.add_argument("--model", default=paths.model_path, help="model for the self-started service")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per client count")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="requests/s per client (30 = one camera); 0 = as fast as possible")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.address is None:
+        predictor = load_predictor(args.model)
+        server = InferenceServer(predictor, "tcp:127.0.0.1:0", max_batch=args.max_batch,
+                                 max_wait_ms=args.max_wait_ms).start()
+        address = server.address
+        print(f"In-process service on {address}; local predict(): "
+              f"{local_latency_us(predictor, server.n_features or 132):.1f} us/frame")
+    else:
+        address = args.address
+    probe = RemotePredictor(address)
+    n_features = probe.n_features or 132
+    probe.close()
+
+    pace = f"{args.rate:g}/s per client" if args.rate > 0 else "closed loop"
+    print(f"{args.duration:g}s per level, {pace}")
+    print(f"{'clients':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'rows/batch':>10}")
+    try:
+        for n in args.clients:
+            rows0, batches0 = (server.rows, server.batches) if server else (0, 0)
+            t0 = time.perf_counter()
+            lat = run_level(address, n, args.duration, args.rate, n_features)
+            wall = time.perf_counter() - t0
+            per_batch = ""
+            if server is not None and server.batches > batches0:
+                per_batch = f"{(server.rows - rows0) / (server.batches - batches0):.1f}"
+            p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+            print(f"{n:7d} {len(lat) / min(wall, args.duration + 0.5):9.0f} {p50:8.3f} {p95:8.3f} "
+                  f"{p99:8.3f} {lat.max():8.3f} {per_batch:>10}")
+    finally:
+        if server is not None:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
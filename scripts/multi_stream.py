@@ -0,0 +1,69 @@
+# scripts/multi_stream.py
+# Runs posture detection on several cameras / video files at once: pose on a
+# pool of worker processes, one shared classifier, per-stream decisions.
+#   python scripts/multi_stream.py desk1.mp4 desk2.mp4 desk3.mp4
+#   python scripts/multi_stream.py 0 1 --workers 2 --threads 2 --affinity auto --journal
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.model_artifact import load_predictor
+from utils.feature_sets import feature_stage_for
+from utils.episodes import EPISODE_COLUMNS
+from utils.posture_stack import PostureStack, default_episodes
+from utils.multistream import MultiStreamRunner
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Posture detection on several frame sources")
+    parser.add_argument("sources", nargs="+",
+                        help="webcam indices, video files, image directories or synthetic[:WxH][@fps][:N]")
+    parser.add_argument("--model", default=paths.model_path)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="pose worker processes (default: one per stream, up to the CPU count)")
+    parser.add_argument("--threads", type=int, default=1, help="OpenCV/BLAS threads per worker (0 = library default)")
+    parser.add_argument("--affinity", default=None,
+                        help="pin workers to CPUs: 'auto' or explicit sets like '0,1;2,3'")
+    parser.add_argument("--model-complexity", type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument("--realtime", action="store_true", help="pace recorded sources to their fps")
+    parser.add_argument("--loop", action="store_true", help="loop video files / image directories")
+    parser.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--journal", action="store_true",
+                        help="log episodes to the events database (table stream_episodes)")
+    args = parser.parse_args(argv)
+
+    # Loaded once; every stream's stack shares it (predict() keeps no per-stream state)
+    predictor = load_predictor(args.model)
+
+    journal = None
+    if args.journal:
+        from utils.event_log import EventJournal
+        journal = EventJournal(paths.events_db, "stream_episodes", ("stream",) + EPISODE_COLUMNS)
+
+    def make_stack(i, source):
+        episodes = default_episodes()
+        on_episode = None
+        if journal is not None:
+            on_episode = lambda ep: journal.log(dict(ep.as_row(), stream=source))
+        # Feature stages keep a window per stream, so each stack gets its own
+        return PostureStack(predictor, episodes=episodes, on_episode=on_episode, features=feature_stage_for(predictor))
+
+    runner = MultiStreamRunner(args.sources, make_stack, workers=args.workers, threads_per_worker=args.threads or None,
+                               affinity=args.affinity, realtime=args.realtime, loop=args.loop,
+                               model_complexity=args.model_complexity)
+    try:
+        report = runner.run(duration_s=args.duration)
+    finally:
+        if journal is not None:
+            journal.close()
+    for line in report.format_lines():
+        print(line)
+
+if __name__ == "__main__":
+    main()
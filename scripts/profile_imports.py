@@ -0,0 +1,60 @@
+# scripts/profile_imports.py
+# Import-time profile of the entry points (python -X importtime in a fresh
+# interpreter each): total, the heaviest top-level packages, and which of
+# the heavy optional libraries each one pulls in.
+#   python scripts/profile_imports.py
+#   python scripts/profile_imports.py utils.training --top 15
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+ENTRY_POINTS = ("login", "admin", "live_detection_alarm")
+HEAVY = ("mediapipe", "cv2", "pandas", "sklearn", "scipy", "joblib", "numpy")
+
+def import_profile(module: str):
+    # -> (total_ms, {package imported by the module: cumulative ms}, {every top-level package loaded})
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{out.stderr.strip().splitlines()[-1]}")
+    packages = defaultdict(float)
+    loaded = set()
+    total = 0.0
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        ms = int(cumulative) / 1000.0
+        # Only nesting level 0/1 names carry their subtree; deeper ones are already counted
+        depth = (len(name) - len(name.lstrip())) // 2
+        loaded.add(name.strip().split(".")[0])
+        if depth == 0:
+            total += ms
+        elif depth == 1:
+            packages[name.strip().split(".")[0]] += ms
+    return total, packages, loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time profile of the entry points")
+    parser.add_argument("modules", nargs="*", default=list(ENTRY_POINTS))
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        try:
+            total, packages, loaded = import_profile(module)
+        except RuntimeError as e:
+            print(e)
+            continue
+        heavy = [h for h in HEAVY if h in loaded]
+        print(f"{module}: {total:.0f} ms; heavy imports: {', '.join(heavy) or 'none'}")
+        for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"  {name:<28} {ms:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# scripts/replay_sessions.py
+# Replays recorded landmark CSVs through the live decision stack
+# (classifier -> vote -> EMA -> episodes) as fast as possible, no MediaPipe.
+#   python scripts/replay_sessions.py                      # data/sessions/*.csv
+#   python scripts/replay_sessions.py data/pose_data.csv --out decisions.csv
+import argparse
+import csv
+import glob
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.model_artifact import load_predictor
+from utils.episodes import EpisodeTracker
+from utils.posture_stack import (PostureStack, BAD_LABEL, PRED_WINDOW, SMOOTH_ALPHA, EPISODE_ENTER_FRAMES,
+                                 EPISODE_EXIT_FRAMES, EPISODE_MIN_DURATION_S)
+from utils.replay import replay_sessions
+from utils.feature_sets import feature_stage_for
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Replay recorded landmarks through the decision stack")
+    parser.add_argument("inputs", nargs="*", help="landmark CSVs (default: data/sessions/*.csv)")
+    parser.add_argument("--model", default=paths.model_path)
+    parser.add_argument("--out", default=None, help="write per-frame decisions to this CSV")
+    parser.add_argument("--window", type=int, default=PRED_WINDOW, help="majority-vote window (frames; unused by temporal models)")
+    parser.add_argument("--alpha", type=float, default=SMOOTH_ALPHA, help="EMA factor for prob_good")
+    parser.add_argument("--enter", type=int, default=EPISODE_ENTER_FRAMES, help="bad frames to open an episode")
+    parser.add_argument("--exit", type=int, default=EPISODE_EXIT_FRAMES, help="non-bad frames to close an episode")
+    parser.add_argument("--min-duration", type=float, default=EPISODE_MIN_DURATION_S, help="minimum episode length (s)")
+    parser.add_argument("--bad-below", type=float, default=None,
+                        help="probability hysteresis: smoothed prob_good below this counts as bad")
+    parser.add_argument("--good-above", type=float, default=None,
+                        help="... and only above this clears again (use with --bad-below)")
+    args = parser.parse_args(argv)
+
+    inputs = args.inputs or sorted(glob.glob(os.path.join(paths.sessions_dir, "*.csv")))
+    if not inputs:
+        raise FileNotFoundError("No landmark CSVs to replay.")
+
+    predictor = load_predictor(args.model)
+
+    def make_stack():
+        episodes = EpisodeTracker(BAD_LABEL, enter_frames=args.enter, exit_frames=args.exit,
+                                  min_duration_s=args.min_duration)
+        return PostureStack(predictor, pred_window=args.window, smooth_alpha=args.alpha, episodes=episodes,
+                            features=feature_stage_for(predictor),
+                            bad_below=args.bad_below, good_above=args.good_above)
+
+    out_f = writer = None
+    on_decision = None
+    if args.out:
+        out_f = open(args.out, "w", newline="")
+        writer = csv.writer(out_f)
+        writer.writerow(["source", "session_id", "timestamp_ms", "expected", "pred", "prob_good",
+                         "voted", "smoothed_good", "alarm"])
+
+        def write_decision(src, sid, expected, d):
+            writer.writerow([src, sid, d.ts_ms, expected or "", d.pred or "",
+                             "" if d.prob_good is None else f"{d.prob_good:.6f}",
+                             d.voted or "", f"{d.smoothed_good:.6f}", int(d.alarm)])
+        on_decision = write_decision
+
+    try:
+        stats = replay_sessions(inputs, make_stack, on_decision=on_decision)
+    finally:
+        if out_f is not None:
+            out_f.close()
+
+    for src, n in stats.per_source.items():
+        print(f"  {src}: {n} frames")
+    print(stats.summary())
+    if args.out:
+        print(f"Decisions written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# scripts/select_model.py
+# Session-grouped model selection: candidate classifiers x model inputs
+# (feature set schema, column subset), evaluated in parallel; saves the
+# fastest model meeting the accuracy target.
+#   python scripts/select_model.py --target 0.92
+#   python scripts/select_model.py data/pose_data_labeled.csv --workers 4
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.training import select_and_save_model
+
+def main(argv=None):
+    paths = Paths()
+    parser = argparse.ArgumentParser(description="Pick the fastest classifier that meets an accuracy target")
+    parser.add_argument("source", nargs="?", default=paths.sessions_dir,
+                        help="sessions directory (via the manifest) or a labeled CSV")
+    parser.add_argument("--model", default=paths.model_path)
+    parser.add_argument("--store", default=None, help="training store directory")
+    parser.add_argument("--target", type=float, default=0.9, help="minimum mean balanced accuracy")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    store = args.store or (paths.sessions_store if args.source == paths.sessions_dir else None)
+    print(select_and_save_model(args.source, args.model, store, target=args.target, max_workers=args.workers))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# scripts/verify_fused_model.py
+# Checks that the fused LinearPredictor matches the sklearn pipeline
+# (labels and probabilities) and times both per-frame paths.
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import joblib
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.io_paths import Paths
+from utils.linear_predictor import compile_pipeline, GOOD_LABEL
+
+PROB_ATOL = 1e-6  # sklearn keeps float32 inputs in float32; the fused kernel uses float64
+
+def main():
+    paths = Paths()
+    model_path = sys.argv[1] if len(sys.argv) > 1 else paths.model_path
+    data_path = sys.argv[2] if len(sys.argv) > 2 else paths.pose_data_labeled_csv
+
+    pipe = joblib.load(model_path)
+    fused = compile_pipeline(pipe)
+    if fused is None:
+        raise SystemExit(f"{model_path} is not a scaler + binary logistic pipeline; nothing to fuse.")
+
+    df = pd.read_csv(data_path)
+    feature_cols = [c for c in df.columns if c.startswith(("x_", "y_", "z_", "v_"))]
+    X = df[feature_cols].fillna(0.0).values.astype(np.float32)
+
+    classes = list(pipe.classes_)
+    ref_labels = pipe.predict(X).astype(str)
+    ref_good = pipe.predict_proba(X)[:, classes.index(GOOD_LABEL)]
+
+    labels, good = fused.predict_batch(X)
+    if not np.array_equal(labels, ref_labels):
+        raise AssertionError(f"batch labels differ on {(labels != ref_labels).sum()} rows")
+    max_err = float(np.max(np.abs(good - ref_good)))
+    if max_err > PROB_ATOL:
+        raise AssertionError(f"batch prob_good differs by up to {max_err:.3e}")
+
+    for i in range(len(X)):
+        label, p = fused.predict(X[i:i + 1])
+        if label != ref_labels[i] or abs(p - ref_good[i]) > PROB_ATOL:
+            raise AssertionError(f"row {i}: fused=({label}, {p}) sklearn=({ref_labels[i]}, {ref_good[i]})")
+
+    print(f"OK: {len(X)} rows, labels identical, max |prob_good diff| = {max_err:.3e}")
+
+    n = min(len(X), 2000)
+    t0 = time.perf_counter()
+    for i in range(n):
+        x = X[i:i + 1]
+        pipe.predict(x)
+        pipe.predict_proba(x)
+    sk_us = (time.perf_counter() - t0) / n * 1e6
+    t0 = time.perf_counter()
+    for i in range(n):
+        fused.predict(X[i:i + 1])
+    fused_us = (time.perf_counter() - t0) / n * 1e6
+    print(f"sklearn predict + predict_proba: {sk_us:8.1f} us/frame")
+    print(f"fused LinearPredictor.predict  : {fused_us:8.1f} us/frame ({sk_us / fused_us:.0f}x)")
+
+if __name__ == "__main__":
+    main()
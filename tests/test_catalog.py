@@ -0,0 +1,35 @@
+# tests/test_catalog.py
+import os
+import pytest
+
+from utils.catalog import SessionCatalog
+from utils.capture_modal import _new_session, _append_rows, _build_columns
+
+COLS = _build_columns()
+
+def _row(sid, ts):
+    return [sid, ts] + [0.5] * (len(COLS) - 2)
+
+def test_new_sessions_get_distinct_files(tmp_path):
+    sid, path = _new_session(str(tmp_path), "good")
+    _append_rows(path, [_row(sid, 1)], COLS, create=True)
+    sid2, path2 = _new_session(str(tmp_path), "good")
+    assert sid2 != sid and path2 != path
+    with pytest.raises(FileExistsError):
+        _append_rows(path, [_row(sid2, 2)], COLS, create=True)
+
+def test_scan_rehashes_changed_files(tmp_path):
+    sid, path = _new_session(str(tmp_path), "bad")
+    _append_rows(path, [_row(sid, 1), _row(sid, 2)], COLS, create=True)
+    catalog = SessionCatalog(str(tmp_path))
+    assert catalog.scan() == (1, 0)
+    assert catalog.scan() == (0, 0)
+
+    _append_rows(path, [_row(sid, 3)], COLS, create=False)
+    assert catalog.scan() == (1, 1)
+    entry = catalog.find(session_id=sid)
+    assert entry["rows"] == 3 and entry["label"] == "bad"
+
+    os.utime(path, ns=(0, 0))               # touched, same content
+    assert catalog.scan() == (0, 0)
+    assert SessionCatalog(str(tmp_path)).find(session_id=sid)["mtime_ns"] == 0
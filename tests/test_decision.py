@@ -0,0 +1,75 @@
+# tests/test_decision.py
+import pytest
+
+from utils.decision import StreamingDecision
+from utils.episodes import EpisodeTracker
+
+def test_vote_tie_goes_to_alphabetically_first_label():
+    d = StreamingDecision(window=4)
+    assert d.update("good") == "good"
+    assert d.update("bad") == "bad"          # 1-1 tie
+    assert d.update("good") == "good"
+    assert d.update("bad") == "bad"          # 2-2 tie
+
+def test_vote_window_drops_old_labels():
+    d = StreamingDecision(window=3)
+    for _ in range(3):
+        d.update("bad")
+    assert d.update("good") == "bad"
+    assert d.update("good") == "good"        # oldest "bad"s left the window
+
+def test_unseen_label_keeps_alphabetical_tie_break():
+    d = StreamingDecision(window=2)
+    d.update("good")
+    assert d.update("average") == "average"  # re-coded before "good"
+
+def test_vote_disabled_passes_label_through():
+    d = StreamingDecision(window=8, vote=False)
+    for _ in range(5):
+        d.update("bad")
+    assert d.update("good") == "good"
+
+def test_ema_weights_previous_value_by_alpha():
+    d = StreamingDecision(alpha=0.6)
+    d.update("good", 1.0)
+    assert d.smoothed_good == pytest.approx(0.6 * 0.5 + 0.4 * 1.0)
+    d.update("good", 0.0)
+    assert d.smoothed_good == pytest.approx(0.6 * 0.7)
+
+def test_no_pose_leaves_ema_and_vote_and_clears_evidence():
+    d = StreamingDecision(window=4, alpha=0.5)
+    d.update("bad", 0.0)
+    assert d.evidence
+    assert d.update(None) is None
+    assert not d.evidence
+    assert d.smoothed_good == pytest.approx(0.25)
+    assert d.update("good", None) == "bad"   # 1-1 tie with the earlier "bad"
+
+def test_hysteresis_latch_holds_inside_band():
+    d = StreamingDecision(alpha=0.0, bad_below=0.4, good_above=0.6)
+    d.update("good", 0.5)
+    assert not d.evidence
+    d.update("good", 0.3)
+    assert d.evidence                        # below bad_below, even though voted good
+    d.update("good", 0.55)
+    assert d.evidence                        # inside the band: latched
+    d.update("bad", 0.65)
+    assert not d.evidence                    # above good_above, even though voted bad
+    d.update("bad", 0.45)
+    assert not d.evidence
+
+def test_hysteresis_thresholds_validated():
+    with pytest.raises(ValueError):
+        StreamingDecision(bad_below=0.4)
+    with pytest.raises(ValueError):
+        StreamingDecision(bad_below=0.7, good_above=0.6)
+
+def test_episode_delays_follow_decision_evidence():
+    d = StreamingDecision(alpha=0.0, bad_below=0.4, good_above=0.6)
+    episodes = EpisodeTracker(enter_frames=3, exit_frames=2, min_duration_s=0.0)
+    active = []
+    for ts, prob in enumerate([0.2, 0.2, 0.2, 0.5, 0.9, 0.9]):
+        d.update("good", prob)
+        episodes.update(d.voted, d.smoothed_good, ts, is_bad=d.evidence)
+        active.append(episodes.active)
+    assert active == [False, False, True, True, True, False]
@@ -0,0 +1,25 @@
+# tests/test_incremental.py
+import numpy as np
+
+from utils.incremental import IncrementalState
+from utils.training import build_pipeline
+
+def _session(rng, n, shift):
+    X = (rng.normal(size=(n, 6)) + shift).astype(np.float32)
+    y = np.where(X[:, 0] - shift[0] > 0, "good", "bad")
+    return X, y
+
+def test_scaler_update_keeps_decision_function():
+    rng = np.random.default_rng(0)
+    X, y = _session(rng, 300, np.zeros(6))
+    pipe = build_pipeline().fit(X, y)
+    state = IncrementalState.seed(pipe, X, y, np.zeros(len(y), dtype=np.int64), 0.0)
+    before = state.pipeline().decision_function(X)
+
+    # A shifted, wider session moves the running mean/scale; no gradient steps
+    Xn, yn = _session(rng, 500, np.array([2.0, -1.0, 0.5, 0.0, 3.0, 1.0]))
+    Xn[:, 3] *= 4.0
+    mean0 = state.scaler.mean_.copy()
+    state.partial_update(Xn, yn, epochs=0)
+    assert not np.allclose(state.scaler.mean_, mean0)
+    np.testing.assert_allclose(state.pipeline().decision_function(X), before, rtol=1e-6, atol=1e-6)
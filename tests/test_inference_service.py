@@ -0,0 +1,54 @@
+# tests/test_inference_service.py
+import time
+import numpy as np
+
+from utils.inference_service import InferenceServer, RemotePredictor
+
+class _Threshold:
+    classes = ["bad", "good"]
+    feature_set = "raw132"
+    n_features = 4
+
+    def predict_batch(self, X):
+        good = X[:, 0] > 0.5
+        return np.where(good, "good", "bad"), good.astype(np.float64)
+
+def _wait_for(fn, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        out = fn()
+        if out[0] is not None:
+            return out
+        time.sleep(0.05)
+    return out
+
+def test_remote_predict_matches_local():
+    with InferenceServer(_Threshold(), "tcp:127.0.0.1:0") as server:
+        remote = RemotePredictor(server.address)
+        assert remote.predict(np.array([0.9, 0, 0, 0], dtype=np.float32)) == ("good", 1.0)
+        labels, probs = remote.predict_batch(np.array([[0.1, 0, 0, 0], [0.7, 0, 0, 0]], dtype=np.float32))
+        assert list(labels) == ["bad", "good"] and list(probs) == [0.0, 1.0]
+        remote.close()
+
+def test_rejected_request_is_no_prediction_then_reconnects():
+    with InferenceServer(_Threshold(), "tcp:127.0.0.1:0") as server:
+        remote = RemotePredictor(server.address, retry_s=0.05)
+        assert remote.predict(np.zeros(7, dtype=np.float32)) == (None, None)
+        x = np.array([0.9, 0, 0, 0], dtype=np.float32)
+        assert _wait_for(lambda: remote.predict(x)) == ("good", 1.0)
+        remote.close()
+
+def test_service_restart_is_survived():
+    server = InferenceServer(_Threshold(), "tcp:127.0.0.1:0").start()
+    address = server.address
+    remote = RemotePredictor(address, timeout=0.5, retry_s=0.05)
+    x = np.array([0.2, 0, 0, 0], dtype=np.float32)
+    assert remote.predict(x) == ("bad", 0.0)
+    server.stop()
+    assert remote.predict(x) == (None, None)
+    labels, probs = remote.predict_batch(np.stack([x, x]))
+    assert list(labels) == [None, None] and probs is None
+
+    with InferenceServer(_Threshold(), address):
+        assert _wait_for(lambda: remote.predict(x)) == ("bad", 0.0)
+    remote.close()
@@ -0,0 +1,50 @@
+# tests/test_linear_predictor.py
+import numpy as np
+import pytest
+
+from utils.linear_predictor import compile_pipeline, as_predictor, PipelinePredictor
+from utils.model_selection import make_pipeline, RAW_COLUMNS
+
+PROB_ATOL = 1e-6  # sklearn keeps float32 inputs in float32; the fused kernel uses float64
+
+def _data(labels=("bad", "good"), n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, len(RAW_COLUMNS))).astype(np.float32)
+    X[:, 5] += 3.0                                  # not zero-mean, so the scaler's shift matters
+    X[:, 40] *= 10.0
+    z = X[:, 0] - 0.5 * X[:, 40] / 10.0 + 0.3 * X[:, 99] + rng.normal(scale=0.5, size=n)
+    y = np.where(z > 0, labels[1], labels[0])
+    return X, y
+
+def _check(pipe, X, good="good"):
+    fused = compile_pipeline(pipe, good_label=good)
+    assert fused is not None
+    labels, probs = fused.predict_batch(X)
+    assert np.array_equal(labels, pipe.predict(X).astype(str))
+    ref = pipe.predict_proba(X)[:, list(pipe.classes_).index(good)]
+    np.testing.assert_allclose(probs, ref, atol=PROB_ATOL)
+    for x, lab, p in zip(X[:20], labels, probs):
+        got_lab, got_p = fused.predict(x.reshape(1, -1))
+        assert got_lab == lab and got_p == pytest.approx(p, abs=PROB_ATOL)
+
+@pytest.mark.parametrize("clf", ["logreg", "logreg_c0.1", "sgd_log"])
+def test_fused_matches_scaler_logistic_pipeline(clf):
+    X, y = _data()
+    _check(make_pipeline(clf).fit(X, y), X)
+
+@pytest.mark.parametrize("columns", ["xyz", "upper"])
+def test_fused_matches_column_subset_pipeline(columns):
+    X, y = _data()
+    pipe = make_pipeline("logreg", columns).fit(X, y)
+    _check(pipe, X)
+    assert compile_pipeline(pipe).n_features == len(RAW_COLUMNS)
+
+def test_fused_good_label_as_first_class():
+    X, y = _data(labels=("good", "slouch"))
+    _check(make_pipeline("logreg").fit(X, y), X)
+
+def test_unfoldable_pipeline_falls_back():
+    X, y = _data()
+    pipe = make_pipeline("gnb").fit(X, y)
+    assert compile_pipeline(pipe) is None
+    assert isinstance(as_predictor(pipe), PipelinePredictor)
@@ -1,7 +1,10 @@
 # utils/camera.py
+import sys
 import cv2
 
 def open_capture(index: int = 0, use_avfoundation: bool = True):
+    # AVFoundation only exists on macOS; use the default backend elsewhere
+    use_avfoundation = use_avfoundation and sys.platform == "darwin"
     cap = cv2.VideoCapture(index, cv2.CAP_AVFOUNDATION) if use_avfoundation else cv2.VideoCapture(index)
     if not cap.isOpened():
         raise RuntimeError("Unable to open camera. Ensure permissions are granted and no other app is using it.")
@@ -6,8 +6,14 @@ import pandas as pd
 import cv2
 
 from utils.io_paths import Paths
-from utils.camera import open_capture
-from utils.feature_vector import vectorize_landmarks_with_fallback, NUM_LANDMARKS
+from utils.frame_sources import open_source
+from utils.feature_vector import LandmarkVectorizer, NUM_LANDMARKS
+from utils.frame_pipeline import FramePipeline
+from utils.metrics import StageMetrics, MetricsExporter
+from utils.quality import DEFAULT_LADDER, QualityController, PosePool, find_level
+from utils.motion import MotionGate
+
+CAPTURE_BUDGET_MS = 40.0  # target pose latency while recording
 
 def _build_columns():
     cols = ["session_id", "timestamp_ms"]
@@ -15,82 +21,156 @@ def _build_columns():
         cols += [f"x_{i}", f"y_{i}", f"z_{i}", f"v_{i}"]
     return cols
 
-def _append_rows(path: str, rows, columns):
+def _new_session(sessions_dir: str, label: str):
+    # -> (session_id, csv path). Ids are epoch seconds, bumped past any id a session file already uses
+    taken = {os.path.splitext(n)[0].rsplit("_", 1)[-1] for n in os.listdir(sessions_dir) if n.endswith(".csv")}
+    session_id = int(time.time())
+    while str(session_id) in taken:
+        session_id += 1
+    return session_id, os.path.join(sessions_dir, Paths.session_name(label, session_id))
+
+def _append_rows(path: str, rows, columns, create: bool):
     df = pd.DataFrame(list(rows), columns=columns)
-    if not os.path.exists(path) or os.path.getsize(path) == 0:
-        df.to_csv(path, index=False)
+    if create:
+        # Exclusive create: never append a session to a file another capture wrote
+        df.to_csv(path, mode="x", index=False)
     else:
         df.to_csv(path, mode="a", header=False, index=False)
 
-def run_modal_capture_session(sessions_dir: str, label: str, seconds: int | None = None) -> str:
+def _drain(buffer: deque):
+    # popleft() is atomic, so rows appended by the inference thread are never lost
+    return [buffer.popleft() for _ in range(len(buffer))]
+
+def run_modal_capture_session(sessions_dir: str, label: str, seconds: int | None = None,
+                              source=None, realtime: bool = False, metrics: StageMetrics | None = None,
+                              budget_ms: float | None = CAPTURE_BUDGET_MS, motion_gate: bool = True,
+                              headless: bool = False, stop=None, progress=None) -> str:
     """
-    Modal OpenCV capture on the main thread. Press 'q' to stop.
-    Uses pose lite model and 640x360 inference for speed.
+    Modal OpenCV capture. Press 'q' to stop.
+    source: webcam index (default 0), video file, image directory or
+    "synthetic..." (see utils.frame_sources.open_source).
+    metrics: optional StageMetrics for per-stage latencies; by default they
+    are recorded only when ERGO_METRICS=1 and exported to data/logs.
+    Grab and pose inference run on background threads (utils.frame_pipeline);
+    the calling thread only renders and flushes rows to CSV.
+    Starts with the pose lite model at 640 px wide and lets a QualityController
+    move up or down the ladder to hold `budget_ms` (None = fixed level).
+    motion_gate: skip pose estimation while the scene is unchanged. Only
+    frames that were actually estimated are written, so still stretches do
+    not fill the session with repeated rows.
+    headless: no window or key handling (OpenCV GUI calls must stay off
+    worker threads); end with `stop` (a threading.Event) or `seconds`.
+    progress: optional progress(frames, rows_written), about twice a second.
     """
     os.makedirs(sessions_dir, exist_ok=True)
-    name = Paths.timestamp_name(f"{label}_pose")
-    out_csv = os.path.join(sessions_dir, name)
+    session_id, out_csv = _new_session(sessions_dir, label)
 
-    cap = open_capture(index=0, use_avfoundation=True)
+    cap = open_source(source, realtime=realtime)
 
     mp = __import__("mediapipe").solutions
     mp_pose = mp.pose
-    mp_draw = __import__("mediapipe").solutions.drawing_utils
+    mp_draw = mp.drawing_utils
 
+    if metrics is None:
+        metrics = StageMetrics("capture", enabled=os.environ.get("ERGO_METRICS") == "1")
+    exporter = MetricsExporter(metrics, path=os.path.join(Paths().logs_dir, "metrics_capture.json"))
     cols = _build_columns()
-    session_id = int(time.time())
+    vectorizer = LandmarkVectorizer()
     buffer = deque()
     last_flush = time.time()
     start = time.time()
     frame_idx = 0
+    rows_written = 0
+    last_progress = 0.0
     draw_every = 3  # throttle landmark drawing
 
+    quality = QualityController(budget_ms or 0.0, start_level=find_level(DEFAULT_LADDER, 640, 0),
+                                enabled=budget_ms is not None)
+    poses = PosePool(mp_pose, static_image_mode=False, smooth_landmarks=True, enable_segmentation=False)
+    gate = MotionGate(enabled=motion_gate)
+    last = {"landmarks": None}
+
+    def infer(frame, pkt):
+        with metrics.time("gate"):
+            moved = gate.should_process(frame, now=pkt.grab_ts)
+        if moved:
+            t0 = time.perf_counter()
+            # Downscale for inference
+            with metrics.time("convert"):
+                rgb = quality.prepare(frame)
+            t1 = time.perf_counter()
+            res = poses.get(quality.current.model_complexity).process(rgb)
+            pose_ms = (time.perf_counter() - t1) * 1000.0
+            metrics.record("pose", pose_ms)
+            quality.observe(pose_ms)
+            last["landmarks"] = res.pose_landmarks
+            if res.pose_landmarks:
+                with metrics.time("vectorize"):
+                    features = vectorizer.fill(res.pose_landmarks.landmark)[0].tolist()
+                buffer.append([session_id, pkt.grab_wall_ms] + features)
+            gate.note_cost((time.perf_counter() - t0) * 1000.0)
+        return last["landmarks"]
+
+    pipeline = FramePipeline.for_source(cap, infer, metrics=metrics)
     try:
-        with mp_pose.Pose(static_image_mode=False, model_complexity=0, smooth_landmarks=True, enable_segmentation=False) as pose:
-            while True:
-                ok, frame = cap.read()
-                if not ok or frame is None:
-                    print("Frame grab failed; stopping.")
+        exporter.start()
+        pipeline.start()
+        while True:
+            pkt = pipeline.get(timeout=0.5)
+            if pkt is None:
+                if pipeline.finished:
                     break
-
-                # Downscale for inference
-                small = cv2.resize(frame, (640, 360), interpolation=cv2.INTER_LINEAR)
-                rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
-                res = pose.process(rgb)
-
-                if res.pose_landmarks:
-                    if frame_idx % draw_every == 0:
-                        mp_draw.draw_landmarks(frame, res.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-                    ts = int(time.time() * 1000)
-                    feat = vectorize_landmarks_with_fallback(res.pose_landmarks.landmark).reshape(-1)
-                    row = [session_id, ts] + feat.tolist()
-                    buffer.append(row)
-
-                cv2.putText(frame, f"Recording {label} - press 'q' to stop", (10, 24),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (230, 230, 230), 2)
-                cv2.imshow(f"Capture - {label}", frame)
+            elif headless:
+                frame_idx += 1
+            else:
+                frame = pkt.frame
+                with metrics.time("draw"):
+                    if pkt.result and frame_idx % draw_every == 0:
+                        mp_draw.draw_landmarks(frame, pkt.result, mp_pose.POSE_CONNECTIONS)
+                    cv2.putText(frame, f"Recording {label} - press 'q' to stop", (10, 24),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (230, 230, 230), 2)
+                with metrics.time("imshow"):
+                    cv2.imshow(f"Capture - {label}", frame)
                 frame_idx += 1
 
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    break
+            if not headless and cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+            if stop is not None and stop.is_set():
+                break
 
-                if seconds is not None and (time.time() - start) >= seconds:
-                    break
+            if seconds is not None and (time.time() - start) >= seconds:
+                break
+
+            if (time.time() - last_flush) > 2.0 and buffer:
+                with metrics.time("log"):
+                    rows = _drain(buffer)
+                    _append_rows(out_csv, rows, cols, create=rows_written == 0)
+                rows_written += len(rows)
+                last_flush = time.time()
 
-                if (time.time() - last_flush) > 2.0 and buffer:
-                    _append_rows(out_csv, buffer, cols)
-                    buffer.clear()
-                    last_flush = time.time()
+            if progress is not None and time.time() - last_progress >= 0.5:
+                progress(frame_idx, rows_written)
+                last_progress = time.time()
 
+        pipeline.stop()
+        if gate.enabled:
+            print(gate.summary())
         if buffer:
-            _append_rows(out_csv, buffer, cols)
+            rows = _drain(buffer)
+            _append_rows(out_csv, rows, cols, create=rows_written == 0)
+            rows_written += len(rows)
+        if progress is not None:
+            progress(frame_idx, rows_written)
 
     finally:
+        pipeline.stop()
+        exporter.stop()
+        poses.close()
         cap.release()
-        try:
-            cv2.destroyWindow(f"Capture - {label}")
-        except Exception:
-            cv2.destroyAllWindows()
+        if not headless:
+            try:
+                cv2.destroyWindow(f"Capture - {label}")
+            except Exception:
+                cv2.destroyAllWindows()
 
     return out_csv
@@ -0,0 +1,234 @@
+# utils/catalog.py
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from utils.dataset_store import DatasetStore
+from utils.replay import iter_landmark_chunks, label_from_filename
+
+MANIFEST_FORMAT = "ergonomics-sessions"
+MANIFEST_VERSION = 1
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _file_stamp(path: str) -> dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def _session_span(path: str):
+    # -> (session_id, rows, start_ms, end_ms) reading only the two id columns
+    df = pd.read_csv(path, usecols=["session_id", "timestamp_ms"])
+    if df.empty:
+        return None, 0, None, None
+    sids = df["session_id"].unique()
+    if len(sids) != 1:
+        raise ValueError(f"{path}: expected one session_id, found {len(sids)}")
+    ts = df["timestamp_ms"]
+    return int(sids[0]), len(df), int(ts.min()), int(ts.max())
+
+class SessionCatalog:
+    """
+    Manifest of the captured session files in data/sessions/. Each entry
+    records the file, session id, label, row count, content hash, time
+    span and the file's size/mtime when hashed; nothing is copied. Datasets are assembled lazily from the files
+    (view()), and the training store is synced per session (sync_store()).
+    Re-registering a file whose content hash is already known is a no-op.
+    """
+
+    def __init__(self, sessions_dir: str, manifest_path: str | None = None):
+        self.sessions_dir = sessions_dir
+        self.manifest_path = manifest_path or os.path.join(sessions_dir, "manifest.json")
+        self.entries = self._read()
+
+    def _read(self) -> list:
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path) as f:
+            data = json.load(f)
+        if data.get("format") != MANIFEST_FORMAT:
+            raise ValueError(f"Unknown session manifest format in {self.manifest_path}")
+        return data["sessions"]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"format": MANIFEST_FORMAT, "version": MANIFEST_VERSION, "sessions": self.entries}, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def path_of(self, entry: dict) -> str:
+        return os.path.join(self.sessions_dir, entry["file"])
+
+    def find(self, sha256: str | None = None, session_id: int | None = None) -> dict | None:
+        for e in self.entries:
+            if (sha256 is not None and e["sha256"] == sha256) or (session_id is not None and e["session_id"] == session_id):
+                return e
+        return None
+
+    def register(self, session_csv: str, label: str, save: bool = True):
+        """
+        -> (entry, added). added is False when the same content is already
+        cataloged (re-import), in which case nothing changes.
+        """
+        if not os.path.exists(session_csv) or os.path.getsize(session_csv) == 0:
+            return None, False
+        sha = file_sha256(session_csv)
+        known = self.find(sha256=sha)
+        if known is not None:
+            return known, False
+
+        sid, rows, start_ms, end_ms = _session_span(session_csv)
+        if rows == 0:
+            return None, False
+        clash = self.find(session_id=sid)
+        if clash is not None:
+            raise ValueError(f"Session {sid} is already cataloged from {clash['file']} with different content.")
+
+        path = os.path.abspath(session_csv)
+        if os.path.dirname(path) != os.path.abspath(self.sessions_dir):
+            raise ValueError(f"{session_csv} is not in {self.sessions_dir}")
+        entry = {
+            "file": os.path.basename(path),
+            "session_id": sid,
+            "label": str(label).lower(),
+            "rows": rows,
+            "sha256": sha,
+            "start_ms": start_ms,
+            "end_ms": end_ms,
+            "added": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        entry.update(_file_stamp(path))
+        self.entries.append(entry)
+        if save:
+            self.save()
+        return entry, True
+
+    def scan(self) -> tuple:
+        """
+        Reconciles the manifest with the directory: registers session CSVs
+        not yet listed (label taken from the file name) and drops entries
+        whose file is gone. A listed file whose size or mtime changed is
+        re-hashed; if its content changed it is re-registered under its
+        label (counted as removed and added). -> (added, removed) counts.
+        """
+        before = len(self.entries)
+        self.entries = [e for e in self.entries if os.path.exists(self.path_of(e))]
+        removed = before - len(self.entries)
+        added = 0
+        touched = False
+        for e in list(self.entries):
+            stamp = _file_stamp(self.path_of(e))
+            if all(e.get(k) == v for k, v in stamp.items()):
+                continue
+            touched = True
+            if file_sha256(self.path_of(e)) == e["sha256"]:
+                e.update(stamp)
+                continue
+            self.entries.remove(e)
+            removed += 1
+            _, was_added = self.register(self.path_of(e), e["label"], save=False)
+            added += int(was_added)
+        known = {e["file"] for e in self.entries}
+        for name in sorted(os.listdir(self.sessions_dir)) if os.path.isdir(self.sessions_dir) else []:
+            if not name.endswith(".csv") or name in known:
+                continue
+            label = label_from_filename(name)
+            if label is None:
+                continue
+            _, was_added = self.register(os.path.join(self.sessions_dir, name), label, save=False)
+            added += int(was_added)
+        if added or removed or touched:
+            self.save()
+        return added, removed
+
+    def select(self, label: str | None = None) -> list:
+        return [e for e in self.entries if label is None or e["label"] == label]
+
+    def rows(self, label: str | None = None) -> int:
+        return sum(e["rows"] for e in self.select(label))
+
+    def view(self, labeled: bool = True, label: str | None = None) -> "SessionView":
+        return SessionView(self, self.select(label), labeled)
+
+    def sync_store(self, store_root: str, progress=None) -> DatasetStore:
+        """
+        Brings the float32 training store in line with the manifest: only
+        sessions that are new or whose hash changed are converted, and
+        partitions of sessions no longer cataloged are removed.
+        progress: optional progress(text) called after each converted session.
+        """
+        store = DatasetStore(store_root)
+        wanted = {e["session_id"]: e for e in self.entries}
+        for sid in store.sessions():
+            if sid not in wanted:
+                store.remove_session(sid)
+        todo = []
+        for sid, e in wanted.items():
+            have = store.meta["sessions"].get(str(sid))
+            if have is None or have.get("sha256") != e["sha256"] or have.get("label") != e["label"]:
+                todo.append((sid, e))
+        written = 0
+        try:
+            for i, (sid, e) in enumerate(todo):
+                ts, X = [], []
+                for _, t, Xc, _ in iter_landmark_chunks(self.path_of(e)):
+                    ts.append(t)
+                    X.append(Xc)
+                X = np.concatenate(X) if X else np.empty((0, len(store.feature_names)), dtype=np.float32)
+                ts = np.concatenate(ts) if ts else np.empty(0, dtype=np.int64)
+                store.write_session(sid, X, ts, [e["label"]] * len(ts), flush=False)
+                store.meta["sessions"][str(sid)].update(sha256=e["sha256"], label=e["label"])
+                written += len(ts)
+                if progress is not None:
+                    progress(f"Dataset store: {i + 1}/{len(todo)} new session(s), {written} rows written")
+        finally:
+            # Sessions converted before an error or a cancelled job are kept
+            if todo or not os.path.exists(os.path.join(store_root, "store.json")):
+                store.meta["source"] = {"manifest": os.path.abspath(self.manifest_path)}
+                store._save_meta()
+        return store
+
+class SessionView:
+    """
+    Lazy dataset over cataloged session files; rows are read only when
+    iterated. The legacy pose_data.csv / pose_data_labeled.csv layouts can
+    be materialized on demand with to_csv().
+    """
+
+    def __init__(self, catalog: SessionCatalog, entries: list, labeled: bool = True):
+        self.catalog = catalog
+        self.entries = list(entries)
+        self.labeled = labeled
+
+    def __len__(self) -> int:
+        return sum(e["rows"] for e in self.entries)
+
+    def iter_frames(self, chunk_rows: int = 20000):
+        for e in self.entries:
+            for chunk in pd.read_csv(self.catalog.path_of(e), chunksize=chunk_rows):
+                if self.labeled:
+                    # read_csv chunks are block-fragmented; consolidate before adding a column
+                    chunk = chunk.copy()
+                    chunk["label"] = e["label"]
+                yield chunk
+
+    def to_frame(self) -> pd.DataFrame:
+        frames = list(self.iter_frames())
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def to_csv(self, path: str) -> int:
+        rows = 0
+        header = True
+        for chunk in self.iter_frames():
+            chunk.to_csv(path, mode="w" if header else "a", header=header, index=False)
+            header = False
+            rows += len(chunk)
+        return rows
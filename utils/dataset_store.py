@@ -0,0 +1,230 @@
+# utils/dataset_store.py
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+from utils.feature_vector import build_columns
+
+STORE_FORMAT = "ergonomics-store"
+STORE_VERSION = 1
+FEATURE_COLS = build_columns()[2:]
+UNLABELED = -1
+
+def _write_json(path: str, obj):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(obj, f, indent=2)
+    os.replace(tmp, path)
+
+class DatasetStore:
+    """
+    Training data as memory-mapped float32 .npy files, one directory per
+    session_id:
+        <root>/store.json                   feature names, label classes, source
+        <root>/session_<id>/features.npy    (rows, n_features) float32, column-major
+        <root>/session_<id>/timestamp_ms.npy
+        <root>/session_<id>/labels.npy      int8 index into classes, -1 = unlabeled
+    Features are saved in Fortran order so each feature column is one
+    contiguous block: selecting columns reads only those bytes from disk.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.meta = self._read_meta()
+
+    def _read_meta(self) -> dict:
+        path = os.path.join(self.root, "store.json")
+        if not os.path.exists(path):
+            return {"format": STORE_FORMAT, "version": STORE_VERSION,
+                    "feature_names": list(FEATURE_COLS), "classes": [], "sessions": {}, "source": None}
+        with open(path) as f:
+            meta = json.load(f)
+        if meta.get("format") != STORE_FORMAT:
+            raise ValueError(f"Unknown dataset store format in {path}")
+        if int(meta.get("version", 0)) > STORE_VERSION:
+            raise ValueError(f"Dataset store version {meta.get('version')} is newer than supported ({STORE_VERSION})")
+        return meta
+
+    def _save_meta(self):
+        os.makedirs(self.root, exist_ok=True)
+        _write_json(os.path.join(self.root, "store.json"), self.meta)
+
+    @property
+    def feature_names(self) -> list:
+        return list(self.meta["feature_names"])
+
+    @property
+    def classes(self) -> list:
+        return list(self.meta["classes"])
+
+    def sessions(self) -> list:
+        return sorted(int(s) for s in self.meta["sessions"])
+
+    def rows(self, session_id=None) -> int:
+        if session_id is not None:
+            return int(self.meta["sessions"][str(int(session_id))]["rows"])
+        return sum(int(s["rows"]) for s in self.meta["sessions"].values())
+
+    def _dir(self, session_id) -> str:
+        return os.path.join(self.root, f"session_{int(session_id)}")
+
+    # ---- writing ----
+
+    def _label_codes(self, labels) -> np.ndarray:
+        codes = np.full(len(labels), UNLABELED, dtype=np.int8)
+        classes = self.meta["classes"]
+        for i, lab in enumerate(labels):
+            if lab is None or lab != lab or str(lab).strip() == "":
+                continue
+            lab = str(lab).strip().lower()
+            if lab not in classes:
+                classes.append(lab)
+            codes[i] = classes.index(lab)
+        return codes
+
+    def write_session(self, session_id, X, timestamps_ms, labels=None, flush: bool = True):
+        # Replaces the partition for session_id
+        X = np.asfortranarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != len(self.meta["feature_names"]):
+            raise ValueError(f"Expected (rows, {len(self.meta['feature_names'])}) features, got {X.shape}")
+        ts = np.asarray(timestamps_ms, dtype=np.int64)
+        if len(ts) != X.shape[0]:
+            raise ValueError("timestamps_ms and features have different lengths.")
+        codes = (self._label_codes(list(labels)) if labels is not None
+                 else np.full(X.shape[0], UNLABELED, dtype=np.int8))
+
+        d = self._dir(session_id)
+        tmp = d + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        np.save(os.path.join(tmp, "features.npy"), X)
+        np.save(os.path.join(tmp, "timestamp_ms.npy"), ts)
+        np.save(os.path.join(tmp, "labels.npy"), codes)
+        shutil.rmtree(d, ignore_errors=True)
+        os.replace(tmp, d)
+
+        self.meta["sessions"][str(int(session_id))] = {
+            "rows": int(X.shape[0]),
+            "labeled": int((codes != UNLABELED).sum()),
+            "start_ms": int(ts.min()) if len(ts) else None,
+            "end_ms": int(ts.max()) if len(ts) else None,
+        }
+        if flush:
+            self._save_meta()
+
+    def remove_session(self, session_id):
+        shutil.rmtree(self._dir(session_id), ignore_errors=True)
+        self.meta["sessions"].pop(str(int(session_id)), None)
+        self._save_meta()
+
+    # ---- reading ----
+
+    def _column_index(self, columns):
+        if columns is None:
+            return None
+        names = self.meta["feature_names"]
+        try:
+            return [names.index(c) for c in columns]
+        except ValueError as e:
+            raise KeyError(f"Unknown feature column: {e}") from None
+
+    def open_session(self, session_id):
+        # -> (features memmap, timestamps memmap, label codes memmap); nothing is read yet
+        d = self._dir(session_id)
+        return (np.load(os.path.join(d, "features.npy"), mmap_mode="r"),
+                np.load(os.path.join(d, "timestamp_ms.npy"), mmap_mode="r"),
+                np.load(os.path.join(d, "labels.npy"), mmap_mode="r"))
+
+    def iter_chunks(self, chunk_rows: int = 8192, columns=None, sessions=None, labeled_only: bool = False):
+        """
+        Yields (session_id, timestamps_ms, X float32, label_codes) per chunk
+        of at most chunk_rows rows; only the requested columns are read.
+        """
+        cols = self._column_index(columns)
+        for sid in (self.sessions() if sessions is None else sessions):
+            F, T, L = self.open_session(sid)
+            for a in range(0, F.shape[0], chunk_rows):
+                b = min(a + chunk_rows, F.shape[0])
+                codes = np.asarray(L[a:b])
+                X = F[a:b] if cols is None else F[a:b, cols]
+                ts = np.asarray(T[a:b])
+                if labeled_only:
+                    keep = codes != UNLABELED
+                    if not keep.all():
+                        X, ts, codes = X[keep], ts[keep], codes[keep]
+                    if len(codes) == 0:
+                        continue
+                yield sid, ts, np.ascontiguousarray(X, dtype=np.float32), codes
+
+    def load(self, columns=None, sessions=None, labeled_only: bool = True):
+        """
+        -> (X float32 (n, k), y labels as str array, groups session_id array)
+        preallocated once and filled chunk by chunk.
+        """
+        sessions = self.sessions() if sessions is None else list(sessions)
+        n_cols = len(self.meta["feature_names"]) if columns is None else len(columns)
+        key = "labeled" if labeled_only else "rows"
+        total = sum(int(self.meta["sessions"][str(int(s))][key]) for s in sessions)
+        X = np.empty((total, n_cols), dtype=np.float32)
+        codes = np.empty(total, dtype=np.int8)
+        groups = np.empty(total, dtype=np.int64)
+        i = 0
+        for sid, _, Xc, cc in self.iter_chunks(columns=columns, sessions=sessions, labeled_only=labeled_only):
+            n = len(cc)
+            X[i:i + n] = Xc
+            codes[i:i + n] = cc
+            groups[i:i + n] = sid
+            i += n
+        classes = np.array(self.meta["classes"] + [""], dtype=object)
+        return X[:i], classes[codes[:i]].astype(str), groups[:i]
+
+def import_csv(csv_path: str, store_root: str, chunk_rows: int = 20000) -> DatasetStore:
+    """
+    Converts a landmark CSV (pose_data.csv / pose_data_labeled.csv / a
+    session file) into the store, replacing the partitions of the sessions
+    it contains. Rows with a missing session_id/timestamp_ms are dropped.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    missing = [c for c in ["session_id", "timestamp_ms"] + FEATURE_COLS if c not in header]
+    if missing:
+        raise ValueError(f"{csv_path}: missing columns, e.g. {missing[:3]}")
+    has_label = "label" in header
+    usecols = ["session_id", "timestamp_ms"] + FEATURE_COLS + (["label"] if has_label else [])
+    dtypes = {c: np.float32 for c in FEATURE_COLS}
+    if has_label:
+        dtypes["label"] = str
+
+    parts = {}
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=dtypes, chunksize=chunk_rows):
+        chunk["session_id"] = pd.to_numeric(chunk["session_id"], errors="coerce")
+        chunk["timestamp_ms"] = pd.to_numeric(chunk["timestamp_ms"], errors="coerce")
+        chunk = chunk.dropna(subset=["session_id", "timestamp_ms"])
+        for sid, g in chunk.groupby("session_id", sort=False):
+            parts.setdefault(int(sid), []).append(g)
+
+    store = DatasetStore(store_root)
+    for sid, frames in parts.items():
+        g = pd.concat(frames) if len(frames) > 1 else frames[0]
+        store.write_session(sid, g[FEATURE_COLS].fillna(0.0).to_numpy(dtype=np.float32),
+                            g["timestamp_ms"].to_numpy(dtype=np.int64),
+                            g["label"].tolist() if has_label else None, flush=False)
+    store.meta["source"] = {"path": os.path.abspath(csv_path), "mtime": os.path.getmtime(csv_path),
+                            "size": os.path.getsize(csv_path)}
+    store._save_meta()
+    return store
+
+def store_for_csv(csv_path: str, store_root: str) -> DatasetStore:
+    """
+    Store mirroring csv_path, (re)converting only when the CSV changed since
+    the last import. Lets the CSV stay the editable source of truth while
+    training reads the binary copy.
+    """
+    store = DatasetStore(store_root) if os.path.isdir(store_root) else None
+    src = store.meta.get("source") if store is not None else None
+    if (src is None or src.get("path") != os.path.abspath(csv_path)
+            or src.get("mtime") != os.path.getmtime(csv_path) or src.get("size") != os.path.getsize(csv_path)):
+        shutil.rmtree(store_root, ignore_errors=True)
+        store = import_csv(csv_path, store_root)
+    return store
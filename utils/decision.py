@@ -0,0 +1,104 @@
+# utils/decision.py
+GOOD_LABEL = "good"
+BAD_LABEL = "bad"
+
+class StreamingDecision:
+    """
+    Per-frame decision state over classifier outputs, O(1) per frame:
+    - majority vote over the last `window` labels, kept as int class codes in
+      a ring buffer with running counts (ties go to the alphabetically first
+      label, as np.unique + argmax did)
+    - EMA of prob_good (`alpha` is the weight of the previous value)
+    - per-frame bad evidence: the voted label, or with `bad_below`/
+      `good_above` a hysteresis latch on the smoothed probability (bad below
+      the first, clear above the second)
+    vote=False passes the label through (models that already see a window).
+    The enter/exit delays before an alert are utils.episodes.EpisodeTracker's,
+    fed with `evidence`.
+    """
+
+    def __init__(self, classes=(BAD_LABEL, GOOD_LABEL), window: int = 8, alpha: float = 0.6,
+                 vote: bool = True, bad_label: str = BAD_LABEL, bad_below: float | None = None,
+                 good_above: float | None = None):
+        if window < 1:
+            raise ValueError("window must be at least 1 frame")
+        if (bad_below is None) != (good_above is None):
+            raise ValueError("bad_below and good_above must be set together")
+        if bad_below is not None and bad_below > good_above:
+            raise ValueError("bad_below must not exceed good_above")
+        self.window = window
+        self.alpha = alpha
+        self.vote = vote
+        self.bad_label = bad_label
+        self.bad_below = bad_below
+        self.good_above = good_above
+        self.labels = sorted({str(c).lower() for c in classes} | {bad_label})
+        self.codes = {lab: i for i, lab in enumerate(self.labels)}
+        self.reset()
+
+    def reset(self):
+        self._ring = [0] * self.window
+        self._head = 0
+        self._n = 0
+        self._counts = [0] * len(self.labels)
+        self.smoothed_good = 0.5
+        self.voted = None
+        self.evidence = False       # per-frame bad evidence (after hysteresis)
+
+    def _add_label(self, label: str) -> int:
+        # Unseen class: re-code in sorted order so the tie-break stays alphabetical
+        old = self.labels
+        self.labels = sorted(old + [label])
+        self.codes = {lab: i for i, lab in enumerate(self.labels)}
+        remap = [self.codes[lab] for lab in old]
+        self._ring = [remap[c] for c in self._ring]
+        counts = [0] * len(self.labels)
+        for c, n in enumerate(self._counts):
+            counts[remap[c]] = n
+        self._counts = counts
+        return self.codes[label]
+
+    def _push_vote(self, code: int) -> int:
+        counts = self._counts
+        if self._n == self.window:
+            old = self._ring[self._head]
+            counts[old] -= 1
+        else:
+            self._n += 1
+        self._ring[self._head] = code
+        self._head = (self._head + 1) % self.window
+        counts[code] += 1
+        # First maximum = lowest code = alphabetical tie-break; O(classes), not O(window)
+        return counts.index(max(counts))
+
+    def update(self, pred, prob_good: float | None = None) -> str | None:
+        """
+        One classifier output -> voted label. Updates smoothed_good and
+        evidence. pred=None (no pose) leaves the vote and EMA as they are
+        and counts as a clear frame.
+        """
+        if pred is None:
+            self.voted = None
+            self.evidence = False
+            return None
+
+        label = str(pred).lower()
+        if self.vote:
+            code = self.codes.get(label)
+            if code is None:
+                code = self._add_label(label)
+            self.voted = self.labels[self._push_vote(code)]
+        else:
+            self.voted = label
+
+        if prob_good is not None:
+            self.smoothed_good = self.alpha * self.smoothed_good + (1 - self.alpha) * prob_good
+
+        if self.bad_below is not None and prob_good is not None:
+            if self.smoothed_good < self.bad_below:
+                self.evidence = True
+            elif self.smoothed_good > self.good_above:
+                self.evidence = False
+        else:
+            self.evidence = self.voted == self.bad_label
+        return self.voted
@@ -0,0 +1,122 @@
+# utils/episodes.py
+from dataclasses import dataclass, asdict
+
+EPISODE_COLUMNS = ("start_ms", "end_ms", "duration_s", "frames", "mean_prob_good", "peak_badness")
+
+@dataclass
+class Episode:
+    start_ms: int
+    end_ms: int
+    frames: int
+    mean_prob_good: float | None
+    peak_badness: float | None
+
+    @property
+    def duration_s(self) -> float:
+        return (self.end_ms - self.start_ms) / 1000.0
+
+    def as_row(self) -> dict:
+        row = asdict(self)
+        row["duration_s"] = round(self.duration_s, 3)
+        return row
+
+class _Stats:
+    def __init__(self):
+        self.frames = 0
+        self.n_prob = 0
+        self.sum_prob = 0.0
+        self.min_prob = None
+
+    def add(self, prob_good):
+        self.frames += 1
+        if prob_good is not None:
+            self.n_prob += 1
+            self.sum_prob += prob_good
+            self.min_prob = prob_good if self.min_prob is None else min(self.min_prob, prob_good)
+
+    def merge(self, other):
+        self.frames += other.frames
+        self.n_prob += other.n_prob
+        self.sum_prob += other.sum_prob
+        if other.min_prob is not None:
+            self.min_prob = other.min_prob if self.min_prob is None else min(self.min_prob, other.min_prob)
+
+class EpisodeTracker:
+    """
+    Turns the per-frame voted label stream into bad-posture episodes.
+    - An episode opens after `enter_frames` consecutive bad frames and
+      closes after `exit_frames` consecutive non-bad frames (hysteresis).
+    - Episodes shorter than `min_duration_s` are dropped.
+    update() returns an Episode only when one closes, otherwise None.
+    """
+
+    def __init__(self, bad_label: str = "bad", enter_frames: int = 5, exit_frames: int = 10,
+                 min_duration_s: float = 2.0):
+        self.bad_label = bad_label
+        self.enter_frames = max(1, enter_frames)
+        self.exit_frames = max(1, exit_frames)
+        self.min_duration_s = min_duration_s
+        self.active = False
+        self._reset()
+
+    def _reset(self):
+        self._streak = 0          # consecutive bad frames before entering
+        self._clear = 0           # consecutive non-bad frames while active
+        self._start_ms = None
+        self._last_bad_ms = None
+        self._stats = _Stats()
+        self._tail = _Stats()
+
+    def update(self, voted, smoothed_good, ts_ms: int, is_bad: bool | None = None) -> Episode | None:
+        # is_bad overrides the label test (e.g. probability hysteresis in utils.decision)
+        if is_bad is None:
+            is_bad = voted == self.bad_label
+
+        if not self.active:
+            if not is_bad:
+                self._reset()
+                return None
+            if self._streak == 0:
+                self._start_ms = ts_ms
+            self._streak += 1
+            self._last_bad_ms = ts_ms
+            self._stats.add(smoothed_good)
+            if self._streak >= self.enter_frames:
+                self.active = True
+            return None
+
+        if is_bad:
+            self._clear = 0
+            self._stats.merge(self._tail)
+            self._tail = _Stats()
+            self._stats.add(smoothed_good)
+            self._last_bad_ms = ts_ms
+            return None
+
+        self._clear += 1
+        self._tail.add(smoothed_good)
+        if self._clear >= self.exit_frames:
+            return self._finish()
+        return None
+
+    def close(self) -> Episode | None:
+        # Flush an open episode (e.g. when the detector shuts down)
+        if not self.active:
+            self._reset()
+            return None
+        return self._finish()
+
+    def _finish(self) -> Episode | None:
+        s = self._stats
+        ep = Episode(
+            start_ms=int(self._start_ms),
+            end_ms=int(self._last_bad_ms),
+            frames=s.frames,
+            mean_prob_good=(s.sum_prob / s.n_prob) if s.n_prob else None,
+            peak_badness=(1.0 - s.min_prob) if s.min_prob is not None else None,
+        )
+        self.active = False
+        self._reset()
+        if ep.duration_s < self.min_duration_s:
+            return None
+        return ep
@@ -0,0 +1,138 @@
+# utils/ergonomic_features.py
+import math
+import numpy as np
+
+from utils.feature_vector import NUM_FEATURES
+
+# MediaPipe Pose landmark indices used here
+NOSE = 0
+L_EAR, R_EAR = 7, 8
+L_SHOULDER, R_SHOULDER = 11, 12
+L_ELBOW, R_ELBOW = 13, 14
+L_WRIST, R_WRIST = 15, 16
+L_HIP, R_HIP = 23, 24
+
+ERGO_NAMES = (
+    "neck_flexion",         # shoulder-mid -> ear-mid vs vertical (rad)
+    "trunk_lean",           # hip-mid -> shoulder-mid vs vertical (rad)
+    "shoulder_tilt",        # left-right shoulder line vs horizontal (rad)
+    "head_roll",            # ear line vs horizontal (rad)
+    "head_forward_x",       # ear-mid ahead of shoulder-mid, image x (/ shoulder width)
+    "head_forward_z",       # ear-mid ahead of shoulder-mid, depth (/ shoulder width)
+    "nose_height",          # shoulder-mid above nose, image y (/ shoulder width)
+    "ear_height",           # shoulder-mid above ear-mid, image y (/ shoulder width)
+    "shoulder_twist",       # left - right shoulder depth (/ shoulder width)
+    "torso_depth_lean",     # shoulder-mid - hip-mid depth (/ shoulder width)
+    "elbow_angle_l",        # shoulder-elbow-wrist (rad)
+    "elbow_angle_r",
+    "head_width_ratio",     # ear distance / shoulder width (drops when shoulders round)
+    "upper_visibility",     # mean visibility of nose, ears, shoulders
+)
+NUM_ERGO = len(ERGO_NAMES)
+
+_EPS = 1e-6
+
+def _angle_from_vertical(v):
+    # v: (..., 2) image-plane vector; image y grows downward, so "up" is -y
+    return np.arctan2(v[..., 0], -v[..., 1])
+
+def _joint_angle(a, b, c):
+    # Angle at b between b->a and b->c, (..., 2) points
+    u, w = a - b, c - b
+    cos = (u * w).sum(-1) / (np.linalg.norm(u, axis=-1) * np.linalg.norm(w, axis=-1) + _EPS)
+    return np.arccos(np.clip(cos, -1.0, 1.0))
+
+def ergonomic_features(X, out=None) -> np.ndarray:
+    """
+    Landmark vectors (n, 132) or (132,) -> (n, NUM_ERGO) float32 ergonomic
+    measures. Distances are divided by the shoulder width, so the values do
+    not depend on how far the user sits from the camera. Batched; the live
+    loop uses ergonomic_frame(), which computes the same values per frame.
+    """
+    # float64 math like ergonomic_frame(), so batch and live values agree
+    L = np.asarray(X, dtype=np.float32).reshape(-1, NUM_FEATURES // 4, 4).astype(np.float64)
+    xy = L[..., :2]
+    z = L[..., 2]
+    vis = L[..., 3]
+    if out is None:
+        out = np.empty((L.shape[0], NUM_ERGO), dtype=np.float32)
+
+    sh_l, sh_r = xy[:, L_SHOULDER], xy[:, R_SHOULDER]
+    sh_mid = 0.5 * (sh_l + sh_r)
+    ear_mid = 0.5 * (xy[:, L_EAR] + xy[:, R_EAR])
+    hip_mid = 0.5 * (xy[:, L_HIP] + xy[:, R_HIP])
+    sh_vec = sh_l - sh_r
+    sw = np.linalg.norm(sh_vec, axis=-1) + _EPS
+    ear_vec = xy[:, L_EAR] - xy[:, R_EAR]
+    sh_z = 0.5 * (z[:, L_SHOULDER] + z[:, R_SHOULDER])
+    ear_z = 0.5 * (z[:, L_EAR] + z[:, R_EAR])
+    hip_z = 0.5 * (z[:, L_HIP] + z[:, R_HIP])
+
+    out[:, 0] = _angle_from_vertical(ear_mid - sh_mid)
+    out[:, 1] = _angle_from_vertical(sh_mid - hip_mid)
+    out[:, 2] = np.arctan2(sh_vec[:, 1], np.abs(sh_vec[:, 0]) + _EPS)
+    out[:, 3] = np.arctan2(ear_vec[:, 1], np.abs(ear_vec[:, 0]) + _EPS)
+    out[:, 4] = (ear_mid[:, 0] - sh_mid[:, 0]) / sw
+    out[:, 5] = (sh_z - ear_z) / sw
+    out[:, 6] = (sh_mid[:, 1] - xy[:, NOSE, 1]) / sw
+    out[:, 7] = (sh_mid[:, 1] - ear_mid[:, 1]) / sw
+    out[:, 8] = (z[:, L_SHOULDER] - z[:, R_SHOULDER]) / sw
+    out[:, 9] = (sh_z - hip_z) / sw
+    out[:, 10] = _joint_angle(sh_l, xy[:, L_ELBOW], xy[:, L_WRIST])
+    out[:, 11] = _joint_angle(sh_r, xy[:, R_ELBOW], xy[:, R_WRIST])
+    out[:, 12] = np.linalg.norm(ear_vec, axis=-1) / sw
+    out[:, 13] = vis[:, [NOSE, L_EAR, R_EAR, L_SHOULDER, R_SHOULDER]].mean(axis=1)
+    return out
+
+def _angle_at(a, b, c):
+    ux, uy, wx, wy = a[0] - b[0], a[1] - b[1], c[0] - b[0], c[1] - b[1]
+    cos = (ux * wx + uy * wy) / (math.hypot(ux, uy) * math.hypot(wx, wy) + _EPS)
+    return math.acos(min(1.0, max(-1.0, cos)))
+
+def ergonomic_frame(x, out) -> np.ndarray:
+    # One landmark vector -> out[0, :NUM_ERGO] with plain floats; a dozen small
+    # NumPy calls cost far more than the arithmetic for a single frame
+    v = np.asarray(x, dtype=np.float32).reshape(-1).tolist()
+    P = [v[i:i + 4] for i in range(0, NUM_FEATURES, 4)]
+    ls, rs, le, re_ = P[L_SHOULDER], P[R_SHOULDER], P[L_EAR], P[R_EAR]
+    lh, rh = P[L_HIP], P[R_HIP]
+    smx, smy = 0.5 * (ls[0] + rs[0]), 0.5 * (ls[1] + rs[1])
+    emx, emy = 0.5 * (le[0] + re_[0]), 0.5 * (le[1] + re_[1])
+    hmx, hmy = 0.5 * (lh[0] + rh[0]), 0.5 * (lh[1] + rh[1])
+    svx, svy = ls[0] - rs[0], ls[1] - rs[1]
+    evx, evy = le[0] - re_[0], le[1] - re_[1]
+    sw = math.hypot(svx, svy) + _EPS
+    sh_z = 0.5 * (ls[2] + rs[2])
+
+    o = out[0]
+    o[0] = math.atan2(emx - smx, smy - emy)
+    o[1] = math.atan2(smx - hmx, hmy - smy)
+    o[2] = math.atan2(svy, abs(svx) + _EPS)
+    o[3] = math.atan2(evy, abs(evx) + _EPS)
+    o[4] = (emx - smx) / sw
+    o[5] = (sh_z - 0.5 * (le[2] + re_[2])) / sw
+    o[6] = (smy - P[NOSE][1]) / sw
+    o[7] = (smy - emy) / sw
+    o[8] = (ls[2] - rs[2]) / sw
+    o[9] = (sh_z - 0.5 * (lh[2] + rh[2])) / sw
+    o[10] = _angle_at(ls, P[L_ELBOW], P[L_WRIST])
+    o[11] = _angle_at(rs, P[R_ELBOW], P[R_WRIST])
+    o[12] = math.hypot(evx, evy) / sw
+    o[13] = (P[NOSE][3] + le[3] + re_[3] + ls[3] + rs[3]) / 5.0
+    return out
+
+class ErgonomicFeatures:
+    # Per-frame stage for the live path: reuses one (1, NUM_ERGO) output buffer
+    n_features = NUM_ERGO
+
+    def __init__(self):
+        self._out = np.empty((1, NUM_ERGO), dtype=np.float32)
+
+    def push(self, x, ts_ms: int | None = None) -> np.ndarray:
+        return ergonomic_frame(x, self._out)
+
+    def transform(self, X, timestamps_ms=None) -> np.ndarray:
+        return ergonomic_features(X)
+
+    def reset(self):
+        pass
@@ -0,0 +1,137 @@
+# utils/event_log.py
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+_STOP = object()
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    # WAL + NORMAL sync: a committed batch survives a crash of the app,
+    # and readers (the XLSX export) never block the writer.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class EventJournal:
+    """
+    Append-only event journal backed by SQLite.
+    log() only enqueues; a background thread writes rows in batches and
+    commits every `flush_every` rows or `flush_interval` seconds.
+    """
+
+    def __init__(self, db_path: str, table: str, columns, flush_every: int = 50,
+                 flush_interval: float = 1.0):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.table = table
+        self.columns = tuple(columns)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._q = queue.Queue()
+        self._closed = False
+
+        conn = _connect(db_path)
+        cols = ", ".join(f'"{c}"' for c in self.columns)
+        conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (id INTEGER PRIMARY KEY AUTOINCREMENT, {cols})')
+        conn.commit()
+        conn.close()
+
+        placeholders = ", ".join("?" for _ in self.columns)
+        self._insert_sql = f'INSERT INTO "{table}" ({cols}) VALUES ({placeholders})'
+        self._thread = threading.Thread(target=self._writer, name=f"journal-{table}", daemon=True)
+        self._thread.start()
+
+    def log(self, row: dict):
+        if self._closed:
+            return
+        self._q.put(tuple(row.get(c) for c in self.columns))
+
+    def close(self, timeout: float = 5.0):
+        if self._closed:
+            return
+        self._closed = True
+        self._q.put(_STOP)
+        self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _writer(self):
+        conn = _connect(self.db_path)
+        pending = []
+        last_flush = time.time()
+        try:
+            while True:
+                timeout = max(0.0, self.flush_interval - (time.time() - last_flush))
+                try:
+                    item = self._q.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    break
+                if item is not None:
+                    pending.append(item)
+
+                if pending and (len(pending) >= self.flush_every or
+                                (time.time() - last_flush) >= self.flush_interval):
+                    self._flush(conn, pending)
+                    pending = []
+                    last_flush = time.time()
+                elif not pending:
+                    last_flush = time.time()
+            # Drain anything queued after the stop marker raced in
+            while True:
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    pending.append(item)
+            if pending:
+                self._flush(conn, pending)
+        finally:
+            conn.close()
+
+    def _flush(self, conn, rows):
+        try:
+            with conn:
+                conn.executemany(self._insert_sql, rows)
+        except sqlite3.Error as e:
+            print(f"Event journal write failed: {e}")
+
+
+def iter_table(db_path: str, table: str, batch_size: int = 1000):
+    """
+    Yields the column names first, then rows in insertion order.
+    Uses a cursor with fetchmany so memory stays constant.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.execute(f'SELECT * FROM "{table}" ORDER BY id')
+        yield [d[0] for d in cur.description if d[0] != "id"]
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for r in rows:
+                yield r[1:]
+    finally:
+        conn.close()
+
+
+def list_tables(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+        return [r[0] for r in cur.fetchall()]
+    finally:
+        conn.close()
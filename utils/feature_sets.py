@@ -0,0 +1,75 @@
+# utils/feature_sets.py
+import re
+
+from utils.feature_vector import NUM_FEATURES, build_columns
+from utils.ergonomic_features import ErgonomicFeatures, ERGO_NAMES
+from utils.temporal import TemporalFeatures, temporal_columns
+
+# Model input schemas, as recorded in the artifact header ("feature_set"):
+#   raw132, ergo14                          per-frame
+#   raw132+temporal15, ergo14+temporal15    plus a 15-frame window (utils.temporal)
+BASE_SETS = ("raw132", "ergo14")
+_NAME_RE = re.compile(r"^(raw132|ergo14)(?:\+temporal(\d+))?$")
+
+def parse_feature_set(name: str | None):
+    # -> (base, temporal window or None)
+    m = _NAME_RE.match(name or "raw132")
+    if not m:
+        raise ValueError(f"Unknown feature set: {name}")
+    return m.group(1), (int(m.group(2)) if m.group(2) else None)
+
+def feature_set_name(base: str = "raw132", temporal_window: int | None = None) -> str:
+    name = base if not temporal_window else f"{base}+temporal{int(temporal_window)}"
+    parse_feature_set(name)
+    return name
+
+def feature_names(name: str) -> list:
+    base, window = parse_feature_set(name)
+    cols = build_columns()[2:] if base == "raw132" else list(ERGO_NAMES)
+    return temporal_columns(cols) if window else cols
+
+class FeatureChain:
+    """
+    Raw landmark vector -> model input for one feature set: optional
+    ergonomic reduction, then optional temporal window. push() is the live
+    per-frame path, transform() runs the same push() over a recorded session.
+    """
+
+    def __init__(self, name: str):
+        base, window = parse_feature_set(name)
+        self.name = name
+        self.base = ErgonomicFeatures() if base == "ergo14" else None
+        n_base = self.base.n_features if self.base is not None else NUM_FEATURES
+        self.temporal = TemporalFeatures(window=window, n_base=n_base) if window else None
+        self.n_features = self.temporal.n_features if self.temporal is not None else n_base
+        # A windowed model already integrates recent frames (no majority vote needed)
+        self.windowed = self.temporal is not None
+
+    def push(self, x, ts_ms: int | None = None):
+        if self.base is not None:
+            x = self.base.push(x)
+        if self.temporal is not None:
+            x = self.temporal.push(x, ts_ms)
+        return x
+
+    def transform(self, X, timestamps_ms=None):
+        if self.base is not None:
+            X = self.base.transform(X)
+        if self.temporal is not None:
+            X = self.temporal.transform(X, timestamps_ms)
+        return X
+
+    def reset(self):
+        if self.temporal is not None:
+            self.temporal.reset()
+
+def build_stage(name: str | None):
+    # None for raw132 (the vectorizer output is already the model input)
+    return FeatureChain(name) if (name or "raw132") != "raw132" else None
+
+def feature_stage_for(predictor):
+    return build_stage(getattr(predictor, "feature_set", None))
+
+def transform_session(name: str, X, timestamps_ms=None):
+    stage = build_stage(name)
+    return X if stage is None else stage.transform(X, timestamps_ms)
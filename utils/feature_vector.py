@@ -1,19 +1,59 @@
 # utils/feature_vector.py
+from itertools import islice
 import numpy as np
 
 NUM_LANDMARKS = 33
+NUM_FEATURES = NUM_LANDMARKS * 4
+
+def _fill_with_fallback(flat: np.ndarray, landmarks):
+    # Slow path: tolerates missing attributes and short landmark lists (zeros)
+    flat[:] = 0.0
+    for i, lm in enumerate(islice(landmarks, NUM_LANDMARKS)):
+        j = 4 * i
+        flat[j] = float(getattr(lm, "x", 0.0))
+        flat[j + 1] = float(getattr(lm, "y", 0.0))
+        flat[j + 2] = float(getattr(lm, "z", 0.0))
+        flat[j + 3] = float(getattr(lm, "visibility", 0.0))
+
+def fill_landmarks(flat: np.ndarray, landmarks):
+    """
+    Writes 33*4 (x,y,z,visibility) values into the 1-D float32 view `flat`.
+    One flat comprehension + one bulk assignment; no per-frame ndarray.
+    """
+    try:
+        flat[:] = [v for lm in islice(landmarks, NUM_LANDMARKS)
+                   for v in (lm.x, lm.y, lm.z, lm.visibility)]
+    except (AttributeError, ValueError):
+        _fill_with_fallback(flat, landmarks)
+
+class LandmarkVectorizer:
+    """
+    Reusable (1, 132) float32 buffer for per-frame inference.
+    fill() returns the same array every call, so copy it if you keep it.
+    """
+
+    def __init__(self):
+        self.buffer = np.zeros((1, NUM_FEATURES), dtype=np.float32)
+        self._flat = self.buffer.reshape(-1)
+
+    def fill(self, landmarks) -> np.ndarray:
+        fill_landmarks(self._flat, landmarks)
+        return self.buffer
+
+def vectorize_batch(landmark_lists, out: np.ndarray | None = None) -> np.ndarray:
+    # N frames -> (N, 132) float32; reuses `out` when it is large enough
+    n = len(landmark_lists)
+    if out is None or out.shape[0] < n or out.shape[1] != NUM_FEATURES or out.dtype != np.float32:
+        out = np.empty((n, NUM_FEATURES), dtype=np.float32)
+    for i, lms in enumerate(landmark_lists):
+        fill_landmarks(out[i], lms)
+    return out[:n]
 
 def vectorize_landmarks_with_fallback(landmarks) -> np.ndarray:
-    # 33*4 vector (x,y,z,visibility); zeros if missing
-    feat = []
-    for i in range(NUM_LANDMARKS):
-        lm = landmarks[i]
-        x = float(getattr(lm, "x", 0.0))
-        y = float(getattr(lm, "y", 0.0))
-        z = float(getattr(lm, "z", 0.0))
-        v = float(getattr(lm, "visibility", 0.0))
-        feat.extend([x, y, z, v])
-    return np.asarray(feat, dtype=np.float32).reshape(1, -1)
+    # 33*4 vector (x,y,z,visibility); zeros if missing. Fresh array per call.
+    feat = np.empty((1, NUM_FEATURES), dtype=np.float32)
+    fill_landmarks(feat.reshape(-1), landmarks)
+    return feat
 
 def build_columns():
     cols = ["session_id", "timestamp_ms"]
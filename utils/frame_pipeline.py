@@ -0,0 +1,160 @@
+# utils/frame_pipeline.py
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from utils.metrics import StageMetrics
+
+@dataclass
+class FramePacket:
+    seq: int
+    frame: Any
+    grab_ts: float        # time.perf_counter() right after cap.read()
+    grab_wall_ms: int     # wall clock at grab, for logs/CSV timestamps
+    result: Any = None
+    infer_done_ts: float = 0.0
+
+    def age_ms(self, now: float | None = None) -> float:
+        return ((now if now is not None else time.perf_counter()) - self.grab_ts) * 1000.0
+
+def _put_drop_oldest(q: queue.Queue, item) -> int:
+    # Non-blocking put; evicts the oldest entries when full. Returns #dropped.
+    dropped = 0
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                pass
+
+class FramePipeline:
+    """
+    grab thread -> [latest frame] -> inference thread -> [bounded] -> caller
+    - The grabber always keeps only the freshest frame, so a slow inference
+      stage never works on stale camera buffers.
+    - infer_fn(frame, packet) runs on the inference thread; its return value
+      is attached as packet.result.
+    - The caller (usually the main thread, for cv2.imshow) pulls finished
+      packets with get() and renders them.
+    - lossless=True blocks instead of dropping (replaying recorded footage
+      for regression checks, where every frame must be processed).
+    """
+
+    def __init__(self, cap, infer_fn, render_queue_size: int = 2, lossless: bool = False, metrics=None):
+        self.cap = cap
+        self.infer_fn = infer_fn
+        self.lossless = lossless
+        self.metrics = metrics if metrics is not None else StageMetrics(enabled=False)
+        self._grab_q = queue.Queue(maxsize=4 if lossless else 1)
+        self._out_q = queue.Queue(maxsize=max(1, render_queue_size))
+        self._stop = threading.Event()
+        self._grab_done = threading.Event()
+        self._infer_done = threading.Event()
+        self._error = None
+        self.grabbed = 0
+        self.inferred = 0
+        self.dropped_grab = 0
+        self.dropped_render = 0
+        self._ages = deque(maxlen=60)
+        self._threads = [
+            threading.Thread(target=self._grab_loop, name="pipeline-grab", daemon=True),
+            threading.Thread(target=self._infer_loop, name="pipeline-infer", daemon=True),
+        ]
+
+    def start(self):
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def finished(self) -> bool:
+        # Source exhausted (or stopped) and everything has been handed out
+        return self._infer_done.is_set() and self._out_q.empty()
+
+    def get(self, timeout: float = 0.5) -> FramePacket | None:
+        if self._error is not None:
+            raise self._error
+        try:
+            pkt = self._out_q.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        age = pkt.age_ms()
+        self._ages.append(age)
+        self.metrics.record("frame_age", age)
+        return pkt
+
+    def mean_age_ms(self) -> float:
+        return sum(self._ages) / len(self._ages) if self._ages else 0.0
+
+    def _put_blocking(self, q: queue.Queue, item):
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    @classmethod
+    def for_source(cls, source, infer_fn, **kwargs):
+        # Live sources drop stale frames; recorded ones at full speed keep every frame
+        kwargs.setdefault("lossless", not getattr(source, "is_live", True) and not getattr(source, "realtime", False))
+        return cls(source, infer_fn, **kwargs)
+
+    def _grab_loop(self):
+        seq = 0
+        try:
+            while not self._stop.is_set():
+                with self.metrics.time("grab"):
+                    ok, frame = self.cap.read()
+                if not ok or frame is None:
+                    if getattr(self.cap, "is_live", True):
+                        print("Frame read failed.")
+                    break
+                pkt = FramePacket(seq, frame, time.perf_counter(), int(time.time() * 1000))
+                seq += 1
+                self.grabbed += 1
+                if self.lossless:
+                    self._put_blocking(self._grab_q, pkt)
+                else:
+                    self.dropped_grab += _put_drop_oldest(self._grab_q, pkt)
+        finally:
+            self._grab_done.set()
+
+    def _infer_loop(self):
+        try:
+            while not self._stop.is_set():
+                try:
+                    pkt = self._grab_q.get(timeout=0.1)
+                except queue.Empty:
+                    if self._grab_done.is_set():
+                        break
+                    continue
+                pkt.result = self.infer_fn(pkt.frame, pkt)
+                pkt.infer_done_ts = time.perf_counter()
+                self.inferred += 1
+                if self.lossless:
+                    self._put_blocking(self._out_q, pkt)
+                else:
+                    self.dropped_render += _put_drop_oldest(self._out_q, pkt)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._infer_done.set()
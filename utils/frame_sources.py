@@ -0,0 +1,188 @@
+# utils/frame_sources.py
+import glob
+import os
+import time
+import numpy as np
+import cv2
+
+from utils.camera import open_capture
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+
+class _Pacer:
+    # Sleeps so that frame i is released no earlier than start + i / fps
+    def __init__(self, fps: float):
+        self.period = 1.0 / fps if fps and fps > 0 else 0.0
+        self.start = None
+        self.i = 0
+
+    def wait(self):
+        if self.period <= 0:
+            return
+        now = time.perf_counter()
+        if self.start is None:
+            self.start = now
+        due = self.start + self.i * self.period
+        if due > now:
+            time.sleep(due - now)
+        self.i += 1
+
+class FrameSource:
+    """
+    cv2.VideoCapture-like interface: read() -> (ok, frame), isOpened(), release().
+    is_live: frames come from a device and cannot be replayed.
+    realtime: recorded sources are paced to their nominal fps.
+    """
+    is_live = False
+
+    def __init__(self, fps: float = 30.0, realtime: bool = False):
+        self.fps = fps
+        self.realtime = realtime
+        self._pacer = _Pacer(fps) if realtime else None
+
+    def read(self):
+        ok, frame = self._read()
+        if ok and self._pacer is not None:
+            self._pacer.wait()
+        return ok, frame
+
+    def _read(self):
+        raise NotImplementedError
+
+    def isOpened(self) -> bool:
+        return True
+
+    def release(self):
+        pass
+
+class WebcamSource(FrameSource):
+    is_live = True
+
+    def __init__(self, index: int = 0, use_avfoundation: bool = True,
+                 width: int | None = None, height: int | None = None, fps: float | None = None):
+        self.cap = open_capture(index=index, use_avfoundation=use_avfoundation)
+        if width: self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height: self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps: self.cap.set(cv2.CAP_PROP_FPS, fps)
+        super().__init__(fps=self.cap.get(cv2.CAP_PROP_FPS) or 30.0, realtime=False)
+
+    def _read(self):
+        return self.cap.read()
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path: str, realtime: bool = False, loop: bool = False):
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Unable to open video file: {path}")
+        super().__init__(fps=self.cap.get(cv2.CAP_PROP_FPS) or 30.0, realtime=realtime)
+
+    def _read(self):
+        ok, frame = self.cap.read()
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read()
+        return ok, frame
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+class ImageDirSource(FrameSource):
+    def __init__(self, directory: str, fps: float = 30.0, realtime: bool = False, loop: bool = False):
+        self.files = sorted(f for f in glob.glob(os.path.join(directory, "*"))
+                            if f.lower().endswith(IMAGE_EXTS))
+        if not self.files:
+            raise FileNotFoundError(f"No images ({', '.join(IMAGE_EXTS)}) found in {directory}")
+        self.loop = loop
+        self._i = 0
+        super().__init__(fps=fps, realtime=realtime)
+
+    def _read(self):
+        if self._i >= len(self.files):
+            if not self.loop:
+                return False, None
+            self._i = 0
+        frame = cv2.imread(self.files[self._i])
+        self._i += 1
+        return frame is not None, frame
+
+class SyntheticSource(FrameSource):
+    """
+    Generated BGR frames (a moving block on a gradient) for throughput tests
+    on machines without a camera. num_frames=None runs forever.
+    """
+
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 30.0,
+                 num_frames: int | None = 300, realtime: bool = False):
+        self.width, self.height = width, height
+        self.num_frames = num_frames
+        self._i = 0
+        ramp = np.linspace(40, 200, width, dtype=np.uint8)
+        self._background = np.repeat(np.tile(ramp, (height, 1))[:, :, None], 3, axis=2)
+        super().__init__(fps=fps, realtime=realtime)
+
+    def _read(self):
+        if self.num_frames is not None and self._i >= self.num_frames:
+            return False, None
+        frame = self._background.copy()
+        size = max(8, min(self.width, self.height) // 6)
+        x = (self._i * 4) % max(1, self.width - size)
+        y = self.height // 2 - size // 2
+        frame[y:y + size, x:x + size] = (30, 30, 220)
+        self._i += 1
+        return True, frame
+
+def _parse_synthetic(spec: str, realtime: bool) -> SyntheticSource:
+    # synthetic[:WxH][@fps][:num_frames], e.g. synthetic:640x480@30:900
+    parts = spec.split(":")[1:]
+    kwargs = {}
+    if parts and parts[0]:
+        size, _, fps = parts[0].partition("@")
+        if size:
+            w, h = size.lower().split("x")
+            kwargs["width"], kwargs["height"] = int(w), int(h)
+        if fps:
+            kwargs["fps"] = float(fps)
+    if len(parts) > 1 and parts[1]:
+        kwargs["num_frames"] = None if parts[1] in ("inf", "0") else int(parts[1])
+    return SyntheticSource(realtime=realtime, **kwargs)
+
+def open_source(spec=None, realtime: bool = False, loop: bool = False, image_fps: float = 30.0,
+                **webcam_kwargs) -> FrameSource:
+    """
+    spec: None or a webcam index ("0"), a video file, a directory of images,
+    or "synthetic[:WxH][@fps][:num_frames]".
+    image_fps: nominal rate of an image directory. webcam_kwargs (width,
+    height, fps, use_avfoundation) only apply to webcams.
+    """
+    if spec is None or spec == "":
+        return WebcamSource(0, **webcam_kwargs)
+    if isinstance(spec, int) or str(spec).isdigit():
+        return WebcamSource(int(spec), **webcam_kwargs)
+    spec = str(spec)
+    if spec.startswith("synthetic"):
+        return _parse_synthetic(spec, realtime)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, fps=image_fps, realtime=realtime, loop=loop)
+    if os.path.isfile(spec):
+        return VideoFileSource(spec, realtime=realtime, loop=loop)
+    raise FileNotFoundError(f"Frame source not found: {spec}")
+
+def add_source_args(parser):
+    # Shared CLI flags for scripts that read frames
+    parser.add_argument("--source", default=None,
+                        help="webcam index, video file, image directory or synthetic[:WxH][@fps][:N] (default: webcam 0)")
+    parser.add_argument("--realtime", action="store_true",
+                        help="pace recorded sources to their nominal fps instead of running at full speed")
+    parser.add_argument("--loop", action="store_true", help="loop video files / image directories")
+    return parser
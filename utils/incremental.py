@@ -0,0 +1,152 @@
+# utils/incremental.py
+import os
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+
+STATE_VERSION = 3
+
+def state_path(model_path: str) -> str:
+    # models/posture_model.pkl -> models/posture_model.incremental.joblib
+    return os.path.splitext(model_path)[0] + ".incremental.joblib"
+
+class IncrementalState:
+    """
+    Everything needed to update the model with a new session without
+    touching the rest of the data:
+    - the StandardScaler, whose running mean/var absorb new rows via partial_fit;
+      the classifier's weights are re-projected onto the new scaling each
+      time, so the update itself does not move the decision boundary
+    - an SGDClassifier (log loss) warm-started from the last full fit
+    - a reservoir sample of past rows replayed alongside each new session, so
+      a session that is all "good" or all "bad" does not drag the classifier
+      toward one class
+    - the session ids already learned and the cost of the last full fit
+    """
+
+    def __init__(self, scaler, clf, replay_rows: int = 2000, seed: int = 42):
+        self.version = STATE_VERSION
+        self.scaler = scaler
+        self.clf = clf
+        self.replay_rows = replay_rows
+        self.rng = np.random.default_rng(seed)
+        self.replay_X = None
+        self.replay_y = None
+        self.n_seen = 0
+        self.sessions_seen = set()
+        self.updates_since_refit = 0
+        self.full_fit_s = 0.0
+        self.full_fit_rows = 0
+        self.feature_set = "raw132"     # utils.feature_sets schema the model was trained on
+
+    @classmethod
+    def seed(cls, pipe, X, y, groups, full_fit_s: float, replay_rows: int = 2000, seed: int = 42,
+             feature_set: str = "raw132"):
+        # Start from a fully fitted scaler + LogisticRegression pipeline
+        scaler = pipe.named_steps["scaler"]
+        lr = pipe.named_steps["clf"]
+        clf = SGDClassifier(loss="log_loss", alpha=1e-4, learning_rate="constant", eta0=0.01,
+                            random_state=seed)
+        # SGD keeps coef_ in the dtype of its input, so it is always fed float64
+        Xs = scaler.transform(X[:2]).astype(np.float64)
+        clf.partial_fit(Xs, y[:2], classes=lr.classes_)
+        clf.coef_ = lr.coef_.astype(np.float64).copy()
+        clf.intercept_ = lr.intercept_.astype(np.float64).copy()
+
+        state = cls(scaler, clf, replay_rows=replay_rows, seed=seed)
+        state._reservoir_add(X, y)
+        state.sessions_seen = {int(s) for s in np.unique(groups)}
+        state.full_fit_s = full_fit_s
+        state.full_fit_rows = len(y)
+        state.feature_set = feature_set
+        return state
+
+    def _reservoir_add(self, X, y):
+        # Algorithm R, vectorized: row t replaces slot j ~ U[0, t) when j < capacity
+        # Labels are kept as objects: fixed-width str arrays would truncate
+        # "good" when the first batch only held "bad"
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y, dtype=object)
+        if self.replay_X is None:
+            self.replay_X = np.empty((0, X.shape[1]), dtype=np.float32)
+            self.replay_y = np.empty(0, dtype=object)
+        free = max(0, self.replay_rows - len(self.replay_y))
+        if free:
+            self.replay_X = np.concatenate([self.replay_X, X[:free]])
+            self.replay_y = np.concatenate([self.replay_y, y[:free]])
+        rest = np.arange(min(free, len(y)), len(y))
+        if len(rest):
+            slots = self.rng.integers(0, self.n_seen + rest + 1)
+            keep = slots < self.replay_rows
+            self.replay_X[slots[keep]] = X[rest[keep]]
+            self.replay_y[slots[keep]] = y[rest[keep]]
+        self.n_seen += len(y)
+
+    def partial_update(self, X, y, epochs: int = 3):
+        # X, y: rows of one new session
+        old_mean, old_scale = self._scaling()
+        self.scaler.partial_fit(X)
+        self._reproject(old_mean, old_scale)
+        Xb = np.concatenate([X, self.replay_X]) if len(self.replay_y) else X
+        yb = np.concatenate([np.asarray(y, dtype=object), self.replay_y]) if len(self.replay_y) else y
+        Xs = self.scaler.transform(Xb).astype(np.float64)
+        for _ in range(epochs):
+            order = self.rng.permutation(len(yb))
+            self.clf.partial_fit(Xs[order], yb[order])
+        self._reservoir_add(X, y)
+
+    def _scaling(self):
+        # -> (mean, scale) as StandardScaler.transform applies them
+        n = self.scaler.n_features_in_
+        mean = self.scaler.mean_ if self.scaler.with_mean else np.zeros(n)
+        scale = self.scaler.scale_ if self.scaler.with_std else np.ones(n)
+        return np.array(mean, dtype=np.float64), np.array(scale, dtype=np.float64)
+
+    def _reproject(self, old_mean, old_scale):
+        # w.(x - m)/s + b == w'.(x - m')/s' + b' for every x: the SGD weights
+        # were learned in the old scaled space
+        mean, scale = self._scaling()
+        w = self.clf.coef_ / old_scale
+        self.clf.intercept_ = self.clf.intercept_ + w @ (mean - old_mean)
+        self.clf.coef_ = w * scale
+
+    def pipeline(self) -> Pipeline:
+        return Pipeline([("scaler", self.scaler), ("clf", self.clf)])
+
+    def estimated_full_fit_s(self, rows: int) -> float:
+        # Full fits scale roughly linearly with rows at this size
+        if not self.full_fit_rows:
+            return 0.0
+        return self.full_fit_s * rows / self.full_fit_rows
+
+    def save(self, model_path: str):
+        path = state_path(model_path)
+        tmp = path + ".tmp"
+        joblib.dump(self, tmp)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(model_path: str):
+        # -> IncrementalState, or None when missing/unusable (caller falls back to a full fit)
+        path = state_path(model_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            state = joblib.load(path)
+        except Exception as e:
+            print(f"Incremental state unusable ({e}); a full refit will be run.")
+            return None
+        if getattr(state, "version", None) != STATE_VERSION:
+            return None
+        return state
+
+def drift_report(inc_pipe, full_pipe, Xte, yte) -> dict:
+    # Compares the incrementally updated model with a fresh full fit on the same holdout
+    inc_pred = inc_pipe.predict(Xte)
+    full_pred = full_pipe.predict(Xte)
+    return {
+        "incremental_accuracy": float((inc_pred == yte).mean()),
+        "full_accuracy": float((full_pred == yte).mean()),
+        "disagreement": float((inc_pred != full_pred).mean()),
+    }
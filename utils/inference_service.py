@@ -0,0 +1,349 @@
+# utils/inference_service.py
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+import numpy as np
+
+from utils.metrics import LatencyHistogram
+
+# Wire format (little endian), after a length-prefixed JSON hello from the server:
+#   request:  uint32 req_id, uint16 rows, uint16 n_features, rows * n_features float32
+#   response: uint32 req_id, uint16 rows, rows int8 class codes, rows float32 prob_good (NaN = none)
+#   error:    uint32 req_id, uint16 0 (request rejected or the batch failed)
+_REQ = struct.Struct("<IHH")
+_RESP = struct.Struct("<IH")
+_LEN = struct.Struct("<I")
+
+DEFAULT_ADDRESS = "tcp:127.0.0.1:8765"
+
+def parse_address(spec: str):
+    # "unix:/tmp/posture.sock" | "tcp:127.0.0.1:8765" | "127.0.0.1:8765" -> (family, address)
+    if spec.startswith("unix:"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not supported on this platform; use tcp:HOST:PORT")
+        return socket.AF_UNIX, spec[5:]
+    host, _, port = spec[4:].rpartition(":") if spec.startswith("tcp:") else spec.rpartition(":")
+    if not port.isdigit():
+        raise ValueError(f"Bad service address: {spec}")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+def _recv_exact(sock, n: int) -> bytes:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:], n - got)
+        if k == 0:
+            raise ConnectionError("connection closed")
+        got += k
+    return bytes(buf)
+
+def _no_delay(sock):
+    if sock.family == socket.AF_INET:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+class _Client:
+    def __init__(self, sock):
+        self.sock = sock
+        self.send_lock = threading.Lock()
+
+class InferenceServer:
+    """
+    Local classification service shared by many detector processes.
+    - One reader thread per client connection queues (client, req_id, rows).
+    - One batcher thread takes the first pending request, keeps collecting
+      until `max_batch` rows or `max_wait_ms` after that first arrival, then
+      runs a single predictor.predict_batch() and answers every request.
+      Clients keep one request in flight, so once every connected client is
+      in the batch it is dispatched without waiting out the deadline.
+    Feature stages (temporal windows) stay in the clients; the service only
+    sees finished model inputs.
+    """
+
+    def __init__(self, predictor, address: str = DEFAULT_ADDRESS, max_batch: int = 64,
+                 max_wait_ms: float = 2.0):
+        self.predictor = predictor
+        self.address = address
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.classes = [str(c) for c in predictor.classes]
+        self._codes = {c: i for i, c in enumerate(self.classes)}
+        self.n_features = getattr(predictor, "n_features", None)
+        self._hello = json.dumps({
+            "classes": self.classes,
+            "feature_set": getattr(predictor, "feature_set", "raw132"),
+            "n_features": self.n_features,
+        }).encode()
+        self._pending = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+        self._sock = None
+        self.clients = 0
+        self._connected = 0
+        self._conn_lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+        self.predict_ms = LatencyHistogram()
+
+    @property
+    def mean_batch(self) -> float:
+        return self.rows / self.batches if self.batches else 0.0
+
+    def start(self):
+        family, addr = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_UNIX:
+            if os.path.exists(addr):
+                os.remove(addr)
+        else:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(addr)
+        if family == socket.AF_INET and addr[1] == 0:
+            # Port 0: report the port the OS picked
+            self.address = f"tcp:{addr[0]}:{sock.getsockname()[1]}"
+        sock.listen(64)
+        sock.settimeout(0.5)
+        self._sock = sock
+        for target, name in ((self._accept_loop, "infer-accept"), (self._batch_loop, "infer-batch")):
+            t = threading.Thread(target=target, name=name, daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        self._pending.put(None)
+        for t in self._threads:
+            t.join(timeout)
+        if self._sock is not None:
+            self._sock.close()
+            family, addr = parse_address(self.address)
+            if family == socket.AF_UNIX and os.path.exists(addr):
+                os.remove(addr)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            conn.settimeout(None)
+            _no_delay(conn)
+            conn.sendall(_LEN.pack(len(self._hello)) + self._hello)
+            self.clients += 1
+            with self._conn_lock:
+                self._connected += 1
+            threading.Thread(target=self._read_loop, args=(_Client(conn),), name="infer-client", daemon=True).start()
+
+    def _send(self, client, msg: bytes):
+        try:
+            with client.send_lock:
+                client.sock.sendall(msg)
+        except OSError:
+            pass
+
+    def _read_loop(self, client):
+        try:
+            while not self._stop.is_set():
+                req_id, rows, n = _REQ.unpack(_recv_exact(client.sock, _REQ.size))
+                if self.n_features is not None and n != self.n_features:
+                    # Wrong schema: answer with an error and drop the connection (payload size is untrusted)
+                    print(f"Inference service: rejected request with {rows}x{n} features "
+                          f"(expected {self.n_features}); closing client")
+                    self._send(client, _RESP.pack(req_id, 0))
+                    break
+                if rows == 0:
+                    self._send(client, _RESP.pack(req_id, 0))
+                    continue
+                X = np.frombuffer(_recv_exact(client.sock, rows * n * 4), dtype=np.float32).reshape(rows, n)
+                self._pending.put((client, req_id, X))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with self._conn_lock:
+                self._connected -= 1
+            client.sock.close()
+
+    def _batch_loop(self):
+        # Must never exit before stop(): every client depends on this thread
+        while not self._stop.is_set():
+            first = self._pending.get()
+            if first is None:
+                break
+            batch = [first]
+            rows = len(first[2])
+            deadline = time.perf_counter() + self.max_wait_s
+            while rows < self.max_batch and len(batch) < self._connected:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    break
+                try:
+                    item = self._pending.get(timeout=left)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._stop.set()
+                    break
+                batch.append(item)
+                rows += len(item[2])
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        t0 = time.perf_counter()
+        try:
+            X = batch[0][2] if len(batch) == 1 else np.concatenate([b[2] for b in batch])
+            labels, probs = self.predictor.predict_batch(X)
+            codes = np.fromiter((self._codes.get(str(l), -1) for l in labels), dtype=np.int8, count=len(X))
+            probs = (np.full(len(X), np.nan, dtype=np.float32) if probs is None
+                     else np.asarray(probs, dtype=np.float32))
+        except Exception as e:
+            print(f"Inference service: batch of {len(batch)} request(s) failed ({e})")
+            for client, req_id, _ in batch:
+                self._send(client, _RESP.pack(req_id, 0))
+            return
+        self.predict_ms.record((time.perf_counter() - t0) * 1000.0)
+        self.batches += 1
+        self.rows += len(X)
+
+        i = 0
+        for client, req_id, Xr in batch:
+            n = len(Xr)
+            self._send(client, _RESP.pack(req_id, n) + codes[i:i + n].tobytes() + probs[i:i + n].tobytes())
+            i += n
+
+class RemotePredictor:
+    """
+    Client side of InferenceServer with the runtime predictor interface:
+    predict(x) -> (label, prob_good) and predict_batch(X) -> (labels,
+    probs). `classes` and `feature_set` come from the server's hello, so
+    feature_stage_for() and PostureStack work unchanged.
+    One request in flight per instance (one per detector thread).
+    A rejected or failed request, or a lost connection, answers (None, None)
+    like a frame without a prediction instead of raising, and the connection
+    is re-opened with exponential backoff (`retry_s` up to `max_retry_s`),
+    so a service restart does not stop the detector.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = 5.0,
+                 retry_s: float = 0.5, max_retry_s: float = 10.0):
+        self.address = address
+        self.timeout = timeout
+        self.retry_s = retry_s
+        self.max_retry_s = max_retry_s
+        self.sock = None
+        self._backoff = retry_s
+        self._retry_at = 0.0
+        self._req_id = 0
+        # The first connection must succeed: it tells us the classes and feature set
+        self._connect()
+
+    def _connect(self):
+        family, addr = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(addr)
+            _no_delay(sock)
+            (n,) = _LEN.unpack(_recv_exact(sock, _LEN.size))
+            hello = json.loads(_recv_exact(sock, n))
+        except BaseException:
+            sock.close()
+            raise
+        feature_set = hello.get("feature_set", "raw132")
+        if hasattr(self, "feature_set") and self.feature_set != feature_set:
+            print(f"Inference service: now serving {feature_set}, this detector was started for {self.feature_set}")
+        self.sock = sock
+        self.classes = hello["classes"]
+        self.feature_set = feature_set
+        self.n_features = hello.get("n_features")
+        # Code -1 ("no result") indexes the trailing None
+        self._names = np.array(self.classes + [None], dtype=object)
+        self._backoff = self.retry_s
+
+    def _disconnect(self, reason):
+        if self.sock is not None:
+            print(f"Inference service: connection lost ({reason}); retrying in {self._backoff:.1f}s")
+            self.sock.close()
+            self.sock = None
+        self._retry_at = time.monotonic() + self._backoff
+        self._backoff = min(self._backoff * 2, self.max_retry_s)
+
+    def _request(self, X):
+        # -> (codes, probs), or None when there is no answer for this request
+        if self.sock is None:
+            if time.monotonic() < self._retry_at:
+                return None
+            try:
+                self._connect()
+                print(f"Inference service: reconnected to {self.address}")
+            except (OSError, ValueError) as e:
+                self._disconnect(e)
+                return None
+        self._req_id = (self._req_id + 1) & 0xFFFFFFFF
+        try:
+            self.sock.sendall(_REQ.pack(self._req_id, X.shape[0], X.shape[1]) + X.tobytes())
+            req_id, rows = _RESP.unpack(_recv_exact(self.sock, _RESP.size))
+            body = _recv_exact(self.sock, rows * 5)
+            if req_id != self._req_id:
+                raise ConnectionError(f"out-of-order response {req_id} (expected {self._req_id})")
+        except OSError as e:
+            self._disconnect(e)
+            return None
+        if rows == 0:
+            # Rejected (e.g. wrong feature count) or the server's batch failed; the connection stays up
+            return None
+        codes = np.frombuffer(body[:rows], dtype=np.int8)
+        probs = np.frombuffer(body[rows:], dtype=np.float32)
+        return codes, probs
+
+    @staticmethod
+    def _rows(X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+
+    def predict(self, x):
+        res = self._request(self._rows(x))
+        if res is None:
+            return None, None
+        codes, probs = res
+        p = float(probs[0])
+        return self._names[codes[0]], (None if p != p else p)
+
+    def predict_batch(self, X):
+        # Rows without a result (no answer, or code -1) get label None
+        X = self._rows(X)
+        res = self._request(X) if len(X) else (np.empty(0, dtype=np.int8), np.empty(0, dtype=np.float32))
+        if res is None:
+            return np.full(len(X), None, dtype=object), None
+        codes, probs = res
+        labels = self._names[codes]
+        if (codes >= 0).all():
+            labels = labels.astype(str)
+        return labels, (None if np.isnan(probs).all() else probs.astype(np.float64))
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
@@ -10,16 +10,28 @@ class Paths:
         self.data_dir = os.path.join(self.project_root, "data")
         self.sessions_dir = os.path.join(self.data_dir, "sessions")
         self.logs_dir = os.path.join(self.data_dir, "logs")
+        self.store_dir = os.path.join(self.data_dir, "store")
         self.models_dir = os.path.join(self.project_root, "models")
         self.assets_dir = os.path.join(self.project_root, "assets")
 
         self.pose_data_csv = os.path.join(self.data_dir, "pose_data.csv")
         self.pose_data_labeled_csv = os.path.join(self.data_dir, "pose_data_labeled.csv")
+        self.labeled_store = os.path.join(self.store_dir, "pose_data_labeled")
+        self.sessions_manifest = os.path.join(self.sessions_dir, "manifest.json")
+        self.sessions_store = os.path.join(self.store_dir, "sessions")
         self.bad_posture_xlsx = os.path.join(self.logs_dir, "bad_posture_log.xlsx")
+        self.events_db = os.path.join(self.logs_dir, "posture_events.sqlite3")
         self.model_path = os.path.join(self.models_dir, "posture_model.pkl")
+        self.model_npz = os.path.join(self.models_dir, "posture_model.npz")
+        self.model_header = os.path.join(self.models_dir, "posture_model.json")
         self.beep_wav = os.path.join(self.assets_dir, "beep.wav")
 
     @staticmethod
     def timestamp_name(prefix: str) -> str:
         ts = datetime.now().strftime("%Y%m%d_%H%M")
         return f"{prefix}_{ts}.csv"
+
+    @staticmethod
+    def session_name(label: str, session_id: int) -> str:
+        # One file per capture session: good_pose_1755028320.csv
+        return f"{label}_pose_{session_id}.csv"
@@ -0,0 +1,117 @@
+# utils/jobs.py
+import queue
+import threading
+import time
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    """
+    Handle passed to a job function running on a worker thread.
+    progress() only posts an event; checkpoint() also raises JobCancelled
+    once cancel() has been called, so long jobs stop at their next stage.
+    """
+
+    def __init__(self, name: str, slot: str, events: queue.Queue):
+        self.name = name
+        self.slot = slot
+        self.cancel_event = threading.Event()
+        self.started = time.time()
+        self._events = events
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def progress(self, text: str, **fields):
+        self._events.put(("progress", self, text, fields))
+
+    def checkpoint(self, text: str, **fields):
+        if self.cancelled:
+            raise JobCancelled(self.name)
+        self.progress(text, **fields)
+
+class JobRunner:
+    """
+    Background jobs for a Tk app. Workers never touch widgets: they post
+    events on a queue that poll() drains on the Tk thread (root.after), and
+    the callbacks given to start() run there.
+    - One job per slot: start() returns None while the slot is busy.
+    - cancel() sets the job's flag; the job function decides where to stop.
+    """
+
+    def __init__(self, root, poll_ms: int = 100):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._events = queue.Queue()
+        self._running = {}          # slot -> (job, callbacks)
+        self.root.after(self.poll_ms, self.poll)
+
+    def busy(self, slot: str | None = None):
+        # -> the running Job in `slot` (any slot when None), or None
+        if slot is not None:
+            return self._running.get(slot, (None,))[0]
+        return next((job for job, _ in self._running.values()), None)
+
+    def start(self, name: str, fn, *args, slot: str | None = None, on_progress=None,
+              on_done=None, on_error=None, on_cancelled=None):
+        """
+        Runs fn(job, *args) on a daemon thread. Callbacks (Tk thread):
+        on_progress(job, text, fields), on_done(job, result),
+        on_error(job, exc), on_cancelled(job).
+        """
+        slot = slot or name
+        if slot in self._running:
+            return None
+        job = Job(name, slot, self._events)
+        self._running[slot] = (job, (on_progress, on_done, on_error, on_cancelled))
+
+        def _run():
+            try:
+                result = fn(job, *args)
+            except JobCancelled:
+                self._events.put(("cancelled", job, None, None))
+            except Exception as e:
+                self._events.put(("error", job, e, None))
+            else:
+                self._events.put(("done", job, result, None))
+
+        threading.Thread(target=_run, name=f"job-{name}", daemon=True).start()
+        return job
+
+    def cancel(self, slot: str | None = None) -> bool:
+        job = self.busy(slot)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def poll(self):
+        try:
+            while True:
+                kind, job, value, fields = self._events.get_nowait()
+                entry = self._running.get(job.slot)
+                if entry is None or entry[0] is not job:
+                    continue
+                on_progress, on_done, on_error, on_cancelled = entry[1]
+                if kind == "progress":
+                    if on_progress is not None:
+                        on_progress(job, value, fields)
+                    continue
+                # Finished: free the slot before the callback so it can start a follow-up job
+                del self._running[job.slot]
+                if kind == "done" and on_done is not None:
+                    on_done(job, value)
+                elif kind == "error" and on_error is not None:
+                    on_error(job, value)
+                elif kind == "cancelled" and on_cancelled is not None:
+                    on_cancelled(job)
+        except queue.Empty:
+            pass
+        finally:
+            # Keep polling even if a callback raised (Tk reports it)
+            self.root.after(self.poll_ms, self.poll)
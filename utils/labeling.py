@@ -2,6 +2,9 @@
 import os
 import pandas as pd
 
+# Legacy: copies a session into both combined CSVs. The admin app now
+# registers sessions in utils.catalog.SessionCatalog instead; combined CSVs
+# can be produced on demand with scripts/export_sessions.py.
 def append_session_to_datasets(session_csv: str, label: str, pose_data_csv: str, pose_data_labeled_csv: str) -> int:
     if not os.path.exists(session_csv) or os.path.getsize(session_csv) == 0:
         return 0
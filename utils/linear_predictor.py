@@ -0,0 +1,137 @@
+# utils/linear_predictor.py
+import math
+import numpy as np
+
+GOOD_LABEL = "good"
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+class LinearPredictor:
+    """
+    Binary logistic model with the StandardScaler folded into the weights:
+        p(classes[1] | x) = sigmoid(x . w + b)
+    One dot product per frame; returns (label, prob_good) together.
+    """
+
+    def __init__(self, w, b, classes, good_label: str = GOOD_LABEL):
+        self.w = np.asarray(w, dtype=np.float64).reshape(-1)
+        self.b = float(b)
+        self.classes = [str(c) for c in classes]
+        if len(self.classes) != 2:
+            raise ValueError("LinearPredictor supports exactly two classes.")
+        self.n_features = self.w.shape[0]
+        # +1: prob_good = sigmoid(z), -1: prob_good = 1 - sigmoid(z), 0: no 'good' class
+        if self.classes[1] == good_label:
+            self._good_sign = 1
+        elif self.classes[0] == good_label:
+            self._good_sign = -1
+        else:
+            self._good_sign = 0
+
+    def decision(self, x) -> float:
+        return float(np.dot(np.reshape(x, -1), self.w)) + self.b
+
+    def predict(self, x):
+        z = self.decision(x)
+        label = self.classes[1] if z > 0 else self.classes[0]
+        if self._good_sign == 0:
+            return label, None
+        p1 = _sigmoid(z)
+        return label, (p1 if self._good_sign > 0 else 1.0 - p1)
+
+    def predict_batch(self, X):
+        z = np.asarray(X, dtype=np.float64) @ self.w + self.b
+        labels = np.where(z > 0, self.classes[1], self.classes[0])
+        if self._good_sign == 0:
+            return labels, None
+        p1 = 0.5 * (1.0 + np.tanh(0.5 * z))  # overflow-free sigmoid
+        return labels, (p1 if self._good_sign > 0 else 1.0 - p1)
+
+class PipelinePredictor:
+    # Fallback for estimators that cannot be folded into one matvec
+    def __init__(self, pipe, good_label: str = GOOD_LABEL):
+        self.pipe = pipe
+        self.classes = [str(c) for c in getattr(pipe, "classes_", [])]
+        self._good_idx = self.classes.index(good_label) if good_label in self.classes else None
+        if not hasattr(pipe, "predict_proba"):
+            self._good_idx = None
+
+    def predict(self, x):
+        X = np.reshape(x, (1, -1))
+        if self._good_idx is None:
+            return str(self.pipe.predict(X)[0]), None
+        proba = self.pipe.predict_proba(X)[0]
+        k = int(np.argmax(proba))
+        return self.classes[k], float(proba[self._good_idx])
+
+    def predict_batch(self, X):
+        if self._good_idx is None:
+            return np.asarray(self.pipe.predict(X)).astype(str), None
+        proba = self.pipe.predict_proba(X)
+        labels = np.asarray(self.classes)[np.argmax(proba, axis=1)]
+        return labels, proba[:, self._good_idx]
+
+def _is_logistic(clf) -> bool:
+    name = type(clf).__name__
+    if name == "LogisticRegression":
+        return True
+    if name == "SGDClassifier":
+        return getattr(clf, "loss", None) in ("log_loss", "log")
+    return False
+
+def _passthrough_columns(ct):
+    # ColumnTransformer that only passes one list of integer columns through -> that list.
+    # Reads the constructor spec: fitted transformers_ wrap "passthrough" in a FunctionTransformer.
+    if getattr(ct, "remainder", None) != "drop" or len(getattr(ct, "transformers", [])) != 1:
+        return None
+    _, t, cols = ct.transformers[0]
+    if not (isinstance(t, str) and t == "passthrough"):
+        return None
+    cols = np.asarray(cols)
+    return cols if cols.dtype.kind in "iu" else None
+
+def compile_pipeline(pipe, good_label: str = GOOD_LABEL) -> LinearPredictor | None:
+    """
+    Folds StandardScaler -> binary logistic classifier into a LinearPredictor.
+    Returns None when the pipeline has any other shape.
+    Duck-typed on fitted attributes, so sklearn is never imported here.
+    """
+    steps = [s for _, s in getattr(pipe, "steps", [("clf", pipe)]) if s is not None and s != "passthrough"]
+    if not steps:
+        return None
+    clf = steps[-1]
+    if not _is_logistic(clf) or len(getattr(clf, "classes_", [])) != 2:
+        return None
+
+    w = np.asarray(clf.coef_, dtype=np.float64).reshape(-1)
+    b = float(np.asarray(clf.intercept_, dtype=np.float64).reshape(-1)[0])
+
+    for i, step in reversed(list(enumerate(steps[:-1]))):
+        if i == 0 and type(step).__name__ == "ColumnTransformer":
+            # Leading column subset (feature-set selection): scatter back to full width
+            cols = _passthrough_columns(step)
+            if cols is None:
+                return None
+            full = np.zeros(int(step.n_features_in_), dtype=np.float64)
+            full[cols] = w
+            w = full
+            continue
+        if type(step).__name__ != "StandardScaler":
+            return None
+        scale = getattr(step, "scale_", None)
+        mean = getattr(step, "mean_", None)
+        if scale is not None:
+            w = w / np.asarray(scale, dtype=np.float64)
+        if mean is not None and getattr(step, "with_mean", True):
+            b -= float(np.dot(w, np.asarray(mean, dtype=np.float64)))
+
+    return LinearPredictor(w, b, clf.classes_, good_label=good_label)
+
+def as_predictor(pipe, good_label: str = GOOD_LABEL):
+    # Fused kernel when possible, sklearn pipeline otherwise
+    fused = compile_pipeline(pipe, good_label=good_label)
+    return fused if fused is not None else PipelinePredictor(pipe, good_label=good_label)
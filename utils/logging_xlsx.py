@@ -2,7 +2,11 @@
 import os
 import pandas as pd
 
+from utils.event_log import iter_table, list_tables
+
 def append_bad_event(xlsx_path: str, row: dict):
+    # Legacy per-row writer (rewrites the whole file). Live detection now logs
+    # to utils.event_log.EventJournal and exports with export_journal_xlsx().
     os.makedirs(os.path.dirname(xlsx_path), exist_ok=True)
     df_row = pd.DataFrame([row])
     if os.path.exists(xlsx_path) and os.path.getsize(xlsx_path) > 0:
@@ -14,3 +18,25 @@ def append_bad_event(xlsx_path: str, row: dict):
     else:
         out = df_row
     out.to_excel(xlsx_path, index=False)
+
+def export_journal_xlsx(db_path: str, xlsx_path: str) -> int:
+    """
+    Streams every journal table into its own sheet using openpyxl's
+    write-only mode, so memory use does not grow with the log size.
+    Returns the number of data rows written.
+    """
+    from openpyxl import Workbook
+
+    os.makedirs(os.path.dirname(os.path.abspath(xlsx_path)), exist_ok=True)
+    wb = Workbook(write_only=True)
+    total = 0
+    for table in list_tables(db_path):
+        ws = wb.create_sheet(title=table[:31])
+        for i, row in enumerate(iter_table(db_path, table)):
+            ws.append(list(row))
+            if i:
+                total += 1
+    if not wb.worksheets:
+        wb.create_sheet(title="events")
+    wb.save(xlsx_path)
+    return total
@@ -0,0 +1,228 @@
+# utils/metrics.py
+import json
+import math
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Log-spaced latency buckets: 10 us .. ~100 s, 16 buckets per decade
+_BUCKETS_PER_DECADE = 16
+_MIN_MS = 0.01
+_N_BUCKETS = 7 * _BUCKETS_PER_DECADE + 1
+_BOUNDS_MS = [_MIN_MS * 10 ** (i / _BUCKETS_PER_DECADE) for i in range(_N_BUCKETS)]
+
+_NULL = nullcontext()
+
+class LatencyHistogram:
+    """
+    Fixed-size histogram; record() is O(1) and percentiles are interpolated
+    inside log-spaced buckets (~15% wide), which is plenty for p50/p95/p99
+    of frame stages.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (_N_BUCKETS + 1)
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float):
+        if ms <= _MIN_MS:
+            i = 0
+        else:
+            i = min(_N_BUCKETS, int(math.log10(ms / _MIN_MS) * _BUCKETS_PER_DECADE) + 1)
+        self.counts[i] += 1
+        self.n += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        if self.n == 0:
+            return 0.0
+        target = q / 100.0 * self.n
+        acc = 0
+        for i, c in enumerate(self.counts):
+            if c and acc + c >= target:
+                if i == 0:
+                    return min(_MIN_MS, self.max_ms)
+                lo, hi = _BOUNDS_MS[i - 1], _BOUNDS_MS[min(i, _N_BUCKETS - 1)]
+                frac = (target - acc) / c
+                return min(lo * (hi / lo) ** frac, self.max_ms)
+            acc += c
+        return self.max_ms
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.n,
+            "mean_ms": round(self.total_ms / self.n, 4) if self.n else 0.0,
+            "p50_ms": round(self.percentile(50), 4),
+            "p95_ms": round(self.percentile(95), 4),
+            "p99_ms": round(self.percentile(99), 4),
+            "max_ms": round(self.max_ms, 4),
+        }
+
+class _StageTimer:
+    __slots__ = ("hist", "t0")
+
+    def __init__(self, hist):
+        self.hist = hist
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.record((time.perf_counter() - self.t0) * 1000.0)
+
+class StageMetrics:
+    """
+    Per-stage latency histograms.
+        with metrics.time("pose"): res = pose.process(rgb)
+    When disabled, time() returns a shared no-op context manager, so the
+    instrumented loop pays one attribute check per stage.
+    Each stage should be timed from a single thread.
+    """
+
+    def __init__(self, name: str = "detector", enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self.started = time.time()
+        self._hists = {}
+        self._lock = threading.Lock()
+
+    def _hist(self, stage: str) -> LatencyHistogram:
+        h = self._hists.get(stage)
+        if h is None:
+            with self._lock:
+                h = self._hists.setdefault(stage, LatencyHistogram())
+        return h
+
+    def time(self, stage: str):
+        if not self.enabled:
+            return _NULL
+        return _StageTimer(self._hist(stage))
+
+    def record(self, stage: str, ms: float):
+        if self.enabled:
+            self._hist(stage).record(ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            items = list(self._hists.items())
+        return {
+            "name": self.name,
+            "uptime_s": round(time.time() - self.started, 1),
+            "stages": {k: h.snapshot() for k, h in items},
+        }
+
+    def format_lines(self):
+        snap = self.snapshot()["stages"]
+        return [f"{k:>10}: p50 {v['p50_ms']:7.2f}  p95 {v['p95_ms']:7.2f}  p99 {v['p99_ms']:7.2f} ms  (n={v['count']})"
+                for k, v in snap.items()]
+
+    def prometheus_text(self) -> str:
+        out = [
+            "# HELP ergonomics_stage_latency_ms Per-stage latency of the live loop in milliseconds",
+            "# TYPE ergonomics_stage_latency_ms summary",
+        ]
+        for stage, s in self.snapshot()["stages"].items():
+            lbl = f'app="{self.name}",stage="{stage}"'
+            for q, key in ((0.5, "p50_ms"), (0.95, "p95_ms"), (0.99, "p99_ms")):
+                out.append(f'ergonomics_stage_latency_ms{{{lbl},quantile="{q}"}} {s[key]}')
+            out.append(f"ergonomics_stage_latency_ms_sum{{{lbl}}} {s['mean_ms'] * s['count']:.4f}")
+            out.append(f"ergonomics_stage_latency_ms_count{{{lbl}}} {s['count']}")
+        return "\n".join(out) + "\n"
+
+class MetricsExporter:
+    """
+    Writes StageMetrics.snapshot() as JSON to `path` every `interval` seconds
+    (atomic replace) and optionally serves Prometheus text on
+    http://127.0.0.1:<port>/metrics.
+    """
+
+    def __init__(self, metrics: StageMetrics, path: str | None = None, interval: float = 5.0,
+                 port: int | None = None):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.port = port
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def start(self):
+        if not self.metrics.enabled:
+            return self
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._thread = threading.Thread(target=self._loop, name="metrics-export", daemon=True)
+            self._thread.start()
+        if self.port:
+            self._start_http()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self.path and self.metrics.enabled:
+            self.write_now()
+
+    def write_now(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.metrics.snapshot(), f, indent=2)
+        os.replace(tmp, self.path)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write_now()
+            except OSError as e:
+                print(f"Metrics export failed: {e}")
+
+    def _start_http(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+
+def add_metrics_args(parser):
+    parser.add_argument("--metrics", action="store_true",
+                        help="record per-stage latency histograms (also enabled by ERGO_METRICS=1)")
+    parser.add_argument("--metrics-file", default=None, help="JSON snapshot path (default: data/logs/metrics_<name>.json)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus text on 127.0.0.1:<port>/metrics")
+    parser.add_argument("--metrics-interval", type=float, default=5.0, help="seconds between JSON snapshots")
+    return parser
+
+def metrics_from_args(args, name: str, logs_dir: str):
+    # -> (StageMetrics, MetricsExporter); both are inert when metrics are off
+    enabled = bool(getattr(args, "metrics", False) or os.environ.get("ERGO_METRICS") == "1"
+                   or getattr(args, "metrics_port", None))
+    metrics = StageMetrics(name, enabled=enabled)
+    path = getattr(args, "metrics_file", None) or os.path.join(logs_dir, f"metrics_{name}.json")
+    exporter = MetricsExporter(metrics, path=path, interval=getattr(args, "metrics_interval", 5.0),
+                               port=getattr(args, "metrics_port", None))
+    return metrics, exporter
@@ -0,0 +1,119 @@
+# utils/model_artifact.py
+import hashlib
+import io
+import json
+import os
+import time
+import numpy as np
+
+from utils.feature_vector import build_columns
+from utils.linear_predictor import LinearPredictor, GOOD_LABEL, as_predictor, compile_pipeline
+
+ARTIFACT_FORMAT = "ergonomics-linear"
+ARTIFACT_VERSION = 1
+
+def artifact_paths(model_path: str):
+    # models/posture_model.pkl -> (models/posture_model.npz, models/posture_model.json)
+    base = os.path.splitext(model_path)[0]
+    return base + ".npz", base + ".json"
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def save_artifact(predictor: LinearPredictor, model_path: str, feature_names, feature_set: str = "raw132"):
+    """
+    Writes the weights to <model>.npz and a small JSON header next to it:
+    format/version, classes, feature schema and the sha256 of the .npz.
+    """
+    npz_path, header_path = artifact_paths(model_path)
+    os.makedirs(os.path.dirname(npz_path), exist_ok=True)
+
+    buf = io.BytesIO()
+    np.savez(buf, w=predictor.w.astype(np.float64), b=np.array([predictor.b], dtype=np.float64))
+    with open(npz_path, "wb") as f:
+        f.write(buf.getvalue())
+
+    header = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "kind": "binary_logistic",
+        "classes": list(predictor.classes),
+        "n_features": int(predictor.n_features),
+        "feature_set": feature_set,
+        "feature_names": list(feature_names),
+        "weights_file": os.path.basename(npz_path),
+        "sha256": _sha256(npz_path),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    tmp = header_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(header, f, indent=2)
+    os.replace(tmp, header_path)
+    return npz_path, header_path
+
+def read_header(model_path: str) -> dict:
+    _, header_path = artifact_paths(model_path)
+    with open(header_path) as f:
+        header = json.load(f)
+    if header.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"Unknown model artifact format in {header_path}")
+    if int(header.get("version", 0)) > ARTIFACT_VERSION:
+        raise ValueError(f"Model artifact version {header.get('version')} is newer than supported ({ARTIFACT_VERSION})")
+    return header
+
+def load_artifact(model_path: str, good_label: str = GOOD_LABEL) -> LinearPredictor:
+    header = read_header(model_path)
+    npz_path, _ = artifact_paths(model_path)
+    if _sha256(npz_path) != header["sha256"]:
+        raise ValueError(f"Checksum mismatch for {npz_path}; re-train or re-export the model.")
+    with np.load(npz_path, allow_pickle=False) as z:
+        w = z["w"]
+        b = float(z["b"][0])
+    if w.shape[0] != int(header["n_features"]):
+        raise ValueError(f"{npz_path}: expected {header['n_features']} weights, found {w.shape[0]}")
+    predictor = LinearPredictor(w, b, header["classes"], good_label=good_label)
+    predictor.header = header
+    predictor.feature_set = header.get("feature_set", "raw132")
+    return predictor
+
+def has_fresh_artifact(model_path: str) -> bool:
+    # The artifact must exist and not be older than the pickle it mirrors
+    npz_path, header_path = artifact_paths(model_path)
+    if not (os.path.exists(npz_path) and os.path.exists(header_path)):
+        return False
+    if os.path.exists(model_path) and os.path.getmtime(model_path) > os.path.getmtime(header_path) + 1.0:
+        return False
+    return True
+
+def load_predictor(model_path: str, good_label: str = GOOD_LABEL):
+    """
+    Runtime entry point. Uses the .npz artifact when present (no sklearn
+    import), otherwise unpickles the joblib model and compiles it.
+    """
+    if has_fresh_artifact(model_path):
+        try:
+            return load_artifact(model_path, good_label=good_label)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Model artifact unusable ({e}); falling back to {model_path}")
+
+    import joblib
+    pipe = joblib.load(model_path)
+    predictor = as_predictor(pipe, good_label=good_label)
+    # training.save_model tags pipelines that expect derived (e.g. temporal) features
+    predictor.feature_set = getattr(pipe, "feature_set_", "raw132")
+    return predictor
+
+def export_from_pickle(model_path: str, feature_names=None):
+    # Builds the artifact for an existing joblib pipeline
+    import joblib
+
+    fused = compile_pipeline(joblib.load(model_path))
+    if fused is None:
+        raise ValueError(f"{model_path} is not a scaler + binary logistic pipeline.")
+    if feature_names is None:
+        feature_names = build_columns()[2:]
+    return save_artifact(fused, model_path, feature_names)
@@ -0,0 +1,229 @@
+# utils/model_selection.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+
+from utils.dataset_store import DatasetStore
+from utils.feature_vector import build_columns
+from utils.linear_predictor import LinearPredictor, as_predictor
+from utils.feature_sets import build_stage
+
+RAW_COLUMNS = build_columns()[2:]
+
+# Column subsets of the raw 132-wide landmark vector, selected inside the
+# pipeline so the model still consumes the vector the live detector builds
+COLUMN_SUBSETS = {
+    "all": list(range(len(RAW_COLUMNS))),
+    "xyz": [i for i, c in enumerate(RAW_COLUMNS) if not c.startswith("v_")],
+    "upper": [i for i, c in enumerate(RAW_COLUMNS) if int(c.split("_")[1]) <= 24],
+}
+
+# Candidate model inputs: (utils.feature_sets schema, column subset). The
+# schema is what the saved artifact records; subsets apply to raw132 only.
+INPUTS = (
+    ("raw132", "all"), ("raw132", "xyz"), ("raw132", "upper"),
+    ("ergo14", "all"), ("raw132+temporal15", "all"), ("ergo14+temporal15", "all"),
+)
+
+CANDIDATES = ("logreg", "logreg_c0.1", "sgd_log", "gnb", "knn5", "rf50")
+
+def make_classifier(name: str):
+    # Built by name so tasks stay picklable and workers import sklearn lazily
+    if name == "logreg":
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(max_iter=500, solver="lbfgs")
+    if name == "logreg_c0.1":
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(C=0.1, max_iter=500, solver="lbfgs")
+    if name == "sgd_log":
+        from sklearn.linear_model import SGDClassifier
+        return SGDClassifier(loss="log_loss", alpha=1e-4, random_state=0)
+    if name == "gnb":
+        from sklearn.naive_bayes import GaussianNB
+        return GaussianNB()
+    if name == "knn5":
+        from sklearn.neighbors import KNeighborsClassifier
+        return KNeighborsClassifier(n_neighbors=5)
+    if name == "rf50":
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(n_estimators=50, max_depth=8, n_jobs=1, random_state=0)
+    raise ValueError(f"Unknown candidate classifier: {name}")
+
+def make_pipeline(clf_name: str, columns: str = "all"):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    steps = []
+    cols = COLUMN_SUBSETS[columns]
+    if len(cols) != len(RAW_COLUMNS):
+        steps.append(("select", ColumnTransformer([("keep", "passthrough", cols)], remainder="drop")))
+    steps += [("scaler", StandardScaler()), ("clf", make_classifier(clf_name))]
+    return Pipeline(steps)
+
+@dataclass
+class CandidateResult:
+    classifier: str
+    feature_set: str             # utils.feature_sets schema
+    columns: str = "all"         # COLUMN_SUBSETS key (raw132 only)
+    balanced_accuracy: float = 0.0
+    accuracy: float = 0.0
+    std: float = 0.0
+    folds: int = 0
+    latency_us: float = 0.0      # median single-frame feature stage + predict() through the runtime predictor
+    runtime: str = ""            # "linear/<feature_set>" (fused matvec, same cost for every subset) or "<classifier>/<feature_set>"
+    fit_s: float = 0.0
+    error: str | None = None
+
+    @property
+    def name(self) -> str:
+        subset = "" if self.columns == "all" else f"[{self.columns}]"
+        return f"{self.classifier}/{self.feature_set}{subset}"
+
+# ---- worker side ----
+
+_STORE = None
+_ARRAYS = {}
+
+def _init_worker(store_root: str):
+    # Each worker maps the store once; tasks only carry names
+    global _STORE
+    _STORE = DatasetStore(store_root)
+    _ARRAYS.clear()
+
+def _arrays(feature_set: str):
+    # -> (X, y, groups) for one schema, built on first use in this worker
+    if feature_set not in _ARRAYS:
+        from utils.training import store_arrays
+        _ARRAYS[feature_set] = store_arrays(_STORE, feature_set)
+    return _ARRAYS[feature_set]
+
+def _single_frame_latency_us(predictor, feature_set: str, raw, repeats: int = 300) -> float:
+    # Consecutive raw frames through the live path: feature stage push(), then predict()
+    stage = build_stage(feature_set)
+    rows = raw[:repeats]
+    times = np.empty(len(rows))
+    for i, r in enumerate(rows):
+        x = r.reshape(1, -1)
+        t0 = time.perf_counter()
+        if stage is not None:
+            x = stage.push(x)
+        predictor.predict(x)
+        times[i] = time.perf_counter() - t0
+    # The first frames warm caches and fill the window
+    return float(np.median(times[min(20, len(times) // 2):]) * 1e6)
+
+def evaluate_candidate(task) -> CandidateResult:
+    from sklearn.metrics import accuracy_score, balanced_accuracy_score
+    from sklearn.model_selection import StratifiedGroupKFold
+
+    clf_name, feature_set, columns, n_splits = task
+    res = CandidateResult(clf_name, feature_set, columns)
+    try:
+        X, y, groups = _arrays(feature_set)
+        bal, acc = [], []
+        t0 = time.perf_counter()
+        cv = StratifiedGroupKFold(n_splits=n_splits, shuffle=True, random_state=42)
+        pipe = None
+        for tr, te in cv.split(X, y, groups):
+            if len(set(y[tr])) < 2:
+                continue
+            pipe = make_pipeline(clf_name, columns).fit(X[tr], y[tr])
+            pred = pipe.predict(X[te])
+            bal.append(balanced_accuracy_score(y[te], pred))
+            acc.append(accuracy_score(y[te], pred))
+        if pipe is None:
+            raise ValueError("no fold had both classes in its training sessions")
+        res.fit_s = (time.perf_counter() - t0) / len(bal)
+        res.balanced_accuracy = float(np.mean(bal))
+        res.std = float(np.std(bal))
+        res.accuracy = float(np.mean(acc))
+        res.folds = len(bal)
+        predictor = as_predictor(pipe)
+        res.runtime = f"{'linear' if isinstance(predictor, LinearPredictor) else clf_name}/{feature_set}"
+        res.latency_us = _single_frame_latency_us(predictor, feature_set, _arrays("raw132")[0])
+    except Exception as e:
+        res.error = str(e)
+    return res
+
+# ---- driver side ----
+
+def grouped_splits(y, groups, max_splits: int = 5) -> int:
+    # Session-grouped CV needs every class in at least two sessions
+    per_class = {}
+    for lab, g in zip(y, groups):
+        per_class.setdefault(lab, set()).add(g)
+    fewest = min(len(s) for s in per_class.values()) if len(per_class) >= 2 else 0
+    if fewest < 2:
+        raise ValueError("Model selection needs at least two sessions of each class (good and bad); "
+                         f"found {', '.join(f'{k}: {len(v)}' for k, v in sorted(per_class.items())) or 'none'}.")
+    return min(max_splits, fewest)
+
+def run_selection(store_root: str, candidates=CANDIDATES, inputs=INPUTS,
+                  max_workers: int | None = None, max_splits: int = 5) -> list:
+    """
+    Evaluates every candidate classifier x input (schema, column subset)
+    with StratifiedGroupKFold by session_id on a process pool.
+    -> list of CandidateResult.
+    """
+    for feature_set, columns in inputs:
+        if columns != "all" and feature_set != "raw132":
+            raise ValueError(f"Column subset {columns!r} needs the raw132 schema, not {feature_set}")
+    _, y, groups = DatasetStore(store_root).load(labeled_only=True)
+    n_splits = grouped_splits(y, groups, max_splits)
+    tasks = [(c, f, cols, n_splits) for c in candidates for f, cols in inputs]
+    workers = max_workers or max(1, min(len(tasks), (os.cpu_count() or 2) - 1))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store_root,)) as pool:
+        return list(pool.map(evaluate_candidate, tasks))
+
+# Latencies this close to the fastest are timing noise, not a real difference
+LATENCY_TIE_REL = 0.25
+LATENCY_TIE_US = 2.0
+
+def runtime_latency_us(results) -> dict:
+    """
+    -> {runtime kind: median latency}. Foldable candidates on one schema
+    compile to the same full-width matvec (subset weights are scattered back
+    to 132 columns), so their individual timings differ only by noise.
+    """
+    kinds = {}
+    for r in results:
+        kinds.setdefault(r.runtime, []).append(r.latency_us)
+    return {k: float(np.median(v)) for k, v in kinds.items()}
+
+def choose(results, target: float):
+    """
+    Fastest runtime meeting the balanced-accuracy target, the most accurate
+    one otherwise. Candidates whose runtime latency is within noise of the
+    fastest are ties, broken by balanced accuracy, then lower fold std.
+    """
+    ok = [r for r in results if r.error is None]
+    if not ok:
+        return None, False
+    latency = runtime_latency_us(ok)
+    meeting = [r for r in ok if r.balanced_accuracy >= target]
+    if meeting:
+        fastest = min(latency[r.runtime] for r in meeting)
+        limit = max(fastest * (1 + LATENCY_TIE_REL), fastest + LATENCY_TIE_US)
+        tied = [r for r in meeting if latency[r.runtime] <= limit]
+        return max(tied, key=lambda r: (r.balanced_accuracy, -r.std, -latency[r.runtime])), True
+    return max(ok, key=lambda r: (r.balanced_accuracy, -r.std, -latency[r.runtime])), False
+
+def format_report(results, chosen, met: bool, target: float) -> str:
+    lines = [f"{'candidate':<36} {'bal.acc':>8} {'+/-':>6} {'acc':>7} {'us/frame':>9} {'fit s':>7}"]
+    for r in sorted(results, key=lambda r: (r.error is not None, -r.balanced_accuracy, r.latency_us)):
+        mark = "*" if r is chosen else " "
+        if r.error:
+            lines.append(f"{mark}{r.name:<35} error: {r.error}")
+        else:
+            lines.append(f"{mark}{r.name:<35} {r.balanced_accuracy:8.4f} {r.std:6.3f} {r.accuracy:7.4f} "
+                         f"{r.latency_us:9.1f} {r.fit_s:7.2f}")
+    if chosen is None:
+        lines.append("No candidate could be evaluated.")
+    elif met:
+        lines.append(f"Chosen: {chosen.name}, most accurate of the fastest runtimes with balanced accuracy >= {target:.2f}")
+    else:
+        lines.append(f"No candidate reached {target:.2f}; chose the most accurate: {chosen.name}")
+    return "\n".join(lines)
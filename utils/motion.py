@@ -0,0 +1,80 @@
+# utils/motion.py
+import time
+import cv2
+
+class MotionGate:
+    """
+    Cheap scene-change detector used to skip pose estimation while the
+    user is still.
+    - Each frame is shrunk to `size` grayscale and compared (mean absolute
+      difference, 0-255 scale) with the last frame that was processed.
+      Comparing against the last *processed* frame means slow drift still
+      adds up and eventually triggers a refresh.
+    - A refresh is forced after `max_skip_s` seconds regardless.
+    note_cost() feeds the measured cost of a processed frame so the gate
+    can report an estimate of the time it saved.
+    """
+
+    def __init__(self, threshold: float = 3.0, size=(64, 36), max_skip_s: float = 1.0, enabled: bool = True):
+        self.threshold = threshold
+        self.size = size
+        self.max_skip_s = max_skip_s
+        self.enabled = enabled
+        self._ref = None
+        self._ref_ts = 0.0
+        self.last_diff = 0.0
+        self.processed = 0
+        self.skipped = 0
+        self._cost_ms = 0.0
+        self._cost_n = 0
+
+    def should_process(self, frame_bgr, now: float | None = None) -> bool:
+        if not self.enabled:
+            self.processed += 1
+            return True
+        now = time.perf_counter() if now is None else now
+        small = cv2.resize(frame_bgr, self.size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        if self._ref is None:
+            self.last_diff = float("inf")
+        else:
+            self.last_diff = float(cv2.absdiff(gray, self._ref).mean())
+        if self.last_diff >= self.threshold or (now - self._ref_ts) >= self.max_skip_s:
+            self._ref = gray
+            self._ref_ts = now
+            self.processed += 1
+            return True
+        self.skipped += 1
+        return False
+
+    def note_cost(self, ms: float):
+        self._cost_ms += ms
+        self._cost_n += 1
+
+    @property
+    def skip_rate(self) -> float:
+        total = self.processed + self.skipped
+        return self.skipped / total if total else 0.0
+
+    @property
+    def saved_ms(self) -> float:
+        # Estimated: skipped frames x mean cost of a processed frame
+        mean = self._cost_ms / self._cost_n if self._cost_n else 0.0
+        return self.skipped * mean
+
+    def summary(self) -> str:
+        return (f"Motion gate: skipped {self.skipped}/{self.processed + self.skipped} frames "
+                f"({self.skip_rate:.0%}), est. {self.saved_ms / 1000.0:.1f}s of pose/classify time saved")
+
+def add_motion_args(parser):
+    parser.add_argument("--no-motion-gate", action="store_true",
+                        help="run pose estimation on every frame")
+    parser.add_argument("--motion-threshold", type=float, default=3.0,
+                        help="mean grayscale difference (0-255) that counts as movement")
+    parser.add_argument("--max-skip-ms", type=float, default=1000.0,
+                        help="force a pose refresh at least this often")
+    return parser
+
+def gate_from_args(args) -> MotionGate:
+    return MotionGate(threshold=args.motion_threshold, max_skip_s=args.max_skip_ms / 1000.0,
+                      enabled=not args.no_motion_gate)
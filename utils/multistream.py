@@ -0,0 +1,254 @@
+# utils/multistream.py
+import multiprocessing as mp
+import os
+import queue
+import time
+from dataclasses import dataclass, field
+
+from utils.metrics import LatencyHistogram
+
+# Pool-related env vars read by OpenCV/BLAS/TFLite when a worker starts
+_THREAD_ENV = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+def mediapipe_pose(model_complexity: int = 1):
+    # Default pose backend: one tracking MediaPipe Pose graph per stream
+    import mediapipe as mp_lib
+    return mp_lib.solutions.pose.Pose(static_image_mode=False, model_complexity=model_complexity,
+                                      smooth_landmarks=True, enable_segmentation=False)
+
+def parse_affinity(spec: str | None, n_workers: int):
+    """
+    -> list of CPU sets, one per worker, or None (no pinning).
+    "auto" splits the CPUs this process may use evenly; "0,1;2,3" is explicit.
+    """
+    if not spec or spec == "none":
+        return None
+    if not hasattr(os, "sched_setaffinity"):
+        raise ValueError("CPU affinity is not supported on this platform")
+    if spec == "auto":
+        cpus = sorted(os.sched_getaffinity(0))
+        per = max(1, len(cpus) // n_workers)
+        return [set(cpus[(i * per) % len(cpus):(i * per) % len(cpus) + per]) for i in range(n_workers)]
+    sets = [{int(c) for c in part.split(",") if c.strip()} for part in spec.split(";")]
+    if any(not s for s in sets):
+        raise ValueError(f"Empty CPU set in affinity spec: {spec}")
+    return [sets[i % len(sets)] for i in range(n_workers)]
+
+@dataclass
+class StreamStats:
+    source: str
+    frames: int = 0
+    posed: int = 0
+    episodes: int = 0
+    alarm_frames: int = 0
+    first_ts: float | None = None
+    last_ts: float | None = None
+    error: str | None = None
+    pose_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def fps(self) -> float:
+        if self.first_ts is None or self.last_ts is None or self.last_ts <= self.first_ts:
+            return 0.0
+        return (self.frames - 1) / (self.last_ts - self.first_ts)
+
+@dataclass
+class MultiStreamReport:
+    streams: list
+    workers: int
+    elapsed_s: float = 0.0
+    classify: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def frames(self) -> int:
+        return sum(s.frames for s in self.streams)
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def format_lines(self):
+        lines = [f"{len(self.streams)} stream(s) on {self.workers} worker(s): {self.frames} frames in "
+                 f"{self.elapsed_s:.1f}s -> {self.fps:.1f} frames/s aggregate",
+                 f"  classify+decide (parent): p50 {self.classify.percentile(50):.2f} ms, "
+                 f"p95 {self.classify.percentile(95):.2f} ms"]
+        for i, s in enumerate(self.streams):
+            if s.error:
+                lines.append(f"  [{i}] {s.source}: error: {s.error}")
+                continue
+            lines.append(f"  [{i}] {s.source}: {s.frames} frames, {s.fps:.1f} fps, pose found {s.posed}, "
+                         f"pose p50 {s.pose_ms.percentile(50):.1f} ms / p95 {s.pose_ms.percentile(95):.1f} ms, "
+                         f"episodes {s.episodes}, alarm frames {s.alarm_frames}")
+        return lines
+
+# ---- worker side ----
+
+def _pin_worker(threads: int | None, cpus):
+    if threads:
+        for var in _THREAD_ENV:
+            os.environ[var] = str(threads)
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+    import cv2
+    if threads:
+        cv2.setNumThreads(threads)
+
+def _worker_main(streams, out_q, stop, threads, cpus, realtime, loop,
+                 pose_factory, model_complexity):
+    """
+    Reads and pose-estimates its streams round-robin. Sends
+    ("frame", stream, ts_ms, X or None, pose_ms) per frame and
+    ("done", stream, error) when a stream ends; the parent does the rest.
+    """
+    _pin_worker(threads, cpus)
+    import cv2
+    from utils.frame_sources import open_source
+    from utils.feature_vector import LandmarkVectorizer
+
+    live = {}
+    for sid, spec in streams:
+        try:
+            cap = open_source(spec, realtime=realtime, loop=loop)
+            live[sid] = (cap, pose_factory(model_complexity), LandmarkVectorizer(), [0])
+        except Exception as e:
+            out_q.put(("done", sid, str(e)))
+
+    while live and not stop.is_set():
+        for sid in list(live):
+            cap, pose, vectorizer, idx = live[sid]
+            try:
+                ok, frame = cap.read()
+                if ok:
+                    # Recorded footage is stamped with video time so replays are deterministic
+                    ts_ms = int(time.time() * 1000) if cap.is_live else int(idx[0] * 1000.0 / (cap.fps or 30.0))
+                    idx[0] += 1
+                    t0 = time.perf_counter()
+                    res = pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                    pose_ms = (time.perf_counter() - t0) * 1000.0
+                    X = vectorizer.fill(res.pose_landmarks.landmark).copy() if res.pose_landmarks else None
+                    out_q.put(("frame", sid, ts_ms, X, pose_ms))
+                    continue
+                err = None
+            except Exception as e:
+                err = str(e)
+            cap.release()
+            pose.close()
+            del live[sid]
+            out_q.put(("done", sid, err))
+    for sid, (cap, pose, _, _) in live.items():
+        cap.release()
+        pose.close()
+        out_q.put(("done", sid, None))
+
+# ---- parent side ----
+
+class MultiStreamRunner:
+    """
+    N frame sources -> pose estimation on a pool of worker processes ->
+    one shared classifier in the parent -> one PostureStack per stream.
+    - Streams are spread round-robin over `workers` processes (default:
+      one per stream, capped at the CPU count). Each stream keeps its own
+      Pose graph, since MediaPipe tracks across frames.
+    - Workers ship only (1, 132) landmark vectors, so the model is loaded
+      once and vote history, smoothing and episodes stay per stream.
+    - threads_per_worker caps OpenCV/BLAS pools in each worker; affinity is
+      a parse_affinity() spec or a list of CPU sets to pin workers to.
+    make_stack(stream_index, source) builds each stream's PostureStack.
+    """
+
+    def __init__(self, sources, make_stack, workers: int | None = None, threads_per_worker: int | None = 1,
+                 affinity=None, realtime: bool = False, loop: bool = False,
+                 pose_factory=mediapipe_pose, model_complexity: int = 1, queue_size: int = 64):
+        self.sources = [str(s) for s in sources]
+        if not self.sources:
+            raise ValueError("No frame sources given.")
+        self.make_stack = make_stack
+        default = min(len(self.sources), os.cpu_count() or 1)
+        self.workers = max(1, min(workers or default, len(self.sources)))
+        self.threads_per_worker = threads_per_worker
+        self.affinity = parse_affinity(affinity, self.workers) if isinstance(affinity, str) else affinity
+        self.realtime = realtime
+        self.loop = loop
+        self.pose_factory = pose_factory
+        self.model_complexity = model_complexity
+        self.queue_size = queue_size
+
+    def run(self, on_decision=None, duration_s: float | None = None) -> MultiStreamReport:
+        """
+        Runs until every stream ends (or duration_s passes / KeyboardInterrupt).
+        on_decision(stream_index, FrameDecision) is called in the parent.
+        """
+        ctx = mp.get_context("spawn")
+        out_q = ctx.Queue(maxsize=self.queue_size)
+        stop = ctx.Event()
+        report = MultiStreamReport([StreamStats(s) for s in self.sources], self.workers)
+        stacks = [self.make_stack(i, s) for i, s in enumerate(self.sources)]
+
+        assignment = [[] for _ in range(self.workers)]
+        for i, s in enumerate(self.sources):
+            assignment[i % self.workers].append((i, s))
+        procs = []
+        for w, streams in enumerate(assignment):
+            cpus = self.affinity[w % len(self.affinity)] if self.affinity else None
+            p = ctx.Process(target=_worker_main, name=f"pose-worker-{w}", daemon=True,
+                            args=(streams, out_q, stop, self.threads_per_worker, cpus, self.realtime,
+                                  self.loop, self.pose_factory, self.model_complexity))
+            p.start()
+            procs.append(p)
+
+        open_streams = set(range(len(self.sources)))
+        t_start = time.perf_counter()
+        try:
+            while open_streams:
+                if duration_s is not None and time.perf_counter() - t_start >= duration_s:
+                    break
+                try:
+                    msg = out_q.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in procs):
+                        for sid in open_streams:
+                            report.streams[sid].error = "pose worker exited"
+                        break
+                    continue
+                if msg[0] == "done":
+                    _, sid, err = msg
+                    report.streams[sid].error = err
+                    open_streams.discard(sid)
+                    continue
+
+                _, sid, ts_ms, X, pose_ms = msg
+                st = report.streams[sid]
+                now = time.perf_counter()
+                t0 = now
+                d = stacks[sid].step(X, ts_ms)
+                report.classify.record((time.perf_counter() - t0) * 1000.0)
+                if st.first_ts is None:
+                    st.first_ts = now
+                st.last_ts = now
+                st.frames += 1
+                st.posed += X is not None
+                st.pose_ms.record(pose_ms)
+                st.alarm_frames += d.alarm
+                st.episodes += d.episode is not None
+                if on_decision is not None:
+                    on_decision(sid, d)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop.set()
+            # Drain so workers blocked on a full queue can see the stop flag
+            deadline = time.perf_counter() + 5.0
+            while any(p.is_alive() for p in procs) and time.perf_counter() < deadline:
+                try:
+                    out_q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            for p in procs:
+                p.join(timeout=1.0)
+                if p.is_alive():
+                    p.terminate()
+            for i, stack in enumerate(stacks):
+                if stack.close() is not None:
+                    report.streams[i].episodes += 1
+        report.elapsed_s = time.perf_counter() - t_start
+        return report
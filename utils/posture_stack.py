@@ -0,0 +1,117 @@
+# utils/posture_stack.py
+from dataclasses import dataclass
+
+from utils.decision import StreamingDecision, GOOD_LABEL, BAD_LABEL
+from utils.episodes import Episode, EpisodeTracker
+from utils.metrics import StageMetrics
+
+# Decision settings shared by every detector (live, classic, multi-stream, replay)
+PRED_WINDOW = 8  # majority-vote window (frames)
+SMOOTH_ALPHA = 0.6  # EMA weight of the previous smoothed good probability
+EPISODE_ENTER_FRAMES = 5  # consecutive bad votes to open an episode
+EPISODE_EXIT_FRAMES = 10  # consecutive non-bad frames to close it
+EPISODE_MIN_DURATION_S = 2.0  # shorter episodes are not logged
+
+def default_episodes() -> EpisodeTracker:
+    return EpisodeTracker(BAD_LABEL, enter_frames=EPISODE_ENTER_FRAMES, exit_frames=EPISODE_EXIT_FRAMES,
+                          min_duration_s=EPISODE_MIN_DURATION_S)
+
+@dataclass
+class FrameDecision:
+    ts_ms: int
+    pred: str | None            # raw per-frame classifier label
+    prob_good: float | None     # raw per-frame probability of "good"
+    voted: str | None           # majority vote over the last N predictions
+    smoothed_good: float        # EMA of prob_good
+    alarm: bool                 # a bad-posture episode is open
+    episode: Episode | None     # episode that closed on this frame
+
+class PostureStack:
+    """
+    Everything after pose estimation: classify the feature vector, majority
+    vote, EMA smoothing, episode tracking, alarm and episode logging.
+    Shared by the live detector and the landmark replay engine, so offline
+    replays exercise the exact same decision path.
+    Vote and EMA live in utils.decision.StreamingDecision. With
+    `bad_below`/`good_above` episodes follow its probability hysteresis
+    instead of the voted label.
+    `features` is the model's feature stage (utils.feature_sets); when it
+    is windowed the model already sees the last N frames, so the majority
+    vote is skipped (voted = pred).
+    """
+
+    def __init__(self, predictor, pred_window: int = PRED_WINDOW, smooth_alpha: float = SMOOTH_ALPHA,
+                 episodes: EpisodeTracker | None = None, alarm=None, on_episode=None,
+                 metrics: StageMetrics | None = None, features=None,
+                 bad_below: float | None = None, good_above: float | None = None):
+        self.predictor = predictor
+        self.features = features
+        self.metrics = metrics if metrics is not None else StageMetrics(enabled=False)
+        self.decision = StreamingDecision(getattr(predictor, "classes", ()) or (BAD_LABEL, GOOD_LABEL),
+                                          window=pred_window, alpha=smooth_alpha,
+                                          vote=not getattr(features, "windowed", False),
+                                          bad_below=bad_below, good_above=good_above)
+        self.episodes = episodes if episodes is not None else default_episodes()
+        self.alarm = alarm
+        self.on_episode = on_episode
+        self.last = None
+
+    @property
+    def smoothed_good(self) -> float:
+        return self.decision.smoothed_good
+
+    def step(self, X, ts_ms: int) -> FrameDecision:
+        # X: (1, n_features) vector, or None when no pose was found
+        m = self.metrics
+        pred = prob_good = voted = None
+        if X is not None:
+            if self.features is not None:
+                with m.time("features"):
+                    X = self.features.push(X, ts_ms)
+            with m.time("predict"):
+                pred, prob_good = self.predictor.predict(X)
+        if pred is not None:
+            pred = str(pred).lower()
+            with m.time("vote"):
+                voted = self.decision.update(pred, prob_good)
+        else:
+            # No pose, or no prediction (e.g. utils.inference_service.RemotePredictor while reconnecting)
+            self.decision.update(None)
+
+        # Only whole episodes are logged; the alarm repeats while one is open
+        with m.time("episode"):
+            ep = self.episodes.update(voted, self.smoothed_good if prob_good is not None else None, ts_ms,
+                                      is_bad=self.decision.evidence)
+            active = self.episodes.active
+            if active and self.alarm is not None:
+                self.alarm.trigger()
+        if ep is not None and self.on_episode is not None:
+            with m.time("log"):
+                self.on_episode(ep)
+        self.last = FrameDecision(ts_ms, pred, prob_good, voted, self.smoothed_good, active, ep)
+        return self.last
+
+    def repeat_last(self, ts_ms: int) -> FrameDecision:
+        """
+        Re-uses the previous decision for a frame whose pose estimation was
+        skipped (utils.motion.MotionGate): no classifier call and no new vote,
+        but episode timing and the alarm keep advancing.
+        """
+        if self.last is None:
+            return self.step(None, ts_ms)
+        prev = self.last
+        ep = self.episodes.update(prev.voted, self.smoothed_good if prev.prob_good is not None else None, ts_ms,
+                                  is_bad=self.decision.evidence)
+        active = self.episodes.active
+        if active and self.alarm is not None:
+            self.alarm.trigger()
+        if ep is not None and self.on_episode is not None:
+            self.on_episode(ep)
+        self.last = FrameDecision(ts_ms, prev.pred, prev.prob_good, prev.voted, self.smoothed_good, active, ep)
+        return self.last
+
+    def close(self) -> Episode | None:
+        ep = self.episodes.close()
+        if ep is not None and self.on_episode is not None:
+            self.on_episode(ep)
+        return ep
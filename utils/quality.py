@@ -0,0 +1,134 @@
+# utils/quality.py
+from dataclasses import dataclass
+import cv2
+
+@dataclass(frozen=True)
+class QualityLevel:
+    width: int | None          # inference width (aspect kept); None = native frame size
+    model_complexity: int      # MediaPipe Pose: 0 lite, 1 full, 2 heavy
+
+    def describe(self) -> str:
+        size = "native" if self.width is None else f"{self.width}w"
+        return f"{size} c{self.model_complexity}"
+
+# Highest quality first; each step roughly trades accuracy for speed
+DEFAULT_LADDER = (
+    QualityLevel(None, 1),
+    QualityLevel(960, 1),
+    QualityLevel(640, 1),
+    QualityLevel(640, 0),
+    QualityLevel(480, 0),
+    QualityLevel(320, 0),
+)
+
+def find_level(ladder, width, model_complexity) -> int:
+    for i, q in enumerate(ladder):
+        if (q.width, q.model_complexity) == (width, model_complexity):
+            return i
+    raise ValueError(f"No ladder level {width}w c{model_complexity}")
+
+class QualityController:
+    """
+    Moves along the quality ladder to keep pose latency within `target_ms`.
+    - Step down (cheaper) when the latency EMA stays above the target for
+      `down_after` frames.
+    - Step up only when it stays below `up_margin * target_ms` for
+      `up_after` frames; the gap between the two thresholds and the longer
+      dwell are the hysteresis that prevents oscillation.
+    - After any switch the EMA restarts and `settle_frames` frames are
+      ignored (the first frames at a new complexity are slow).
+    """
+
+    def __init__(self, target_ms: float, ladder=DEFAULT_LADDER, start_level: int = 0,
+                 down_after: int = 15, up_after: int = 90, up_margin: float = 0.6,
+                 alpha: float = 0.2, settle_frames: int = 10, enabled: bool = True):
+        self.ladder = tuple(ladder)
+        self.target_ms = target_ms
+        self.level = max(0, min(start_level, len(self.ladder) - 1))
+        self.down_after = down_after
+        self.up_after = up_after
+        self.up_margin = up_margin
+        self.alpha = alpha
+        self.settle_frames = settle_frames
+        self.enabled = enabled
+        self.switches = 0
+        self._reset()
+
+    @property
+    def current(self) -> QualityLevel:
+        return self.ladder[self.level]
+
+    def _reset(self):
+        self.ema_ms = None
+        self._over = 0
+        self._under = 0
+        self._settle = self.settle_frames
+
+    def observe(self, pose_ms: float) -> bool:
+        # Feed one pose latency sample; returns True if the level changed
+        if not self.enabled:
+            return False
+        if self._settle > 0:
+            self._settle -= 1
+            return False
+        self.ema_ms = pose_ms if self.ema_ms is None else self.alpha * pose_ms + (1 - self.alpha) * self.ema_ms
+
+        if self.ema_ms > self.target_ms:
+            self._over += 1
+            self._under = 0
+        elif self.ema_ms < self.up_margin * self.target_ms:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.down_after and self.level < len(self.ladder) - 1:
+            return self._switch(self.level + 1)
+        if self._under >= self.up_after and self.level > 0:
+            return self._switch(self.level - 1)
+        return False
+
+    def _switch(self, level: int) -> bool:
+        self.level = level
+        self.switches += 1
+        self._reset()
+        return True
+
+    def prepare(self, frame_bgr):
+        # Resize to the level's width (aspect kept, never upscale) and convert to RGB
+        q = self.current
+        h, w = frame_bgr.shape[:2]
+        if q.width is not None and q.width < w:
+            size = (q.width, max(1, round(h * q.width / w)))
+            frame_bgr = cv2.resize(frame_bgr, size, interpolation=cv2.INTER_LINEAR)
+        return cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+
+class PosePool:
+    """
+    One MediaPipe Pose graph per model_complexity, created on first use,
+    so the controller can switch complexity without rebuilding graphs.
+    """
+
+    def __init__(self, mp_pose, **pose_kwargs):
+        self.mp_pose = mp_pose
+        self.pose_kwargs = pose_kwargs
+        self._graphs = {}
+
+    def get(self, model_complexity: int):
+        pose = self._graphs.get(model_complexity)
+        if pose is None:
+            pose = self.mp_pose.Pose(model_complexity=model_complexity, **self.pose_kwargs)
+            self._graphs[model_complexity] = pose
+        return pose
+
+    def close(self):
+        for pose in self._graphs.values():
+            pose.close()
+        self._graphs.clear()
+
+def add_quality_args(parser, default_budget_ms: float = 33.0):
+    parser.add_argument("--frame-budget-ms", type=float, default=default_budget_ms,
+                        help="target pose-estimation latency per frame")
+    parser.add_argument("--fixed-quality", action="store_true",
+                        help="disable the adaptive quality ladder")
+    return parser
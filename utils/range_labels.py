@@ -0,0 +1,184 @@
+# utils/range_labels.py
+import json
+import os
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+UNLABELED = ""
+
+@dataclass(frozen=True)
+class RangeIssue:
+    kind: str           # "overlap" (same label, merged) or "conflict" (different labels)
+    session_id: int
+    first: tuple        # (start_ms, end_ms, label)
+    second: tuple
+
+    def describe(self) -> str:
+        a, b = self.first, self.second
+        return (f"session {self.session_id}: {self.kind} between {a[2]} [{a[0]}, {a[1]}] "
+                f"and {b[2]} [{b[0]}, {b[1]}]")
+
+def read_ranges(path: str) -> pd.DataFrame:
+    """
+    Ranges file -> DataFrame(session_id, start_ms, end_ms, label); bounds are inclusive.
+    - .csv:  session_id,start_ms,end_ms,label
+    - .json: {"good": {"<session_id>": [[start_ms, end_ms], ...]}, "bad": {...}}
+      (the layout of the old GOOD_RANGES / BAD_RANGES dicts)
+    """
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            data = json.load(f)
+        return ranges_from_dicts(data)
+    df = pd.read_csv(path, comment="#", skipinitialspace=True)
+    missing = {"session_id", "start_ms", "end_ms", "label"} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path}: missing columns {sorted(missing)}")
+    return _normalize(df)
+
+def ranges_from_dicts(by_label: dict) -> pd.DataFrame:
+    # {"good": {sid: [(a, b), ...]}, "bad": {...}} -> ranges DataFrame
+    rows = [(int(sid), a, b, label)
+            for label, by_sid in by_label.items()
+            for sid, spans in (by_sid or {}).items()
+            for a, b in spans]
+    return _normalize(pd.DataFrame(rows, columns=["session_id", "start_ms", "end_ms", "label"]))
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    df = df[["session_id", "start_ms", "end_ms", "label"]].copy()
+    for c in ("session_id", "start_ms", "end_ms"):
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    if df[["session_id", "start_ms", "end_ms"]].isna().any().any():
+        raise ValueError("Ranges contain non-numeric session_id/start_ms/end_ms.")
+    df = df.astype({"session_id": np.int64, "start_ms": np.int64, "end_ms": np.int64})
+    df["label"] = df["label"].astype(str).str.strip().str.lower()
+    bad = df[df["end_ms"] < df["start_ms"]]
+    if not bad.empty:
+        r = bad.iloc[0]
+        raise ValueError(f"Range ends before it starts: session {r.session_id} [{r.start_ms}, {r.end_ms}]")
+    return df.sort_values(["session_id", "start_ms", "end_ms"], kind="stable").reset_index(drop=True)
+
+def _merge(starts, ends):
+    # Sorted inclusive intervals -> disjoint ones (touching/overlapping merged)
+    out_s, out_e = [int(starts[0])], [int(ends[0])]
+    for a, b in zip(starts[1:], ends[1:]):
+        if a <= out_e[-1]:
+            out_e[-1] = max(out_e[-1], int(b))
+        else:
+            out_s.append(int(a))
+            out_e.append(int(b))
+    return np.array(out_s, dtype=np.int64), np.array(out_e, dtype=np.int64)
+
+class RangeLabeler:
+    """
+    Labels (session_id, timestamp_ms) rows from inclusive time ranges.
+    Ranges are sorted and merged per session and label once; labeling a
+    chunk is then one np.searchsorted per (session, label), so cost grows
+    with rows * log(ranges) instead of rows * ranges.
+    Overlapping ranges with the same label are merged (reported as
+    "overlap"). Different labels overlapping are "conflict"s: an error by
+    default, or on_conflict="unlabel" leaves the rows they share unlabeled.
+    """
+
+    def __init__(self, ranges: pd.DataFrame, on_conflict: str = "error"):
+        if on_conflict not in ("error", "unlabel"):
+            raise ValueError("on_conflict must be 'error' or 'unlabel'")
+        self.on_conflict = on_conflict
+        self.labels = sorted(ranges["label"].unique())
+        self.issues = self._find_issues(ranges)
+        conflicts = [i for i in self.issues if i.kind == "conflict"]
+        if conflicts and on_conflict == "error":
+            more = f" (+{len(conflicts) - 1} more)" if len(conflicts) > 1 else ""
+            raise ValueError("Conflicting ranges: " + conflicts[0].describe() + more)
+
+        # {session_id: [(label_idx, starts, ends), ...]}
+        self._index = {}
+        for (sid, label), g in ranges.groupby(["session_id", "label"], sort=True):
+            s, e = _merge(g["start_ms"].to_numpy(), g["end_ms"].to_numpy())
+            self._index.setdefault(int(sid), []).append((self.labels.index(label), s, e))
+
+    @staticmethod
+    def _find_issues(ranges: pd.DataFrame) -> list:
+        # Sweep per session: compare each range with the furthest-reaching earlier range per label
+        issues = []
+        for sid, g in ranges.groupby("session_id", sort=True):
+            reach = {}   # label -> (start, end, label) with the largest end so far
+            for a, b, lab in zip(g["start_ms"].to_numpy(), g["end_ms"].to_numpy(), g["label"].to_numpy()):
+                cur = (int(a), int(b), lab)
+                for other_lab, prev in reach.items():
+                    if prev[1] >= a:
+                        kind = "overlap" if other_lab == lab else "conflict"
+                        issues.append(RangeIssue(kind, int(sid), prev, cur))
+                if lab not in reach or b > reach[lab][1]:
+                    reach[lab] = cur
+        return issues
+
+    def label_codes(self, session_ids, timestamps_ms) -> np.ndarray:
+        # -> int8 index into self.labels per row, -1 = unlabeled
+        sids = np.asarray(session_ids, dtype=np.int64)
+        ts = np.asarray(timestamps_ms, dtype=np.int64)
+        out = np.full(len(ts), -1, dtype=np.int8)
+        hits = np.zeros(len(ts), dtype=np.int8)
+        # One stable sort groups rows by session (input is usually already grouped)
+        order = np.argsort(sids, kind="stable")
+        sorted_sids = sids[order]
+        cuts = np.flatnonzero(sorted_sids[1:] != sorted_sids[:-1]) + 1
+        for a, b in zip(np.r_[0, cuts], np.r_[cuts, len(sids)]):
+            if a == b:
+                continue
+            spans = self._index.get(int(sorted_sids[a]))
+            if not spans:
+                continue
+            rows = order[a:b]
+            t = ts[rows]
+            for k, starts, ends in spans:
+                i = np.searchsorted(starts, t, side="right") - 1
+                inside = (i >= 0) & (t <= ends[np.maximum(i, 0)])
+                out[rows[inside]] = k
+                hits[rows[inside]] += 1
+        if self.on_conflict == "unlabel":
+            out[hits > 1] = -1
+        return out
+
+    def label(self, session_ids, timestamps_ms) -> np.ndarray:
+        # -> str labels, "" for unlabeled rows
+        names = np.array(self.labels + [UNLABELED], dtype=object)
+        return names[self.label_codes(session_ids, timestamps_ms)]
+
+def label_csv(in_path: str, out_path: str, labeler: RangeLabeler, chunk_rows: int = 100_000,
+              keep_unlabeled: bool = False) -> dict:
+    """
+    Streams in_path in chunks, adds a label column and writes labeled rows
+    (or all rows with keep_unlabeled) to out_path. -> counts per label.
+    """
+    header = pd.read_csv(in_path, nrows=0).columns
+    missing = [c for c in ("session_id", "timestamp_ms") if c not in header]
+    if missing:
+        raise ValueError(f"Missing required columns in {in_path}: {missing}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp = out_path + ".tmp"
+    counts = {lab: 0 for lab in labeler.labels}
+    counts[UNLABELED] = 0
+    names = np.array(labeler.labels + [UNLABELED], dtype=object)
+    first = True
+    for chunk in pd.read_csv(in_path, chunksize=chunk_rows):
+        sid = pd.to_numeric(chunk["session_id"], errors="coerce")
+        ts = pd.to_numeric(chunk["timestamp_ms"], errors="coerce")
+        if sid.isna().any() or ts.isna().any():
+            raise ValueError("Found non-numeric session_id or timestamp_ms; please fix the input CSV.")
+        codes = labeler.label_codes(sid.to_numpy(), ts.to_numpy())
+        for k, n in zip(*np.unique(codes, return_counts=True)):
+            counts[labeler.labels[k] if k >= 0 else UNLABELED] += int(n)
+
+        if not keep_unlabeled:
+            keep = codes >= 0
+            chunk, codes = chunk.loc[keep], codes[keep]
+        chunk = chunk.copy()
+        chunk["label"] = names[codes]
+        chunk.to_csv(tmp, mode="w" if first else "a", header=first, index=False)
+        first = False
+    if first:
+        raise ValueError(f"{in_path} has no rows.")
+    os.replace(tmp, out_path)
+    return counts
@@ -0,0 +1,100 @@
+# utils/replay.py
+import os
+import time
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+from utils.feature_vector import build_columns
+
+FEATURE_COLS = build_columns()[2:]
+
+@dataclass
+class ReplayStats:
+    frames: int = 0
+    sessions: int = 0
+    episodes: int = 0
+    alarm_frames: int = 0
+    labeled_frames: int = 0
+    agree_frames: int = 0
+    elapsed_s: float = 0.0
+    per_source: dict = field(default_factory=dict)
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def vote_accuracy(self) -> float | None:
+        return self.agree_frames / self.labeled_frames if self.labeled_frames else None
+
+    def summary(self) -> str:
+        lines = [
+            f"Frames: {self.frames} in {self.sessions} session(s), {self.elapsed_s:.3f}s "
+            f"-> {self.fps:,.0f} frames/s ({1e6 / self.fps if self.fps else 0:.1f} us/frame)",
+            f"Episodes: {self.episodes}, alarm frames: {self.alarm_frames}",
+        ]
+        if self.vote_accuracy is not None:
+            lines.append(f"Voted label agrees with expected label on {self.vote_accuracy:.2%} of {self.labeled_frames} frames")
+        return "\n".join(lines)
+
+def label_from_filename(path: str) -> str | None:
+    # data/sessions/good_pose_20250812_2152.csv -> "good"
+    head = os.path.basename(path).split("_pose", 1)[0].lower()
+    return head if head in ("good", "bad") else None
+
+def iter_landmark_chunks(csv_path: str, chunk_rows: int = 5000):
+    """
+    Yields (session_ids, timestamps_ms, X float32 (n, 132), labels or None)
+    per chunk, reading only the columns the decision path needs.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    missing = [c for c in FEATURE_COLS if c not in header]
+    if missing:
+        raise ValueError(f"{csv_path}: missing landmark columns, e.g. {missing[:3]}")
+    usecols = ["session_id", "timestamp_ms"] + FEATURE_COLS + (["label"] if "label" in header else [])
+    dtypes = {c: np.float32 for c in FEATURE_COLS}
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=dtypes, chunksize=chunk_rows):
+        X = chunk[FEATURE_COLS].fillna(0.0).to_numpy(dtype=np.float32)
+        labels = chunk["label"].astype(str).str.lower().to_numpy() if "label" in chunk else None
+        yield (chunk["session_id"].to_numpy(), chunk["timestamp_ms"].to_numpy(dtype=np.int64), X, labels)
+
+def replay_sessions(csv_paths, make_stack, on_decision=None, chunk_rows: int = 5000) -> ReplayStats:
+    """
+    Streams recorded landmark rows through PostureStack.step(), one frame at
+    a time exactly like the live loop, without MediaPipe or a camera.
+    make_stack() is called once per (file, session_id) so vote history and
+    smoothing never leak between sessions.
+    on_decision(source, session_id, expected_label, decision) sees every frame.
+    """
+    stats = ReplayStats()
+    t0 = time.perf_counter()
+    for path in csv_paths:
+        file_label = label_from_filename(path)
+        src = os.path.basename(path)
+        src_frames = 0
+        stack, current_sid = None, None
+        for sids, ts, X, labels in iter_landmark_chunks(path, chunk_rows):
+            for i in range(X.shape[0]):
+                sid = sids[i]
+                if stack is None or sid != current_sid:
+                    if stack is not None and stack.close() is not None:
+                        stats.episodes += 1
+                    stack, current_sid = make_stack(), sid
+                    stats.sessions += 1
+                d = stack.step(X[i:i + 1], int(ts[i]))
+                expected = labels[i] if labels is not None else file_label
+                stats.frames += 1
+                src_frames += 1
+                stats.alarm_frames += d.alarm
+                stats.episodes += d.episode is not None
+                if expected in ("good", "bad"):
+                    stats.labeled_frames += 1
+                    stats.agree_frames += d.voted == expected
+                if on_decision is not None:
+                    on_decision(src, sid, expected, d)
+        if stack is not None and stack.close() is not None:
+            stats.episodes += 1
+        stats.per_source[src] = src_frames
+    stats.elapsed_s = time.perf_counter() - t0
+    return stats
@@ -1,6 +1,7 @@
 # utils/sound.py
 import sys
 import threading
+import time
 
 try:
     import simpleaudio as sa
@@ -12,19 +13,81 @@ def _beep_terminal():
     sys.stdout.write("\a")
     sys.stdout.flush()
 
-def beep(sound_file: str | None = None):
+class AlarmPlayer:
     """
-    Non-blocking beep.
-    - If simpleaudio is available and a WAV path is provided, plays it.
-    - Else falls back to terminal bell.
+    Plays the alarm on one long-lived worker thread.
+    - The WAV file is decoded once, in the constructor.
+    - trigger() only sets an event, so it is cheap to call every frame.
+    - Triggers that arrive while a beep is playing or during the cooldown
+      are merged into the current beep.
     """
-    def _play():
+
+    def __init__(self, sound_file: str | None = None, cooldown_s: float = 1.0):
+        self.cooldown_s = cooldown_s
+        self.wave_obj = None
+        if HAVE_SIMPLEAUDIO and sound_file:
+            try:
+                self.wave_obj = sa.WaveObject.from_wave_file(sound_file)
+            except Exception:
+                self.wave_obj = None
+        self.played = 0
+        self.coalesced = 0
+        self._pending = threading.Event()
+        self._busy = False
+        self._stop = False
+        self._thread = threading.Thread(target=self._worker, name="alarm-player", daemon=True)
+        self._thread.start()
+
+    def trigger(self):
+        if self._busy or self._pending.is_set():
+            self.coalesced += 1
+            return
+        self._pending.set()
+
+    def close(self):
+        self._stop = True
+        self._pending.set()
+        self._thread.join(timeout=1.0)
+
+    def _play_once(self):
         try:
-            if HAVE_SIMPLEAUDIO and sound_file:
-                wave_obj = sa.WaveObject.from_wave_file(sound_file)
-                wave_obj.play()
+            if self.wave_obj is not None:
+                self.wave_obj.play().wait_done()
             else:
                 _beep_terminal()
         except Exception:
             _beep_terminal()
-    threading.Thread(target=_play, daemon=True).start()
+
+    def _worker(self):
+        while True:
+            self._pending.wait()
+            if self._stop:
+                return
+            self._busy = True
+            self._pending.clear()
+            self._play_once()
+            self.played += 1
+            if self.cooldown_s > 0:
+                time.sleep(self.cooldown_s)
+            self._busy = False
+
+_players = {}
+_players_lock = threading.Lock()
+
+def get_player(sound_file: str | None = None, cooldown_s: float = 1.0) -> AlarmPlayer:
+    # One shared player per sound file
+    with _players_lock:
+        player = _players.get(sound_file)
+        if player is None:
+            player = AlarmPlayer(sound_file, cooldown_s=cooldown_s)
+            _players[sound_file] = player
+        return player
+
+def beep(sound_file: str | None = None):
+    """
+    Non-blocking beep.
+    - If simpleaudio is available and a WAV path is provided, plays it.
+    - Else falls back to terminal bell.
+    Routed through a shared AlarmPlayer, so repeated calls are coalesced.
+    """
+    get_player(sound_file).trigger()
@@ -0,0 +1,103 @@
+# utils/temporal.py
+import numpy as np
+
+from utils.feature_vector import NUM_FEATURES, build_columns
+
+def temporal_columns(base=None) -> list:
+    base = list(base) if base is not None else build_columns()[2:]
+    return base + [f"{p}_{c}" for p in ("mean", "var", "vel") for c in base]
+
+class TemporalFeatures:
+    """
+    Sliding window over the last `window` landmark vectors in a fixed NumPy
+    ring buffer. push() appends one frame and returns
+        [x, mean, var, velocity]      shape (1, 4 * n_base)
+    per raw value, where velocity is (newest - oldest) / elapsed seconds
+    over the window, from the frame timestamps (at `fps` when none are
+    given), so capture and live runs at different frame rates see the same
+    scale. Running sums make each update O(n_base) regardless of the
+    window; they are re-derived from the buffer every `resync_every` frames
+    so float drift cannot accumulate.
+    The same push() builds training features (transform()), so training
+    and live inference see bit-identical inputs.
+    A gap longer than `max_gap_ms` between frames restarts the window. It
+    is well above the motion gate's forced refresh (--max-skip-ms, 1 s), so
+    a still user whose frames are only processed once a second keeps a
+    full window.
+    """
+
+    def __init__(self, window: int = 15, n_base: int = NUM_FEATURES, max_gap_ms: int = 3000,
+                 resync_every: int = 1024, fps: float = 30.0):
+        if window < 2:
+            raise ValueError("window must be at least 2 frames")
+        self.window = window
+        self.n_base = n_base
+        self.max_gap_ms = max_gap_ms
+        self.resync_every = resync_every
+        self.frame_ms = 1000.0 / fps
+        self.n_features = 4 * n_base
+        self._buf = np.zeros((window, n_base), dtype=np.float64)
+        self._ts = np.zeros(window, dtype=np.float64)
+        self._sum = np.zeros(n_base, dtype=np.float64)
+        self._sumsq = np.zeros(n_base, dtype=np.float64)
+        self._out = np.zeros((1, self.n_features), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self._head = 0          # slot the next frame goes to
+        self._count = 0
+        self._pushes = 0
+        self._last_ts = None
+        self._sum.fill(0.0)
+        self._sumsq.fill(0.0)
+
+    def push(self, x, ts_ms: int | None = None) -> np.ndarray:
+        # x: (n_base,) or (1, n_base). Returns the reused (1, 4 * n_base) buffer.
+        if ts_ms is not None:
+            if self._last_ts is not None and ts_ms - self._last_ts > self.max_gap_ms:
+                self.reset()
+        else:
+            ts_ms = 0.0 if self._last_ts is None else self._last_ts + self.frame_ms
+        self._last_ts = ts_ms
+        x = np.asarray(x, dtype=np.float64).reshape(-1)
+
+        slot = self._buf[self._head]
+        if self._count == self.window:
+            self._sum -= slot
+            self._sumsq -= slot * slot
+        else:
+            self._count += 1
+        slot[:] = x
+        self._ts[self._head] = ts_ms
+        self._sum += x
+        self._sumsq += x * x
+        self._head = (self._head + 1) % self.window
+        self._pushes += 1
+        if self._pushes % self.resync_every == 0:
+            live = self._buf if self._count == self.window else self._buf[:self._count]
+            self._sum[:] = live.sum(axis=0)
+            self._sumsq[:] = (live * live).sum(axis=0)
+
+        n = self._count
+        mean = self._sum / n
+        var = np.maximum(self._sumsq / n - mean * mean, 0.0)
+        first = self._head if n == self.window else 0
+        dt_s = (ts_ms - self._ts[first]) / 1000.0
+        vel = (x - self._buf[first]) / dt_s if n > 1 and dt_s > 0 else np.zeros_like(x)
+
+        out = self._out[0]
+        k = self.n_base
+        out[:k] = x
+        out[k:2 * k] = mean
+        out[2 * k:3 * k] = var
+        out[3 * k:] = vel
+        return self._out
+
+    def transform(self, X, timestamps_ms=None) -> np.ndarray:
+        # One recorded session (rows in time order) -> (rows, 4 * n_base) float32
+        self.reset()
+        out = np.empty((len(X), self.n_features), dtype=np.float32)
+        for i in range(len(X)):
+            out[i] = self.push(X[i], None if timestamps_ms is None else int(timestamps_ms[i]))[0]
+        self.reset()
+        return out
@@ -1,42 +1,269 @@
 # utils/training.py
 import os
+import time
 import joblib
-import pandas as pd
-from sklearn.model_selection import train_test_split
+import numpy as np
+from sklearn.model_selection import train_test_split, StratifiedGroupKFold
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
 
-def train_and_save_model(labeled_csv: str, model_path: str) -> str:
-    if not os.path.exists(labeled_csv) or os.path.getsize(labeled_csv) == 0:
+from utils.linear_predictor import compile_pipeline
+from utils.model_artifact import save_artifact, artifact_paths
+from utils.dataset_store import store_for_csv
+from utils.catalog import SessionCatalog
+from utils.incremental import IncrementalState, drift_report, state_path
+from utils.model_selection import run_selection, choose, format_report, make_pipeline, grouped_splits
+from utils.feature_sets import feature_names, transform_session, parse_feature_set
+
+def default_store_dir(source: str) -> str:
+    # data/pose_data_labeled.csv -> data/store/pose_data_labeled, data/sessions -> data/store/sessions
+    source = os.path.abspath(source)
+    base = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(os.path.dirname(source), "store", base)
+
+def _no_progress(text: str):
+    pass
+
+def open_training_store(source, store_dir: str | None = None, progress=None):
+    """
+    source: a SessionCatalog or a sessions directory (read through the
+    manifest, nothing copied) or a labeled CSV (e.g. from label_by_ranges.py).
+    Returns the synced memory-mapped store.
+    progress: optional progress(text) for each stage (utils.jobs.Job.checkpoint
+    in the admin panel, which may also raise JobCancelled).
+    """
+    progress = progress or _no_progress
+    progress("Syncing the dataset store...")
+    if isinstance(source, str) and os.path.isdir(source):
+        source = SessionCatalog(source)
+    if isinstance(source, SessionCatalog):
+        source.scan()
+        if not source.entries:
+            raise FileNotFoundError("No cataloged sessions. Capture Good/Bad sessions first.")
+        return source.sync_store(store_dir or default_store_dir(source.sessions_dir), progress=progress)
+    if not os.path.exists(source) or os.path.getsize(source) == 0:
         raise FileNotFoundError("Labeled dataset not found or empty. Capture Good/Bad sessions first.")
+    return store_for_csv(source, store_dir or default_store_dir(source))
 
-    df = pd.read_csv(labeled_csv)
-    if "label" not in df.columns:
-        raise ValueError("Missing 'label' column in labeled dataset.")
-    feature_cols = [c for c in df.columns if c.startswith(("x_", "y_", "z_", "v_"))]
-    if not feature_cols:
-        raise ValueError("No feature columns found (x_/y_/z_/v_).")
+def session_arrays(store, session_id, feature_set: str = "raw132"):
+    """
+    -> (X float32, y str) for the labeled rows of one session. Derived
+    features (utils.feature_sets, the same code the live detector runs) are
+    built over the whole session timeline before unlabeled rows are dropped.
+    """
+    F, T, L = store.open_session(session_id)
+    codes = np.asarray(L)
+    X = transform_session(feature_set, np.asarray(F, dtype=np.float32), np.asarray(T))
+    keep = codes >= 0
+    classes = np.array(store.classes, dtype=object)
+    return X[keep], classes[codes[keep]].astype(str)
 
-    X = df[feature_cols].fillna(0.0).values
-    y = df["label"].astype(str).values
-    if len(set(y)) < 2:
-        raise ValueError("Need at least two classes in labeled data (good and bad).")
+def load_training_arrays(source, store_dir: str | None = None, feature_set: str = "raw132", progress=None):
+    """
+    -> (X float32, y str, groups session_id, feature_names) for the labeled
+    rows, read from the memory-mapped store.
+    """
+    progress = progress or _no_progress
+    store = open_training_store(source, store_dir, progress)
+    if not store.classes:
+        raise ValueError("Missing or empty 'label' column in labeled dataset.")
+    progress(f"Loading {store.rows()} rows ({feature_set})...")
+    X, y, groups = store_arrays(store, feature_set)
+    return X, y, groups, (store.feature_names if feature_set == "raw132" else feature_names(feature_set))
 
-    Xtr, Xte, ytr, yte = train_test_split(X, y, test_size=0.2, stratify=y, random_state=42)
+def store_arrays(store, feature_set: str = "raw132"):
+    # -> (X float32, y str, groups session_id) for the labeled rows of an opened store
+    if feature_set == "raw132":
+        return store.load(labeled_only=True)
+    parts = [(sid,) + session_arrays(store, sid, feature_set) for sid in store.sessions()]
+    X = np.concatenate([p[1] for p in parts])
+    y = np.concatenate([p[2] for p in parts])
+    groups = np.concatenate([np.full(len(p[2]), p[0], dtype=np.int64) for p in parts])
+    return X, y, groups
 
-    pipe = Pipeline([
+def build_pipeline() -> Pipeline:
+    return Pipeline([
         ("scaler", StandardScaler()),
         ("clf", LogisticRegression(max_iter=500, solver="lbfgs"))
     ])
 
-    pipe.fit(Xtr, ytr)
+def _masks(n: int, train_idx, test_idx):
+    train, test = np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+    train[train_idx] = True
+    test[test_idx] = True
+    return train, test
+
+def _split(X, y, groups, feature_set: str = "raw132"):
+    """
+    -> (train mask, test mask, description). Rows of a windowed feature set
+    share up to window-1 frames with their neighbours, so a random row split
+    leaks test frames into training. Those hold out whole sessions (one
+    StratifiedGroupKFold fold) when every class has two sessions, else the
+    last 20% of each session behind a window-sized gap.
+    """
+    n = len(y)
+    _, window = parse_feature_set(feature_set)
+    if not window:
+        tr, te = train_test_split(np.arange(n), test_size=0.2, stratify=y, random_state=42)
+        return _masks(n, tr, te) + ("random 20% of rows",)
+
+    try:
+        cv = StratifiedGroupKFold(n_splits=grouped_splits(y, groups), shuffle=True, random_state=42)
+        tr, te = next(cv.split(X, y, groups))
+        if len(set(y[tr])) > 1 and len(set(y[te])) > 1:
+            return _masks(n, tr, te) + (f"{len(set(groups[te]))} held-out session(s)",)
+    except ValueError:
+        pass
+
+    # Rows of a session are in time order (utils.training.session_arrays)
+    train, test = _masks(n, [], [])
+    for g in np.unique(groups):
+        idx = np.flatnonzero(groups == g)
+        cut = int(len(idx) * 0.8)
+        test[idx[cut:]] = True
+        train[idx[:max(0, cut - window + 1)]] = True
+    if len(set(y[train])) < 2:
+        raise ValueError("Need at least two classes in the training part of each session (good and bad).")
+    return train, test, ("last 20% of each session; too few sessions to hold any out, "
+                         "so this accuracy is optimistic")
+
+def save_model(pipe, model_path: str, feature_cols, feature_set: str = "raw132") -> str:
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    # Lets load_predictor pick the matching feature stage for the pickle too
+    pipe.feature_set_ = feature_set
+    joblib.dump(pipe, model_path)
+    saved = model_path
+
+    # Dependency-light copy for the live detector (no sklearn needed to load)
+    fused = compile_pipeline(pipe)
+    if fused is not None:
+        npz_path, _ = save_artifact(fused, model_path, feature_cols, feature_set=feature_set)
+        saved += f"\nSaved: {npz_path}"
+    else:
+        # Not foldable (gnb, knn, rf): a previous model's artifact must not shadow the new pickle
+        for path in artifact_paths(model_path):
+            if os.path.exists(path):
+                os.remove(path)
+    return saved
+
+def _full_fit(source, store_dir: str | None, feature_set: str = "raw132", progress=None):
+    # -> (pipe, X, y, groups, feature_cols, (Xte, yte, split description), fit seconds)
+    progress = progress or _no_progress
+    X, y, groups, feature_cols = load_training_arrays(source, store_dir, feature_set, progress)
+    if len(set(y)) < 2:
+        raise ValueError("Need at least two classes in labeled data (good and bad).")
+    progress(f"Fitting on {len(y)} rows...")
+    t0 = time.perf_counter()
+    train, test, split = _split(X, y, groups, feature_set)
+    pipe = build_pipeline()
+    pipe.fit(X[train], y[train])
+    return pipe, X, y, groups, feature_cols, (X[test], y[test], split), time.perf_counter() - t0
+
+def train_and_save_model(source, model_path: str, store_dir: str | None = None,
+                         feature_set: str = "raw132", progress=None) -> str:
+    # feature_set: model input schema (utils.feature_sets), e.g. "ergo14+temporal15"
+    progress = progress or _no_progress
+    pipe, X, y, groups, feature_cols, (Xte, yte, split), fit_s = _full_fit(source, store_dir, feature_set, progress)
+    progress("Evaluating and saving...")
     ypred = pipe.predict(Xte)
     acc = accuracy_score(yte, ypred)
     report = classification_report(yte, ypred)
+    saved = save_model(pipe, model_path, feature_cols, feature_set)
 
-    os.makedirs(os.path.dirname(model_path), exist_ok=True)
-    joblib.dump(pipe, model_path)
+    # Later sessions can be added with update_model_incremental() from here
+    IncrementalState.seed(pipe, X, y, groups, fit_s, feature_set=feature_set).save(model_path)
+
+    return f"Validation accuracy: {acc:.4f} ({split})\n\n{report}\nSaved: {saved}"
+
+def update_model_incremental(source, model_path: str, store_dir: str | None = None,
+                             refit_every: int = 5, feature_set: str = "raw132", progress=None) -> str:
+    """
+    Learns only the sessions added since the last fit (scaler partial_fit +
+    SGD on the new rows and a replay sample). Every `refit_every` updates a
+    full refit runs instead and is compared with the incremental model to
+    report drift. Falls back to a full fit (with `feature_set`) when there
+    is no saved state; otherwise the state's own feature set is used.
+    """
+    progress = progress or _no_progress
+    state = IncrementalState.load(model_path)
+    if state is None or not os.path.exists(model_path):
+        report = train_and_save_model(source, model_path, store_dir, feature_set, progress)
+        return "No incremental state yet; ran a full fit.\n\n" + report
+
+    store = open_training_store(source, store_dir, progress)
+    new = [sid for sid in store.sessions() if sid not in state.sessions_seen]
+    if not new:
+        return "Model is up to date: no new sessions since the last update."
+    progress(f"Learning {len(new)} new session(s)...")
+
+    # Timed like the full fit: learning only, the store sync is shared by both
+    t0 = time.perf_counter()
+
+    new_rows = 0
+    feature_set = state.feature_set
+    for sid in new:
+        Xn, yn = session_arrays(store, sid, feature_set)
+        if len(yn):
+            state.partial_update(Xn, yn)
+            new_rows += len(yn)
+        state.sessions_seen.add(sid)
+    state.updates_since_refit += 1
+    inc_s = time.perf_counter() - t0
+    total_rows = store.rows()
+    est_full_s = state.estimated_full_fit_s(total_rows)
+    lines = [f"Incremental update: {len(new)} session(s), {new_rows} rows in {inc_s:.2f}s "
+             f"(full retrain on {total_rows} rows est. {est_full_s:.2f}s, "
+             f"{est_full_s / inc_s if inc_s > 0 else 0:.0f}x)"]
+
+    if state.updates_since_refit < refit_every:
+        progress("Saving...")
+        saved = save_model(state.pipeline(), model_path, feature_names(feature_set), feature_set)
+        state.save(model_path)
+        lines.append(f"Full refit in {refit_every - state.updates_since_refit} more update(s).")
+        return "\n".join(lines) + f"\nSaved: {saved}"
+
+    # Periodic full refit: measures drift of the incremental model and replaces it
+    inc_pipe = state.pipeline()
+    pipe, X, y, groups, feature_cols, (Xte, yte, _), fit_s = _full_fit(source, store_dir, feature_set, progress)
+    progress("Checking drift and saving...")
+    drift = drift_report(inc_pipe, pipe, Xte, yte)
+    saved = save_model(pipe, model_path, feature_cols, feature_set)
+    IncrementalState.seed(pipe, X, y, groups, fit_s, feature_set=feature_set).save(model_path)
+    lines += [
+        f"Full refit ({len(y)} rows) took {fit_s:.2f}s.",
+        f"Drift check: incremental acc {drift['incremental_accuracy']:.4f} vs full {drift['full_accuracy']:.4f}, "
+        f"disagreement {drift['disagreement']:.2%}",
+    ]
+    return "\n".join(lines) + f"\nSaved: {saved}"
+
+def select_and_save_model(source, model_path: str, store_dir: str | None = None, target: float = 0.9,
+                          max_workers: int | None = None, progress=None) -> str:
+    """
+    Session-grouped model selection (utils.model_selection): evaluates the
+    candidate classifiers on each input (feature set schema, column subset)
+    in parallel, keeps the fastest one
+    whose balanced accuracy reaches `target`, refits it on all data and saves it.
+    """
+    progress = progress or _no_progress
+    store = open_training_store(source, store_dir, progress)
+    progress("Cross-validating candidate models...")
+    results = run_selection(store.root, max_workers=max_workers)
+    chosen, met = choose(results, target)
+    report = format_report(results, chosen, met, target)
+    if chosen is None:
+        raise ValueError(report)
+
+    progress(f"Refitting {chosen.name} on all data...")
+    feature_set = chosen.feature_set
+    X, y, groups = store_arrays(store, feature_set)
+    pipe = make_pipeline(chosen.classifier, chosen.columns).fit(X, y)
+    saved = save_model(pipe, model_path, feature_names(feature_set), feature_set)
 
-    return f"Validation accuracy: {acc:.4f}\n\n{report}\nSaved: {model_path}"
+    # Incremental updates assume the plain scaler + LogisticRegression pipeline
+    if (chosen.classifier, chosen.columns) == ("logreg", "all"):
+        IncrementalState.seed(pipe, X, y, groups, chosen.fit_s, feature_set=feature_set).save(model_path)
+    elif os.path.exists(state_path(model_path)):
+        os.remove(state_path(model_path))
+    return f"{report}\n\nSaved: {saved}"